@@ -6,13 +6,17 @@ Clean architecture with separated routes, services, and utilities
 from flask import Flask
 from flask_cors import CORS
 
-from backend.config import DEBUG, PORT, CORS_ORIGINS, validate_config
-from backend.routes import health_bp, trends_bp, cache_bp
+from backend.config import DEBUG, PORT, CORS_ORIGINS, LOG_LEVEL, LOG_FORMAT, validate_config
+from backend.routes import health_bp, trends_bp, cache_bp, profiles_bp, runs_bp
 from backend.utils import register_error_handlers
+from backend.utils.log import configure_logging, get_logger
+
+logger = get_logger(__name__)
 
 
 def create_app():
     """Application factory pattern"""
+    configure_logging(LOG_LEVEL, LOG_FORMAT)
     app = Flask(__name__)
     
     # CORS configuration
@@ -20,7 +24,7 @@ def create_app():
         r"/api/*": {
             "origins": CORS_ORIGINS,
             "methods": ["GET", "POST", "OPTIONS"],
-            "allow_headers": ["Content-Type"]
+            "allow_headers": ["Content-Type", "X-Profile"]
         }
     })
     
@@ -28,17 +32,16 @@ def create_app():
     app.register_blueprint(health_bp, url_prefix='/api')
     app.register_blueprint(trends_bp, url_prefix='/api')
     app.register_blueprint(cache_bp, url_prefix='/api')
+    app.register_blueprint(profiles_bp, url_prefix='/api')
+    app.register_blueprint(runs_bp, url_prefix='/api')
     
     # Register error handlers
     register_error_handlers(app)
     
     # Validate configuration on startup
     errors = validate_config()
-    if errors:
-        print("⚠️  Configuration Warnings:")
-        for error in errors:
-            print(f"   - {error}")
-        print()
+    for error in errors:
+        logger.warning("⚠️ Configuration warning: %s", error)
     
     return app
 
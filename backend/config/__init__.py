@@ -8,8 +8,32 @@ from .settings import (
     CORS_ORIGINS,
     CACHE_DIR,
     CACHE_FILE,
+    LEGACY_CACHE_FILE,
+    CACHE_REPORTS_DIR,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL,
+    GAZETTEER_FILE,
+    PROFILES_DIR,
+    RANKING_FILE,
+    RUNS_DIR,
+    SEARCH_INDEX_FILE,
+    RUN_RESUME_WINDOW,
+    TREND_SOURCES,
+    SOURCE_WEIGHTS,
+    SOURCE_TIMEOUTS,
+    TREND_FEED_FILE,
+    TRENDS_MARKETS,
+    EXTRACTION_MODELS,
+    ANALYSIS_MODELS,
+    EXTRACTION_LATENCY_LIMIT,
+    ANALYSIS_LATENCY_LIMIT,
+    TRENDS_RANK_BY,
+    RANKING_HALF_LIFE_DAYS,
     API_TIMEOUT,
     REQUEST_TIMEOUT,
+    ANALYSIS_RESERVE,
+    LOG_LEVEL,
+    LOG_FORMAT,
     validate_config,
     get_config,
 )
@@ -23,8 +47,32 @@ __all__ = [
     'CORS_ORIGINS',
     'CACHE_DIR',
     'CACHE_FILE',
+    'LEGACY_CACHE_FILE',
+    'CACHE_REPORTS_DIR',
+    'CACHE_MAX_ENTRIES',
+    'CACHE_TTL',
+    'GAZETTEER_FILE',
+    'PROFILES_DIR',
+    'RANKING_FILE',
+    'RUNS_DIR',
+    'SEARCH_INDEX_FILE',
+    'RUN_RESUME_WINDOW',
+    'TREND_SOURCES',
+    'SOURCE_WEIGHTS',
+    'SOURCE_TIMEOUTS',
+    'TREND_FEED_FILE',
+    'TRENDS_MARKETS',
+    'EXTRACTION_MODELS',
+    'ANALYSIS_MODELS',
+    'EXTRACTION_LATENCY_LIMIT',
+    'ANALYSIS_LATENCY_LIMIT',
+    'TRENDS_RANK_BY',
+    'RANKING_HALF_LIFE_DAYS',
     'API_TIMEOUT',
     'REQUEST_TIMEOUT',
+    'ANALYSIS_RESERVE',
+    'LOG_LEVEL',
+    'LOG_FORMAT',
     'validate_config',
     'get_config',
 ]
@@ -26,11 +26,55 @@ CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
 # Cache Configuration
 CACHE_DIR = BASE_DIR / 'cache'
 CACHE_DIR.mkdir(exist_ok=True)
-CACHE_FILE = CACHE_DIR / 'trends_cache.json'
+CACHE_FILE = CACHE_DIR / 'trends_cache.ftc'
+LEGACY_CACHE_FILE = CACHE_DIR / 'trends_cache.json'  # Pre-sectioned JSON cache, migrated on load
+CACHE_REPORTS_DIR = CACHE_DIR / 'reports'  # Reports for custom keyword sets
+CACHE_REPORTS_DIR.mkdir(exist_ok=True)
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 16))
+CACHE_TTL = int(os.getenv('CACHE_TTL', 0))  # seconds, 0 = valid until end of day
+GAZETTEER_FILE = CACHE_DIR / 'dish_gazetteer.json'  # Known dishes learned from extractions
+PROFILES_DIR = CACHE_DIR / 'profiles'  # Saved profiles of collection runs
+RANKING_FILE = CACHE_DIR / 'food_ranking.json'  # Decayed mention counts across runs
+RUNS_DIR = CACHE_DIR / 'runs'  # Checkpoints of collection runs
+SEARCH_INDEX_FILE = CACHE_DIR / 'report_index.json'  # Full-text index of all saved reports
+RUN_RESUME_WINDOW = int(os.getenv('RUN_RESUME_WINDOW', 21600))  # seconds an unfinished run is resumed automatically, 0 = never
+
+def _source_values(name):
+    """Parse a 'source=number,...' environment variable into a dict"""
+    values = {}
+    for pair in os.getenv(name, '').split(','):
+        source, _, value = pair.partition('=')
+        if source.strip() and value.strip():
+            values[source.strip()] = float(value)
+    return values
+
+# Trend sources run concurrently, in priority order: google_search, google_trends, file_feed
+TREND_SOURCES = [s.strip() for s in os.getenv('TREND_SOURCES', 'google_search').split(',') if s.strip()]
+SOURCE_WEIGHTS = _source_values('SOURCE_WEIGHTS')  # e.g. google_search=1,google_trends=0.5
+SOURCE_TIMEOUTS = _source_values('SOURCE_TIMEOUTS')  # seconds, e.g. google_trends=30
+TREND_FEED_FILE = Path(os.getenv('TREND_FEED_FILE', CACHE_DIR / 'trend_feed.json'))  # JSON feed read by file_feed
+
+# Markets to collect, as comma-separated SerpAPI country:language pairs (gl:hl)
+TRENDS_MARKETS = [m.strip().lower() for m in os.getenv('TRENDS_MARKETS', 'us:en').split(',') if m.strip()]
+
+# AI Model Configuration (comma-separated Groq models per task, preferred first)
+EXTRACTION_MODELS = [m.strip() for m in os.getenv('EXTRACTION_MODELS', 'llama-3.1-8b-instant,llama-3.3-70b-versatile').split(',') if m.strip()]
+ANALYSIS_MODELS = [m.strip() for m in os.getenv('ANALYSIS_MODELS', 'llama-3.3-70b-versatile,llama-3.1-8b-instant').split(',') if m.strip()]
+EXTRACTION_LATENCY_LIMIT = float(os.getenv('EXTRACTION_LATENCY_LIMIT', 5))  # seconds before a model counts as slow
+ANALYSIS_LATENCY_LIMIT = float(os.getenv('ANALYSIS_LATENCY_LIMIT', 20))  # both below REQUEST_TIMEOUT
+
+# Ranking Configuration
+TRENDS_RANK_BY = os.getenv('TRENDS_RANK_BY', 'score')  # 'score', 'momentum' or 'decayed'
+RANKING_HALF_LIFE_DAYS = float(os.getenv('RANKING_HALF_LIFE_DAYS', 7))  # days until a mention counts half
 
 # API Configuration
-API_TIMEOUT = 120  # seconds
-REQUEST_TIMEOUT = 30  # seconds
+API_TIMEOUT = int(os.getenv('API_TIMEOUT', 120))  # seconds, end-to-end budget of one collection
+REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', 30))  # seconds, cap for a single SerpAPI/Groq call
+ANALYSIS_RESERVE = REQUEST_TIMEOUT * min(2, len(ANALYSIS_MODELS))  # seconds kept for the analysis and one fallback
+
+# Logging Configuration
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # DEBUG logs every query, result and cache access
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # 'text' or 'json'
 
 # Validation
 def validate_config():
@@ -43,6 +87,16 @@ def validate_config():
     if not SERPAPI_KEY:
         errors.append("SERPAPI_KEY is not set. Get one at: https://serpapi.com/users/sign_up")
     
+    # A call never outlasts REQUEST_TIMEOUT, so a limit at or above it never marks a model slow
+    for name, limit in (('EXTRACTION_LATENCY_LIMIT', EXTRACTION_LATENCY_LIMIT),
+                        ('ANALYSIS_LATENCY_LIMIT', ANALYSIS_LATENCY_LIMIT)):
+        if limit >= REQUEST_TIMEOUT:
+            errors.append(f"{name} ({limit:g}s) must be below REQUEST_TIMEOUT ({REQUEST_TIMEOUT}s)")
+    
+    if ANALYSIS_RESERVE >= API_TIMEOUT:
+        errors.append(f"API_TIMEOUT ({API_TIMEOUT}s) leaves no time for sources after reserving "
+                      f"{ANALYSIS_RESERVE}s for the AI analysis")
+    
     return errors
 
 def get_config():
@@ -0,0 +1,5 @@
+"""Models module"""
+from .trend_item import TrendItem
+from .report import trending_foods_view, trending_count, market_rankings_view
+
+__all__ = ['TrendItem', 'trending_foods_view', 'trending_count', 'market_rankings_view']
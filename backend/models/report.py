@@ -0,0 +1,36 @@
+"""
+Views of a report's trend items
+
+A report stores each trend item once, in the raw shape under `raw_data`,
+plus `trending_order` (positions in `raw_data`, in ranked order) and the
+per-market rankings in raw shape. The API shapes are derived from these
+when a report is rendered. Reports written before `trending_order`
+existed store `trending_foods` (and food-shaped market rankings) and are
+read as they are.
+"""
+from typing import Any, Dict, List
+
+from .trend_item import TrendItem
+
+
+def trending_foods_view(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Food view of a report's ranked trending foods"""
+    if 'trending_order' not in report:
+        return report.get('trending_foods', [])
+    raw_data = report.get('raw_data', [])
+    return [TrendItem.from_dict(raw_data[i]).to_food() for i in report['trending_order']]
+
+
+def trending_count(report: Dict[str, Any]) -> int:
+    """Number of ranked trending foods in a report"""
+    if 'trending_order' in report:
+        return len(report['trending_order'])
+    return len(report.get('trending_foods', []))
+
+
+def market_rankings_view(report: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Food view of a report's per-market rankings"""
+    return {
+        market: [TrendItem.from_dict(item).to_food() for item in ranking]
+        for market, ranking in report.get('market_rankings', {}).items()
+    }
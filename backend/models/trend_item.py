@@ -0,0 +1,111 @@
+"""
+Typed trend item shared by the tracker, services and cache
+"""
+from typing import Any, Dict, List, Optional
+
+
+class TrendItem:
+    """
+    One trending food or keyword
+    
+    This is the single in-memory representation of a trend. The two JSON
+    shapes used by the API are produced on demand:
+      - raw view  (`raw_data`):       keyword / interest_score / source ...
+      - food view (`trending_foods`): name / score / source / type
+    
+    Items merged from several trend sources keep each source's score in
+    `sources`; `source` is the one the item was first found in.
+    """
+    
+    __slots__ = ('name', 'score', 'source', 'type', 'mentions', 'momentum', 'markets', 'decayed_score', 'sources')
+    
+    def __init__(self, name: str, score: float, source: str, type: Optional[str] = None,
+                 mentions: Optional[int] = None, momentum: Optional[Dict[str, Any]] = None,
+                 markets: Optional[List[str]] = None, decayed_score: Optional[float] = None,
+                 sources: Optional[Dict[str, float]] = None):
+        self.name = name
+        self.score = score
+        self.source = source
+        self.type = type
+        self.mentions = mentions
+        self.momentum = momentum
+        self.markets = markets
+        self.decayed_score = decayed_score
+        self.sources = sources
+    
+    def __repr__(self) -> str:
+        return f"TrendItem(name={self.name!r}, score={self.score!r}, source={self.source!r})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TrendItem):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+    
+    @property
+    def is_related(self) -> bool:
+        """True for related queries (actual foods) rather than base search keywords"""
+        return 'related' in self.source
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TrendItem':
+        """
+        Build an item from either API shape
+        
+        Args:
+            data: Raw view dict ('keyword'/'interest_score') or food view
+                dict ('name'/'score')
+        
+        Returns:
+            TrendItem
+        """
+        if 'keyword' in data:
+            name, score = data['keyword'], data['interest_score']
+        else:
+            name, score = data['name'], data['score']
+        item_type = data.get('type')
+        return cls(
+            name=name,
+            score=score,
+            source=data.get('source', ''),
+            type=None if item_type == 'base' else item_type,
+            mentions=data.get('mentions'),
+            momentum=data.get('momentum'),
+            markets=data.get('markets'),
+            decayed_score=data.get('decayed_score'),
+            sources=data.get('sources')
+        )
+    
+    @classmethod
+    def coerce(cls, item) -> 'TrendItem':
+        """Return `item` as a TrendItem (accepts TrendItem or either dict shape)"""
+        return item if isinstance(item, TrendItem) else cls.from_dict(item)
+    
+    def to_raw(self) -> Dict[str, Any]:
+        """Raw view, as stored in a report's `raw_data`"""
+        data = {'keyword': self.name, 'interest_score': self.score, 'source': self.source}
+        if self.mentions is not None:
+            data['mentions'] = self.mentions
+        if self.type is not None:
+            data['type'] = self.type
+        if self.momentum is not None:
+            data['momentum'] = self.momentum
+        if self.markets is not None:
+            data['markets'] = self.markets
+        if self.decayed_score is not None:
+            data['decayed_score'] = self.decayed_score
+        if self.sources is not None:
+            data['sources'] = self.sources
+        return data
+    
+    def to_food(self) -> Dict[str, Any]:
+        """Food view, as stored in a report's `trending_foods`"""
+        data = {'name': self.name, 'score': self.score, 'source': self.source, 'type': self.type or 'base'}
+        if self.momentum is not None:
+            data['momentum'] = self.momentum
+        if self.markets is not None:
+            data['markets'] = self.markets
+        if self.decayed_score is not None:
+            data['decayed_score'] = self.decayed_score
+        if self.sources is not None:
+            data['sources'] = self.sources
+        return data
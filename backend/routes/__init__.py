@@ -2,6 +2,8 @@
 from .health import health_bp
 from .trends import trends_bp
 from .cache import cache_bp
+from .profiles import profiles_bp
+from .runs import runs_bp
 
-__all__ = ['health_bp', 'trends_bp', 'cache_bp']
+__all__ = ['health_bp', 'trends_bp', 'cache_bp', 'profiles_bp', 'runs_bp']
 
@@ -1,7 +1,7 @@
 """
 Cache management routes
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 
 from backend.services import CacheService
 
@@ -13,14 +13,28 @@ cache_service = CacheService()
 
 @cache_bp.route('/cache/status', methods=['GET'])
 def cache_status():
-    """Get cache status"""
-    status = cache_service.get_status()
+    """Get cache status (optionally for a `keywords` set)"""
+    keywords = request.args.get('keywords', '').split(',')
+    status = cache_service.get_status(keywords)
     return jsonify(status)
 
 
+@cache_bp.route('/cache/summary', methods=['GET'])
+def cache_summary():
+    """Get the counts of a cached report (optionally for a `keywords` set) without loading it"""
+    keywords = request.args.get('keywords', '').split(',')
+    summary = cache_service.get_summary(keywords)
+    if summary is None:
+        return jsonify({
+            'success': False,
+            'error': 'No cached report available'
+        }), 404
+    return jsonify({'success': True, **summary})
+
+
 @cache_bp.route('/cache/clear', methods=['POST'])
 def clear_cache():
-    """Clear cache file"""
+    """Clear all cached reports"""
     try:
         success = cache_service.clear()
         if success:
@@ -0,0 +1,43 @@
+"""
+Profile routes for inspecting and downloading collection profiles
+"""
+from flask import Blueprint, jsonify, send_file
+
+from backend.config import PROFILES_DIR
+from backend.utils.profiling import list_profiles, profile_path
+
+profiles_bp = Blueprint('profiles', __name__)
+
+
+@profiles_bp.route('/profiles', methods=['GET'])
+def get_profiles():
+    """List saved profiles, newest first"""
+    return jsonify({
+        'success': True,
+        'profiles': list_profiles(PROFILES_DIR)
+    })
+
+
+@profiles_bp.route('/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Get a profile summary (wall/CPU/network split and top functions)"""
+    path = profile_path(PROFILES_DIR, profile_id, 'json')
+    if path is None:
+        return jsonify({
+            'success': False,
+            'error': 'Profile not found'
+        }), 404
+    return send_file(path, mimetype='application/json')
+
+
+@profiles_bp.route('/profiles/<profile_id>/download', methods=['GET'])
+def download_profile(profile_id):
+    """Download a profile's cProfile trace (open with pstats or snakeviz)"""
+    path = profile_path(PROFILES_DIR, profile_id, 'prof')
+    if path is None:
+        return jsonify({
+            'success': False,
+            'error': 'Profile not found'
+        }), 404
+    return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                     download_name=path.name)
@@ -0,0 +1,42 @@
+"""
+Run routes for inspecting checkpointed collection runs
+"""
+from flask import Blueprint, jsonify, request
+
+from backend.services import TrendsService
+
+runs_bp = Blueprint('runs', __name__)
+
+# Service instance
+trends_service = TrendsService()
+
+
+@runs_bp.route('/runs', methods=['GET'])
+def get_runs():
+    """List recent collection runs, newest first (`?limit=`, default 20)"""
+    try:
+        limit = int(request.args.get('limit', 20))
+        if not 1 <= limit <= 100:
+            raise ValueError
+    except ValueError:
+        return jsonify({'success': False, 'error': "'limit' must be an integer between 1 and 100"}), 400
+    
+    return jsonify({
+        'success': True,
+        'runs': trends_service.list_runs(limit)
+    })
+
+
+@runs_bp.route('/runs/<run_id>', methods=['GET'])
+def get_run(run_id):
+    """Get a run's status, attempts, searches done and completed steps"""
+    run = trends_service.get_run(run_id)
+    if run is None:
+        return jsonify({
+            'success': False,
+            'error': 'Run not found'
+        }), 404
+    return jsonify({
+        'success': True,
+        'run': run
+    })
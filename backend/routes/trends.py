@@ -1,50 +1,109 @@
 """
 Trends routes for collecting and retrieving food trends
 """
-from flask import Blueprint, jsonify, request
-import traceback
+from contextlib import nullcontext
+from flask import Blueprint, Response, jsonify, request
 
+from backend.config import PROFILES_DIR
+from backend.models import trending_foods_view, market_rankings_view
 from backend.services import TrendsService, CacheService
+from backend.utils.insights_index import FILTER_FIELDS, SORT_FIELDS
+from backend.utils.keywords import normalize_keywords
+from backend.utils.log import get_logger
+from backend.utils.profiling import ProfileSession, ProfilerBusyError
 
 trends_bp = Blueprint('trends', __name__)
+logger = get_logger(__name__)
 
 # Service instances
 trends_service = TrendsService()
 cache_service = CacheService()
 
-# In-memory storage for latest report
-latest_report = None
+
+def _raw_json(body: bytes, status: int = 200) -> Response:
+    """Wrap a pre-rendered JSON body in a response"""
+    return Response(body, status=status, mimetype='application/json')
+
+
+def _parse_keywords(value):
+    """
+    Parse a keyword set from a JSON list or a comma-separated string
+    
+    Raises:
+        ValueError: If the value is neither
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(k, str) for k in value):
+        raise ValueError("'keywords' must be a list of strings or a comma-separated string")
+    return normalize_keywords(value)
+
+
+def _profile_requested(data) -> bool:
+    """Check the `profile` body flag and the `X-Profile` header"""
+    header = request.headers.get('X-Profile', '').strip().lower()
+    return bool(data.get('profile', False)) or header in ('1', 'true', 'yes', 'on')
+
+
+def _collect(keywords, profile: bool, run_id=None):
+    """
+    Run a collection, profiling it if requested
+    
+    Returns:
+        Tuple of (report, profile summary or None)
+    """
+    session = ProfileSession('collect', PROFILES_DIR) if profile else None
+    try:
+        with session or nullcontext():
+            report = trends_service.collect_trends(keywords, run_id)
+    except ProfilerBusyError as e:
+        logger.warning("⚠️ %s, collecting without profiling", e)
+        return trends_service.collect_trends(keywords, run_id), {'error': str(e)}
+    
+    if session is None or session.summary is None:
+        return report, None
+    
+    summary = {k: v for k, v in session.summary.items() if k != 'top_functions'}
+    summary['summary_url'] = f"/api/profiles/{session.profile_id}"
+    summary['download_url'] = f"/api/profiles/{session.profile_id}/download"
+    return report, summary
 
 
 @trends_bp.route('/collect-trends', methods=['POST'])
 def collect_trends():
     """
     Collect and analyze trends - returns both raw data and AI insights
-    """
-    global latest_report
     
+    Set `profile: true` (or the `X-Profile: 1` header) to profile a fresh
+    collection; the response then includes the profile summary.
+    
+    Every collection returns its `run_id`, also on failure. Pass it back as
+    `run_id` to resume the run from its last completed step.
+    """
     try:
         # Get request parameters
         data = request.get_json(silent=True) or {}
-        force_refresh = data.get('force_refresh', False)
-        keywords = data.get('keywords', None)
+        profile = _profile_requested(data)
+        run_id = data.get('run_id')
+        force_refresh = data.get('force_refresh', False) or profile or run_id is not None
+        try:
+            keywords = _parse_keywords(data.get('keywords', None))
+            if run_id is not None and not isinstance(run_id, str):
+                raise ValueError("'run_id' must be a string")
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         # Try to load from cache first (if not forcing refresh)
         if not force_refresh:
-            cached_data = cache_service.load()
-            if cached_data:
-                latest_report = cached_data['data']
-                print("✅ Using cached data")
-                return jsonify({
-                    'success': True,
-                    'cached': True,
-                    'raw_data': latest_report['raw_data'],
-                    'ai_insights': latest_report['ai_insights'],
-                    'trending_foods': latest_report.get('trending_foods', []),
-                    'data_collected': len(latest_report['raw_data']),
-                    'report_date': latest_report['report_date'],
-                    'cache_date': cached_data['timestamp']
-                })
+            cached_body = cache_service.get_rendered('collect_trends', keywords, fresh_only=True)
+            if cached_body:
+                logger.debug("✅ Using cached data")
+                return _raw_json(cached_body)
         
         # Validate API keys
         validation = trends_service.validate_api_keys()
@@ -54,52 +113,60 @@ def collect_trends():
                 'error': validation['error']
             }), 400
         
-        # Collect new trends data
-        report = trends_service.collect_trends(keywords)
-        
-        # Store in memory
-        latest_report = report
+        # Collect new trends data (or resume a run)
+        try:
+            report, profile_summary = _collect(keywords, profile, run_id)
+        except ValueError as e:
+            if getattr(e, 'run_id', None):
+                raise
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        # Save to cache
-        cache_service.save(report)
+        # Save to cache (also keeps the report and its rendered views in memory).
+        # Partial reports are returned but not cached, so the next request retries.
+        if not report.get('partial'):
+            cache_service.save(report, keywords)
         
         return jsonify({
             'success': True,
             'cached': False,
+            'partial': report.get('partial', False),
             'raw_data': report['raw_data'],
-            'trending_foods': report['trending_foods'],
+            'trending_foods': trending_foods_view(report),
             'ai_insights': report['ai_insights'],
             'data_collected': len(report['raw_data']),
-            'report_date': report['report_date']
+            'keywords': keywords,
+            'markets': report['markets'],
+            'market_rankings': market_rankings_view(report),
+            'sources': report['sources'],
+            'run_id': report['run_id'],
+            'report_date': report['report_date'],
+            **({'profile': profile_summary} if profile_summary else {})
         })
     
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("❌ Collection failed")
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': str(e),
+            **({'run_id': e.run_id} if getattr(e, 'run_id', None) else {})
         }), 500
 
 
 @trends_bp.route('/latest-report', methods=['GET'])
 def get_latest_report():
     """Get the latest generated report with both raw data and AI insights"""
-    global latest_report
+    try:
+        keywords = _parse_keywords(request.args.get('keywords'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
-    # Try to load from cache if not in memory
-    if not latest_report:
-        cached_data = cache_service.load()
-        if cached_data:
-            latest_report = cached_data['data']
+    body = cache_service.get_rendered('latest_report', keywords)
     
-    if latest_report:
-        return jsonify({
-            'success': True,
-            'raw_data': latest_report.get('raw_data', []),
-            'trending_foods': latest_report.get('trending_foods', []),
-            'ai_insights': latest_report.get('ai_insights', {}),
-            'report_date': latest_report.get('report_date')
-        })
+    if body:
+        return _raw_json(body)
     else:
         return jsonify({
             'success': False,
@@ -107,28 +174,113 @@ def get_latest_report():
         }), 404
 
 
+@trends_bp.route('/rankings', methods=['GET'])
+def get_rankings():
+    """Get the top foods by decayed mentions across collection runs (`?limit=`, default 20)"""
+    try:
+        limit = int(request.args.get('limit', 20))
+        if not 1 <= limit <= 1000:
+            raise ValueError
+    except ValueError:
+        return jsonify({'success': False, 'error': "'limit' must be an integer between 1 and 1000"}), 400
+    
+    return jsonify({
+        'success': True,
+        **trends_service.get_top_foods(limit)
+    })
+
+
 @trends_bp.route('/trends', methods=['GET'])
 def get_trends():
     """Get just the AI-generated trends from latest report"""
-    global latest_report
+    try:
+        keywords = _parse_keywords(request.args.get('keywords'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     
-    # Try to load from cache if not in memory
-    if not latest_report:
-        cached_data = cache_service.load()
-        if cached_data:
-            latest_report = cached_data['data']
+    body = cache_service.get_rendered('trends', keywords)
     
-    if latest_report and 'ai_insights' in latest_report:
-        ai_insights = latest_report['ai_insights']
+    if body:
+        return _raw_json(body)
+    else:
         return jsonify({
-            'success': True,
-            'trends': ai_insights.get('trends', []),
-            'trending_foods': latest_report.get('trending_foods', []),
-            'report_date': latest_report.get('report_date')
-        })
+            'success': False,
+            'message': 'No trends available'
+        }), 404
+
+
+@trends_bp.route('/trends/query', methods=['GET'])
+def query_trends():
+    """
+    Filter, sort and group the AI-generated trends of the latest report
+    
+    Query parameters:
+        category, innovation_potential, target_market: Accepted values (comma-separated)
+        min_score: Minimum score of the trend's food
+        sort: score (default), name, category, innovation_potential or target_market
+        order: asc or desc (default: best score first, otherwise A-Z)
+        group_by: category, innovation_potential or target_market
+        limit: Maximum trends (per group when grouping)
+        keywords: Keyword set of the report
+    """
+    args = request.args
+    try:
+        keywords = _parse_keywords(args.get('keywords'))
+        min_score = float(args['min_score']) if args.get('min_score') else None
+        limit = int(args['limit']) if args.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError("'limit' must be a positive integer")
+        order = args.get('order')
+        if order not in (None, 'asc', 'desc'):
+            raise ValueError("'order' must be 'asc' or 'desc'")
+        sort = args.get('sort', 'score')
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"'sort' must be one of: {', '.join(SORT_FIELDS)}")
+        group_by = args.get('group_by') or None
+        if group_by is not None and group_by not in FILTER_FIELDS:
+            raise ValueError(f"'group_by' must be one of: {', '.join(FILTER_FIELDS)}")
+        body = cache_service.query_insights(
+            keywords,
+            filters={field: [v for v in args.get(field, '').split(',') if v.strip()] for field in FILTER_FIELDS},
+            min_score=min_score,
+            sort=sort,
+            descending=None if order is None else order == 'desc',
+            group_by=group_by,
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    if body:
+        return _raw_json(body)
     else:
         return jsonify({
             'success': False,
             'message': 'No trends available'
         }), 404
 
+
+@trends_bp.route('/search', methods=['GET'])
+def search_reports():
+    """
+    Search trend names, descriptions and product ideas across all saved reports
+    
+    Query parameters:
+        q: Search text; every term must match, terms ending in '*' match as prefixes
+        limit: Maximum hits (default 20)
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': "'q' is required"}), 400
+    try:
+        limit = int(request.args.get('limit', 20))
+        if not 1 <= limit <= 100:
+            raise ValueError
+    except ValueError:
+        return jsonify({'success': False, 'error': "'limit' must be an integer between 1 and 100"}), 400
+    
+    return jsonify({
+        'success': True,
+        'query': query,
+        **cache_service.search_reports(query, limit)
+    })
@@ -2,89 +2,464 @@
 Cache service for managing trends data cache
 """
 import json
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
-from backend.config import CACHE_FILE
+from backend.config import (
+    CACHE_FILE, LEGACY_CACHE_FILE, CACHE_REPORTS_DIR, CACHE_MAX_ENTRIES, CACHE_TTL, SEARCH_INDEX_FILE
+)
+from backend.models import trending_foods_view, market_rankings_view
+from backend.utils.cache_format import read_cache_file, read_header, read_sections, write_cache_file
+from backend.utils.insights_index import InsightsIndex
+from backend.utils.keywords import DEFAULT_CACHE_KEY, normalize_keywords, keywords_cache_key
+from backend.utils.log import get_logger
+from backend.utils.search_index import ReportSearchIndex
+from backend.utils.serialization import dumps_bytes
+
+logger = get_logger(__name__)
+
+
+def _fragments(fields: List[Tuple[str, bytes]]) -> Tuple[bytes, ...]:
+    """Byte fragments of a JSON object whose values are already serialized"""
+    parts = []
+    for i, (key, value) in enumerate(fields):
+        parts.append((b',' if i else b'{') + dumps_bytes(key) + b':')
+        parts.append(value)
+    parts.append(b'}')
+    return tuple(parts)
+
+
+def render_views(cache: Dict[str, Any]) -> Dict[str, Tuple[bytes, ...]]:
+    """
+    Pre-render the JSON response bodies served from a cached report
+    
+    Each part of the report (raw data, trending foods, insights, market
+    rankings) is serialized once and shared by every view; a view is the
+    sequence of fragments making up its body, joined when it is served.
+    
+    Args:
+        cache: Cache document with 'timestamp' and 'data'
+    
+    Returns:
+        Dict mapping view name to the byte fragments of its response body
+    """
+    report = cache['data']
+    raw_data = report.get('raw_data', [])
+    parts = {
+        'raw_data': dumps_bytes(raw_data),
+        'trending_foods': dumps_bytes(trending_foods_view(report)),
+        'ai_insights': dumps_bytes(report.get('ai_insights', {})),
+        'market_rankings': dumps_bytes(market_rankings_view(report)),
+        'report_date': dumps_bytes(report.get('report_date'))
+    }
+    true = dumps_bytes(True)
+    
+    views = {
+        'latest_report': _fragments([
+            ('success', true),
+            ('raw_data', parts['raw_data']),
+            ('trending_foods', parts['trending_foods']),
+            ('ai_insights', parts['ai_insights']),
+            ('market_rankings', parts['market_rankings']),
+            ('report_date', parts['report_date'])
+        ]),
+        'collect_trends': _fragments([
+            ('success', true),
+            ('cached', true),
+            ('raw_data', parts['raw_data']),
+            ('ai_insights', parts['ai_insights']),
+            ('trending_foods', parts['trending_foods']),
+            ('data_collected', dumps_bytes(len(raw_data))),
+            ('keywords', dumps_bytes(report.get('keywords', []))),
+            ('markets', dumps_bytes(report.get('markets', []))),
+            ('market_rankings', parts['market_rankings']),
+            ('sources', dumps_bytes(report.get('sources', {}))),
+            ('report_date', parts['report_date']),
+            ('cache_date', dumps_bytes(cache['timestamp']))
+        ])
+    }
+    
+    if 'ai_insights' in report:
+        views['trends'] = _fragments([
+            ('success', true),
+            ('trends', dumps_bytes(report['ai_insights'].get('trends', []))),
+            ('trending_foods', parts['trending_foods']),
+            ('report_date', parts['report_date'])
+        ])
+    
+    return views
+
+
+def expiry_for(timestamp: datetime, ttl: int = CACHE_TTL) -> datetime:
+    """
+    Compute when a cache entry written at `timestamp` expires
+    
+    Args:
+        timestamp: Time of the cache write
+        ttl: Time to live in seconds (0 = until the end of that day)
+    
+    Returns:
+        Expiry time
+    """
+    if ttl > 0:
+        return timestamp + timedelta(seconds=ttl)
+    return datetime.combine(timestamp.date() + timedelta(days=1), datetime.min.time())
+
+
+def is_fresh(header: Dict[str, Any]) -> bool:
+    """Check whether a cache header has not expired yet"""
+    if header.get('expires_at'):
+        return datetime.now() < datetime.fromisoformat(header['expires_at'])
+    # Caches written before per-entry TTLs are valid for the day they were written
+    return datetime.fromisoformat(header['timestamp']).date() == datetime.now().date()
+
+
+class _CacheEntry:
+    """In-memory state of one cached report"""
+    
+    __slots__ = ('key', 'path', 'cache', 'mtime', 'views', 'insights', 'active')
+    
+    def __init__(self, key: str, path: Path):
+        self.key = key
+        self.path = path
+        # Parsed cache document and its rendered views, keyed by file mtime
+        self.cache = None
+        self.mtime = None
+        self.views = {}
+        self.insights = None
+        # True once the report was saved or loaded fresh in this process
+        self.active = False
+    
+    def remember(self, cache: Dict[str, Any], mtime: Optional[float]):
+        """Keep a cache document in memory and render its views once"""
+        self.cache = cache
+        self.mtime = mtime
+        self.views = render_views(cache)
+        # Query index of this version, built on first use
+        self.insights = None
+    
+    def insights_index(self) -> InsightsIndex:
+        """Get the query index over this report's AI insights"""
+        if self.insights is None:
+            self.insights = InsightsIndex(self.cache['data'])
+        return self.insights
 
 
 class CacheService:
-    """Service for managing cache operations"""
+    """
+    Service for managing cache operations
+    
+    Reports are cached per keyword set: the default collection lives in
+    `cache_file`, custom keyword sets in `reports_dir`. Entries are kept in
+    an LRU of at most `max_entries` (the default entry is never evicted) and
+    expire individually after their TTL.
     
-    def __init__(self, cache_file: Path = CACHE_FILE):
+    Every saved report is also added to a full-text search index, which
+    keeps reports after they are evicted or expire. Reports already cached
+    when the index is first loaded are added to it then.
+    """
+    
+    def __init__(self, cache_file: Path = CACHE_FILE, legacy_cache_file: Path = LEGACY_CACHE_FILE,
+                 reports_dir: Path = CACHE_REPORTS_DIR, max_entries: int = CACHE_MAX_ENTRIES,
+                 ttl: int = CACHE_TTL, search_index_file: Optional[Path] = SEARCH_INDEX_FILE):
         self.cache_file = cache_file
+        self.legacy_cache_file = legacy_cache_file
+        self.reports_dir = reports_dir
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.search_index_file = search_index_file
+        self.search_index = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _get_search_index(self) -> ReportSearchIndex:
+        """Get or load the full-text index of saved reports (backfilled from the cache files)"""
+        if self.search_index is None:
+            with self._lock:
+                if self.search_index is None:
+                    index = ReportSearchIndex(self.search_index_file)
+                    self._backfill_search_index(index)
+                    self.search_index = index
+        return self.search_index
     
-    def load(self) -> Optional[Dict[str, Any]]:
+    def _backfill_search_index(self, index: ReportSearchIndex):
+        """
+        Add cached reports saved before the index existed (or while it was unavailable)
+        
+        Reports keep the ID they are indexed under when saved, so reports
+        already in the index are skipped. Only the header and the
+        ai_insights section of each file are read.
+        """
+        self._migrate_legacy()
+        paths = [self.cache_file] + sorted(self.reports_dir.glob('*.ftc'))
+        added = 0
+        for path in paths:
+            if not path.exists():
+                continue
+            try:
+                sections = read_sections(path, ['ai_insights'])
+                header = sections['header']
+                key = header.get('cache_key') or (DEFAULT_CACHE_KEY if path == self.cache_file else path.stem)
+                report = {'ai_insights': sections.get('ai_insights', {}), 'report_date': header.get('report_date')}
+                added += index.add_report(f"{key}@{header['timestamp']}", report, key)
+            except Exception as e:
+                logger.warning("⚠️ Search index backfill error (%s): %s", path.name, e)
+        if added:
+            logger.info("🔎 Indexed %d existing cached report(s)", added)
+    
+    def _path_for(self, key: str) -> Path:
+        """Get the cache file for a cache key"""
+        if key == DEFAULT_CACHE_KEY:
+            return self.cache_file
+        return self.reports_dir / f'{key}.ftc'
+    
+    def _entry(self, key: str) -> _CacheEntry:
+        """Get (or create) the in-memory entry for a cache key and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _CacheEntry(key, self._path_for(key))
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+        return entry
+    
+    def _evict(self):
+        """Drop least recently used entries (and their files) beyond max_entries"""
+        while len(self._entries) > self.max_entries:
+            victim = next((k for k in self._entries if k != DEFAULT_CACHE_KEY), None)
+            if victim is None:
+                break
+            entry = self._entries.pop(victim)
+            if entry.path.exists():
+                entry.path.unlink()
+                logger.debug("🧹 Evicted cached report: %s", victim)
+    
+    def _prune_disk(self):
+        """Keep the number of keyword report files within max_entries"""
+        files = sorted(self.reports_dir.glob('*.ftc'), key=lambda p: p.stat().st_mtime)
+        limit = max(1, self.max_entries - 1)  # One slot belongs to the default report
+        with self._lock:
+            for path in files[:max(0, len(files) - limit)]:
+                self._entries.pop(path.stem, None)
+                path.unlink()
+    
+    def _migrate_legacy(self) -> bool:
+        """
+        Convert an old indented-JSON cache file to the sectioned format
+        
+        Returns:
+            True if a legacy cache was migrated, False otherwise
+        """
+        if self.cache_file.exists() or not self.legacy_cache_file.exists():
+            return False
+        
+        with open(self.legacy_cache_file, 'r') as f:
+            legacy = json.load(f)
+        
+        write_cache_file(self.cache_file, legacy['timestamp'], legacy['data'])
+        self.legacy_cache_file.unlink()
+        logger.info("🔄 Migrated legacy cache to: %s", self.cache_file.name)
+        return True
+    
+    def load(self, keywords: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Load cached data from file
         
+        The parsed document is kept in memory and only re-read when the
+        cache file changes on disk.
+        
+        Args:
+            keywords: Keyword set the report was collected for (None = default)
+        
         Returns:
-            Dict with cache data if valid and from today, None otherwise
+            Dict with cache data if present and not expired, None otherwise
         """
         try:
-            if not self.cache_file.exists():
+            key = keywords_cache_key(keywords)
+            if key == DEFAULT_CACHE_KEY:
+                self._migrate_legacy()
+            if not self._path_for(key).exists():
                 return None
             
-            with open(self.cache_file, 'r') as f:
-                cache = json.load(f)
+            entry = self._entry(key)
+            mtime = entry.path.stat().st_mtime
+            if entry.cache is None or mtime != entry.mtime:
+                cache = read_cache_file(entry.path)
+                entry.remember(cache, mtime)
+                fresh_read = True
+            else:
+                cache = entry.cache
+                fresh_read = False
             
-            # Check if cache is from today
-            cache_date = datetime.fromisoformat(cache.get('timestamp', ''))
-            if cache_date.date() == datetime.now().date():
-                print(f"📦 Loaded cache from: {cache_date.strftime('%Y-%m-%d %H:%M:%S')}")
+            cache_date = datetime.fromisoformat(cache['timestamp'])
+            if is_fresh(cache['header']):
+                if fresh_read:
+                    logger.debug("📦 Loaded cache [%s] from: %s", entry.key, cache_date)
+                entry.active = True
                 return cache
             else:
-                print(f"⏰ Cache is old (from {cache_date.date()}), needs refresh")
+                if fresh_read:
+                    logger.debug("⏰ Cache [%s] has expired (from %s), needs refresh", entry.key, cache_date)
                 return None
-                
+        
         except Exception as e:
-            print(f"⚠️ Cache load error: {e}")
+            logger.warning("⚠️ Cache load error: %s", e)
             return None
     
-    def save(self, data: Dict[str, Any]) -> bool:
+    def get_rendered(self, view: str, keywords: Optional[List[str]] = None,
+                     fresh_only: bool = False) -> Optional[bytes]:
+        """
+        Get a pre-rendered JSON response body for a cached report
+        
+        Args:
+            view: View name ('latest_report', 'trends' or 'collect_trends')
+            keywords: Keyword set the report was collected for (None = default)
+            fresh_only: Only serve views of a cache that has not expired
+        
+        Returns:
+            Serialized response body, or None if no report is available
+        """
+        entry = self._entries.get(keywords_cache_key(keywords))
+        if fresh_only or entry is None or not entry.active:
+            if self.load(keywords) is None:
+                return None
+            entry = self._entries.get(keywords_cache_key(keywords))
+        fragments = entry.views.get(view) if entry else None
+        return b''.join(fragments) if fragments else None
+    
+    def query_insights(self, keywords: Optional[List[str]] = None, **query) -> Optional[bytes]:
+        """
+        Filter, sort and group the AI insights of a cached report
+        
+        Args:
+            keywords: Keyword set the report was collected for (None = default)
+            **query: Arguments of InsightsIndex.query
+        
+        Returns:
+            Serialized response body, or None if no report is available
+        
+        Raises:
+            ValueError: On unknown query fields
+        """
+        entry = self._entries.get(keywords_cache_key(keywords))
+        if entry is None or not entry.active:
+            if self.load(keywords) is None:
+                return None
+            entry = self._entries.get(keywords_cache_key(keywords))
+        return entry.insights_index().query(**query) if entry else None
+    
+    def save(self, data: Dict[str, Any], keywords: Optional[List[str]] = None) -> bool:
         """
         Save data to cache file
         
         Args:
             data: Data to cache
-            
+            keywords: Keyword set the report was collected for (None = default)
+        
         Returns:
             True if successful, False otherwise
         """
         try:
+            now = datetime.now()
+            entry = self._entry(keywords_cache_key(keywords))
+            extra_header = {
+                'cache_key': entry.key,
+                'keywords': normalize_keywords(keywords),
+                'expires_at': expiry_for(now, self.ttl).isoformat()
+            }
             cache_data = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
+                'header': extra_header,
                 'data': data
             }
             
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            # Serve the new report from memory even if the write below fails
+            entry.remember(cache_data, None)
+            entry.active = True
             
-            print(f"💾 Cache saved at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            return True
+            cache_data['header'] = write_cache_file(entry.path, cache_data['timestamp'], data, extra_header)
+            entry.mtime = entry.path.stat().st_mtime
+            if entry.key != DEFAULT_CACHE_KEY:
+                self._prune_disk()
+            
+            # Only the new report is tokenized; the rest of the index is untouched
+            self._get_search_index().add_report(f"{entry.key}@{cache_data['timestamp']}", data, entry.key)
             
+            logger.info("💾 Cache [%s] saved", entry.key)
+            return True
+        
         except Exception as e:
-            print(f"⚠️ Cache save error: {e}")
+            logger.warning("⚠️ Cache save error: %s", e)
             return False
     
-    def get_status(self) -> Dict[str, Any]:
+    def search_reports(self, query: str, limit: int = 20) -> Dict[str, Any]:
         """
-        Get cache status
+        Search the trends and product ideas of every saved report
+        
+        Args:
+            query: Search text (terms ending in '*' match as prefixes)
+            limit: Maximum hits
+        
+        Returns:
+            Dict with total matches, ranked hits and the number of indexed reports
+        """
+        index = self._get_search_index()
+        result = index.search(query, limit)
+        result['indexed_reports'] = index.report_count
+        return result
+    
+    def get_header(self, keywords: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read the cache header without decoding the report sections
+        
+        Args:
+            keywords: Keyword set the report was collected for (None = default)
+        
+        Returns:
+            Header dict, or None if there is no readable cache
+        """
+        try:
+            key = keywords_cache_key(keywords)
+            if key == DEFAULT_CACHE_KEY:
+                self._migrate_legacy()
+            path = self._path_for(key)
+            if not path.exists():
+                return None
+            return read_header(path)
+        except Exception as e:
+            logger.warning("⚠️ Cache header error: %s", e)
+            return None
+    
+    def get_status(self, keywords: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get cache status (reads only the cache header)
+        
+        Args:
+            keywords: Keyword set the report was collected for (None = default)
         
         Returns:
             Dict with cache status information
         """
-        cached_data = self.load()
+        header = self.get_header(keywords)
         
-        if cached_data:
-            cache_date = datetime.fromisoformat(cached_data['timestamp'])
+        if header and is_fresh(header):
+            cache_date = datetime.fromisoformat(header['timestamp'])
             return {
                 'success': True,
                 'cached': True,
                 'cache_date': cache_date.strftime('%Y-%m-%d %H:%M:%S'),
                 'is_today': cache_date.date() == datetime.now().date(),
-                'trending_foods_count': len(cached_data['data'].get('trending_foods', []))
+                'expires_at': header.get('expires_at'),
+                'keywords': header.get('keywords', []),
+                'trending_foods_count': header['counts']['trending_foods'],
+                'report_date': header.get('report_date'),
+                'version': header.get('version'),
+                'schema': header.get('schema'),
+                'entries': self.count_entries()
             }
         else:
             return {
@@ -93,19 +468,59 @@ class CacheService:
                 'message': 'No cache available'
             }
     
+    def get_summary(self, keywords: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a summary of a cached report (reads only the cache header)
+        
+        Args:
+            keywords: Keyword set the report was collected for (None = default)
+        
+        Returns:
+            Dict with summary information, or None if there is no cache
+        """
+        header = self.get_header(keywords)
+        if not header:
+            return None
+        
+        counts = header['counts']
+        return {
+            'total_trending_foods': counts['trending_foods'],
+            'total_product_ideas': counts['product_ideas'],
+            'report_date': header.get('report_date'),
+            'has_data': counts['trending_foods'] > 0
+        }
+    
+    def count_entries(self) -> int:
+        """
+        Count cached reports on disk
+        
+        Returns:
+            Number of cached reports (default plus keyword sets)
+        """
+        count = len(list(self.reports_dir.glob('*.ftc')))
+        if self.cache_file.exists():
+            count += 1
+        return count
+    
     def clear(self) -> bool:
         """
-        Clear cache file
+        Clear all cached reports
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            if self.cache_file.exists():
-                self.cache_file.unlink()
-                print("🗑️ Cache cleared")
+            removed = False
+            paths = [self.cache_file, self.legacy_cache_file] + list(self.reports_dir.glob('*.ftc'))
+            for path in paths:
+                if path.exists():
+                    path.unlink()
+                    removed = True
+            with self._lock:
+                self._entries.clear()
+            if removed:
+                logger.info("🗑️ Cache cleared")
             return True
         except Exception as e:
-            print(f"⚠️ Cache clear error: {e}")
+            logger.warning("⚠️ Cache clear error: %s", e)
             return False
-
@@ -4,27 +4,69 @@ Trends service for collecting and analyzing food trends
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from food_trends_demo import FoodTrendsTracker
-from backend.config import GROQ_API_KEY, SERPAPI_KEY
+from food_trends_demo import FoodTrendsTracker, RunState
+from backend.config import (
+    GROQ_API_KEY, SERPAPI_KEY, TRENDS_RANK_BY, TRENDS_MARKETS, API_TIMEOUT, ANALYSIS_RESERVE,
+    RANKING_FILE, RANKING_HALF_LIFE_DAYS, RUNS_DIR, RUN_RESUME_WINDOW,
+    TREND_SOURCES, SOURCE_WEIGHTS, SOURCE_TIMEOUTS, TREND_FEED_FILE
+)
+from backend.models import TrendItem, trending_count
+from backend.sources import GoogleSearchSource, GoogleTrendsSource, FileFeedSource, SourceScheduler
+from backend.utils.checkpoints import RunCheckpoint, load_run, list_runs
+from backend.utils.deadline import Deadline
+from backend.utils.keywords import normalize_keywords
+from backend.utils.log import get_logger, run_context
+from backend.utils.ranking import DecayedRanking
+
+logger = get_logger(__name__)
 
 
 class TrendsService:
     """Service for handling trends collection and analysis"""
     
+    # Ranking modes accepted by extract_trending_foods
+    RANK_MODES = ('score', 'momentum', 'decayed')
+    
     def __init__(self):
         self.tracker = None
+        self.ranking = None
+        self.scheduler = None
+    
+    def _get_ranking(self) -> DecayedRanking:
+        """Get or load the decayed ranking shared with the tracker"""
+        if self.ranking is None:
+            self.ranking = DecayedRanking(RANKING_FILE, RANKING_HALF_LIFE_DAYS)
+        return self.ranking
     
     def _get_tracker(self) -> FoodTrendsTracker:
         """Get or create FoodTrendsTracker instance"""
         if self.tracker is None:
-            self.tracker = FoodTrendsTracker()
+            self.tracker = FoodTrendsTracker(ranking=self._get_ranking())
         return self.tracker
     
+    def _get_scheduler(self) -> SourceScheduler:
+        """Get or create the scheduler of the sources enabled in TREND_SOURCES"""
+        if self.scheduler is None:
+            tracker = self._get_tracker()
+            sources = []
+            for name in TREND_SOURCES:
+                weight, timeout = SOURCE_WEIGHTS.get(name), SOURCE_TIMEOUTS.get(name)
+                if name == GoogleSearchSource.name:
+                    sources.append(GoogleSearchSource(tracker, weight, timeout))
+                elif name == GoogleTrendsSource.name:
+                    sources.append(GoogleTrendsSource(tracker, weight, timeout))
+                elif name == FileFeedSource.name:
+                    sources.append(FileFeedSource(TREND_FEED_FILE, weight, timeout))
+                else:
+                    logger.warning("⚠️ Unknown trend source '%s' ignored", name)
+            self.scheduler = SourceScheduler(sources)
+        return self.scheduler
+    
     def validate_api_keys(self) -> Dict[str, Any]:
         """
         Validate that required API keys are present
@@ -46,84 +88,242 @@ class TrendsService:
         
         return {'valid': True}
     
-    def extract_trending_foods(self, raw_data: List[Dict]) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _rank_key(item: TrendItem, rank_by: str):
+        """Sort key for a trending food item (higher sorts first)"""
+        if rank_by == 'momentum':
+            momentum = item.momentum or {}
+            return (
+                momentum.get('breakout', False),
+                momentum.get('slope', 0.0),
+                momentum.get('acceleration', 0.0),
+                item.score
+            )
+        if rank_by == 'decayed':
+            return (item.decayed_score or 0.0, item.score)
+        return item.score
+    
+    def extract_trending_foods(self, raw_data: List[Union[TrendItem, Dict]], rank_by: str = 'score') -> List[TrendItem]:
         """
         Extract and organize trending foods
         Prioritizes related queries (actual foods) over base keywords
         
         Args:
-            raw_data: Raw data from search
+            raw_data: Trend items from search (TrendItem or raw dicts)
+            rank_by: 'score' (interest score), 'momentum' (breakout, recent
+                slope and acceleration of Google Trends timelines, then score)
+                or 'decayed' (mentions across runs with time decay, then score)
             
         Returns:
-            List of organized trending foods
+            Ordered list of the same trend items (use to_food() for the API shape)
         """
+        if rank_by not in self.RANK_MODES:
+            raise ValueError(f"Unknown rank_by: {rank_by}")
+        
         trending_foods = []
         base_keywords = []
         
         for item in raw_data:
-            food_item = {
-                'name': item['keyword'],
-                'score': item['interest_score'],
-                'source': item['source'],
-                'type': item.get('type', 'base')
-            }
+            item = TrendItem.coerce(item)
             
             # Separate related queries (actual foods) from base search keywords
-            if 'related' in item['source']:
-                trending_foods.append(food_item)
+            if item.is_related:
+                trending_foods.append(item)
             else:
-                base_keywords.append(food_item)
+                base_keywords.append(item)
         
-        # Sort both lists by score (highest first)
-        trending_foods.sort(key=lambda x: x['score'], reverse=True)
-        base_keywords.sort(key=lambda x: x['score'], reverse=True)
+        # Sort both lists (highest first)
+        trending_foods.sort(key=lambda x: self._rank_key(x, rank_by), reverse=True)
+        base_keywords.sort(key=lambda x: self._rank_key(x, rank_by), reverse=True)
         
         # Prioritize actual food items, then add base keywords
         all_foods = trending_foods + base_keywords
         
-        print(f"   📊 Extracted: {len(trending_foods)} actual foods + {len(base_keywords)} base keywords")
+        logger.info("📊 Extracted: %d actual foods + %d base keywords", len(trending_foods), len(base_keywords))
         return all_foods
     
-    def collect_trends(self, keywords: List[str] = None) -> Dict[str, Any]:
+    def collect_trends(self, keywords: List[str] = None, run_id: str = None) -> Dict[str, Any]:
         """
         Collect trending foods and generate AI insights
         
+        The whole collection runs within API_TIMEOUT seconds, keeping
+        ANALYSIS_RESERVE seconds for the AI analysis (one call and one
+        fallback). Work that could not run
+        in time is skipped and the report is marked 'partial'.
+        
+        Trending foods come from the sources in TREND_SOURCES, run
+        concurrently and merged by weight; `sources` reports how each did.
+        
+        Each run is checkpointed under RUNS_DIR. Passing the `run_id` of a
+        failed or partial run (or retrying the same keywords within
+        RUN_RESUME_WINDOW seconds) resumes it, reusing every search and step
+        it completed. A run still in progress (updated within API_TIMEOUT
+        seconds) is never resumed by a concurrent request.
+        
         Args:
-            keywords: Optional list of keywords to search for
+            keywords: Optional list of keywords to search for (default queries if empty)
+            run_id: Optional run to resume
             
         Returns:
             Dict with collected data and AI insights
+            
+        Raises:
+            ValueError: If `run_id` is unknown, was started for other keywords
+                or is still running
+            Exception: Collection errors, with the failed run's ID as `run_id`
         """
+        keywords = normalize_keywords(keywords)
+        checkpoint = RunCheckpoint.start(
+            RUNS_DIR, keywords, TRENDS_MARKETS, run_id, RUN_RESUME_WINDOW, stale_after=API_TIMEOUT
+        )
+        # Every record logged during the run carries its ID
+        with run_context(checkpoint.run_id):
+            if checkpoint.resumed:
+                logger.info("♻️ Resuming run (steps done: %s)", ', '.join(checkpoint.manifest['steps']) or 'none')
+            else:
+                logger.info("🆔 Started run")
+            
+            try:
+                report = self._collect_run(keywords, checkpoint)
+            except Exception as e:
+                checkpoint.fail(e)
+                e.run_id = checkpoint.run_id
+                raise
+            checkpoint.complete(partial=report['partial'])
+        return report
+    
+    def _collect_run(self, keywords: List[str], checkpoint: RunCheckpoint) -> Dict[str, Any]:
+        """Run (or resume) the steps of one checkpointed collection"""
         tracker = self._get_tracker()
+        deadline = Deadline(API_TIMEOUT)
+        
+        # Collect trending foods from all enabled sources
+        search = checkpoint.load_step('search')
+        if search is not None:
+            logger.info("♻️ Reusing source results from the checkpoint")
+            trending_foods_raw = [TrendItem.from_dict(item) for item in search['raw_data']]
+            market_rankings = {
+                market: [TrendItem.from_dict(item) for item in ranking]
+                for market, ranking in search['market_rankings'].items()
+            }
+        else:
+            logger.info("📊 Collecting trending foods: %s", ', '.join(keywords) or 'default queries')
+            run = RunState()
+            trending_foods_raw, source_stats = self._get_scheduler().run(
+                keywords, checkpoint.manifest['markets'], deadline.reserve(ANALYSIS_RESERVE), checkpoint, run
+            )
+            market_rankings = run.market_rankings
+            
+            stats = dict(run.stats)
+            stats['failed_sources'] = sum(1 for entry in source_stats.values() if entry['status'] != 'ok')
+            search = {
+                'raw_data': [item.to_raw() for item in trending_foods_raw],
+                'market_rankings': {
+                    market: [item.to_raw() for item in ranking]
+                    for market, ranking in market_rankings.items()
+                },
+                'collection_stats': stats,
+                'sources': source_stats,
+                'model_usage': dict(run.model_usage),
+                'mentions': run.mentions
+            }
+            # Sources, searches and extractions cut short are retried by the next attempt
+            if not (stats.get('skipped_searches') or stats.get('skipped_extractions') or stats['failed_sources']):
+                checkpoint.save_step('search', search)
         
-        # Collect trending foods from Google Search
-        print("📊 Searching Google for trending foods...")
-        trending_foods_raw = tracker.get_trending_foods_from_search()
-        print(f"✅ Found {len(trending_foods_raw)} trending foods from search")
+        # Record the run's mentions in the decayed ranking once, when its search is
+        # complete; a partial search is recorded by the attempt that completes it
+        record = 'search' in checkpoint.manifest['steps'] and 'ranking' not in checkpoint.manifest['steps']
+        mentions = search.get('mentions') if record else None
+        tracker.apply_decayed_ranking([item for item in trending_foods_raw if item.mentions is not None], mentions)
+        if record:
+            checkpoint.save_step('ranking', {'foods': len(mentions or {})})
+        logger.info("✅ Found %d trending foods", len(trending_foods_raw))
         
         # Extract and organize trending foods
-        trending_foods = self.extract_trending_foods(trending_foods_raw)
-        print(f"🔥 Total: {len(trending_foods)} trending foods")
+        trending_foods = self.extract_trending_foods(trending_foods_raw, TRENDS_RANK_BY)
+        logger.info("🔥 Total: %d trending foods", len(trending_foods))
         
-        # Analyze with Groq AI
-        print("🤖 Analyzing with Groq AI...")
-        analysis = tracker.analyze_with_ai(trending_foods_raw, trending_foods)
-        print(f"✅ AI generated {len(analysis.get('trends', []))} product ideas")
+        # Analyze with Groq AI (the checkpoint keeps the analysis with its model usage)
+        saved = checkpoint.load_step('analysis')
+        if saved is not None:
+            analysis, analysis_usage = saved['analysis'], saved['model_usage']
+        else:
+            logger.info("🤖 Analyzing with Groq AI...")
+            run = RunState()
+            analysis = tracker.analyze_with_ai(trending_foods_raw, trending_foods, deadline, run)
+            analysis_usage = run.model_usage
+            logger.info("✅ AI generated %d product ideas", len(analysis.get('trends', [])))
+            
+            # Check for AI analysis errors (a skipped analysis still yields a partial report)
+            if 'error' in analysis and not analysis.get('skipped'):
+                raise Exception(f"AI Analysis failed: {analysis['error']}")
+            if not analysis.get('skipped'):
+                checkpoint.save_step('analysis', {'analysis': analysis, 'model_usage': analysis_usage})
         
-        # Check for AI analysis errors
-        if 'error' in analysis:
-            raise Exception(f"AI Analysis failed: {analysis['error']}")
+        stats = dict(search['collection_stats'])
+        partial = bool(analysis.get('skipped') or stats.get('skipped_searches') or stats.get('skipped_extractions')
+                       or stats.get('failed_sources'))
+        if partial:
+            logger.warning("⏱️ Collection ran out of time or hit failing providers - report is partial")
         
-        # Build response
+        # Build the report: every item once (raw shape) plus the ranked order;
+        # API views are derived when rendering (see backend.models.report)
+        positions = {id(item): i for i, item in enumerate(trending_foods_raw)}
         report = {
-            'raw_data': trending_foods_raw,
-            'trending_foods': trending_foods,
+            'raw_data': [item.to_raw() for item in trending_foods_raw],
+            'trending_order': [positions[id(item)] for item in trending_foods],
             'ai_insights': analysis,
+            'keywords': keywords,
+            'markets': list(market_rankings),
+            'market_rankings': {
+                market: [item.to_raw() for item in ranking]
+                for market, ranking in market_rankings.items()
+            },
+            'collection_stats': stats,
+            'sources': search['sources'],
+            'model_usage': {**search['model_usage'], **analysis_usage},
+            'model_stats': tracker.model_router.snapshot(),
+            'run_id': checkpoint.run_id,
+            'partial': partial,
             'report_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
         return report
     
+    def get_run(self, run_id: str) -> Union[Dict[str, Any], None]:
+        """
+        Get a collection run's checkpoint manifest
+        
+        Args:
+            run_id: Run ID returned by collect_trends
+            
+        Returns:
+            Manifest with status, attempts, searches and steps done, or None if unknown
+        """
+        return load_run(RUNS_DIR, run_id)
+    
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """List recent collection runs, newest first"""
+        return list_runs(RUNS_DIR, limit)
+    
+    def get_top_foods(self, limit: int = 20) -> Dict[str, Any]:
+        """
+        Get the foods with the highest decayed score across all runs
+        
+        Args:
+            limit: Number of foods to return
+            
+        Returns:
+            Dict with the ranked foods and ranking metadata
+        """
+        ranking = self._get_ranking()
+        return {
+            'foods': ranking.top(limit),
+            'tracked_foods': len(ranking),
+            'half_life_days': ranking.half_life_days
+        }
+    
     def get_trends_summary(self, report: Dict[str, Any]) -> Dict[str, Any]:
         """
         Get a summary of trends report
@@ -135,9 +335,9 @@ class TrendsService:
             Dict with summary information
         """
         return {
-            'total_trending_foods': len(report.get('trending_foods', [])),
+            'total_trending_foods': trending_count(report),
             'total_product_ideas': len(report.get('ai_insights', {}).get('trends', [])),
             'report_date': report.get('report_date'),
-            'has_data': len(report.get('trending_foods', [])) > 0
+            'has_data': trending_count(report) > 0
         }
 
@@ -0,0 +1,11 @@
+"""Trend sources module"""
+from .base import TrendSource
+from .google_search import GoogleSearchSource
+from .google_trends import GoogleTrendsSource
+from .file_feed import FileFeedSource
+from .scheduler import SourceScheduler, merge_source_items
+
+__all__ = [
+    'TrendSource', 'GoogleSearchSource', 'GoogleTrendsSource', 'FileFeedSource',
+    'SourceScheduler', 'merge_source_items',
+]
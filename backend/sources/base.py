@@ -0,0 +1,59 @@
+"""
+Base class for trend source adapters
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from backend.models import TrendItem
+from backend.utils.deadline import Deadline
+
+
+class TrendSource(ABC):
+    """
+    One source of trending foods (e.g. Google Search, Google Trends, a feed)
+    
+    Subclasses set `name` and implement fetch(). The scheduler runs every
+    enabled source concurrently, each within its own timeout, and merges
+    their items weighted by `weight`.
+    """
+    
+    # Source name used in configuration and per-source attribution
+    name = 'source'
+    
+    # Defaults when no weight or timeout is configured (timeout None = collection deadline)
+    default_weight = 1.0
+    default_timeout: Optional[float] = None
+    
+    def __init__(self, weight: Optional[float] = None, timeout: Optional[float] = None):
+        """
+        Args:
+            weight: Weight of this source's scores in the merged ranking
+            timeout: Seconds this source may run (None = collection deadline)
+        
+        Raises:
+            ValueError: If the weight is not positive
+        """
+        self.weight = self.default_weight if weight is None else weight
+        self.timeout = self.default_timeout if timeout is None else timeout
+        if self.weight <= 0:
+            raise ValueError(f"Weight of source '{self.name}' must be positive")
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(weight={self.weight!r}, timeout={self.timeout!r})"
+    
+    @abstractmethod
+    def fetch(self, keywords: List[str], markets: List[str], deadline: Deadline,
+              checkpoint=None, run=None) -> List[TrendItem]:
+        """
+        Collect trending foods
+        
+        Args:
+            keywords: Normalized keywords (empty for the default queries)
+            markets: Markets of the collection ('gl:hl' codes)
+            deadline: Deadline of this source
+            checkpoint: Optional RunCheckpoint of the collection run
+            run: Optional RunState collecting the run's stats and model usage
+        
+        Returns:
+            List of TrendItem
+        """
@@ -0,0 +1,48 @@
+"""
+File feed source: trending foods from a local JSON file (exports, fixtures)
+"""
+import json
+from pathlib import Path
+from typing import List
+
+from backend.models import TrendItem
+from backend.utils.deadline import Deadline
+from backend.utils.log import get_logger
+from .base import TrendSource
+
+logger = get_logger(__name__)
+
+
+class FileFeedSource(TrendSource):
+    """
+    Trending foods read from a JSON file
+    
+    The file holds a list of items in either API shape (`keyword` /
+    `interest_score` or `name` / `score`), or an object with that list under
+    `items`. Items without a source are attributed to the feed.
+    """
+    
+    name = 'file_feed'
+    default_timeout = 5.0
+    
+    def __init__(self, path: Path, weight=None, timeout=None):
+        super().__init__(weight, timeout)
+        self.path = Path(path)
+    
+    def fetch(self, keywords: List[str], markets: List[str], deadline: Deadline,
+              checkpoint=None, run=None) -> List[TrendItem]:
+        if not self.path.exists():
+            logger.warning("⚠️ Trend feed not found: %s", self.path)
+            return []
+        
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('items', [])
+        
+        items = []
+        for entry in data:
+            item = TrendItem.from_dict(entry)
+            item.source = item.source or self.name
+            items.append(item)
+        return items
@@ -0,0 +1,22 @@
+"""
+Google Search source: foods extracted from SerpAPI organic results
+"""
+from typing import List
+
+from backend.models import TrendItem
+from backend.utils.deadline import Deadline
+from .base import TrendSource
+
+
+class GoogleSearchSource(TrendSource):
+    """Foods mentioned in Google Search results, per market (see FoodTrendsTracker)"""
+    
+    name = 'google_search'
+    
+    def __init__(self, tracker, weight=None, timeout=None):
+        super().__init__(weight, timeout)
+        self.tracker = tracker
+    
+    def fetch(self, keywords: List[str], markets: List[str], deadline: Deadline,
+              checkpoint=None, run=None) -> List[TrendItem]:
+        return self.tracker.get_trending_foods_from_search(keywords, deadline, markets, checkpoint, run)
@@ -0,0 +1,25 @@
+"""
+Google Trends source: interest over time and related queries via SerpAPI
+"""
+from typing import List
+
+from backend.models import TrendItem
+from backend.utils.deadline import Deadline
+from .base import TrendSource
+
+
+class GoogleTrendsSource(TrendSource):
+    """Google Trends interest and momentum of the keywords, plus their related queries"""
+    
+    name = 'google_trends'
+    default_weight = 0.5
+    default_timeout = 30.0
+    
+    def __init__(self, tracker, weight=None, timeout=None):
+        super().__init__(weight, timeout)
+        self.tracker = tracker
+    
+    def fetch(self, keywords: List[str], markets: List[str], deadline: Deadline,
+              checkpoint=None, run=None) -> List[TrendItem]:
+        # Trends are fetched worldwide; no keywords means the tracker's default food queries
+        return self.tracker.get_google_trends(keywords or None, deadline=deadline)
@@ -0,0 +1,159 @@
+"""
+Concurrent execution of trend sources and merging of their items
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.models import TrendItem
+from backend.utils.deadline import Deadline, DeadlineExceeded, CircuitOpenError
+from backend.utils.keywords import food_name_key
+from backend.utils.log import get_logger, submit_in_context
+from .base import TrendSource
+
+logger = get_logger(__name__)
+
+
+def merge_source_items(results: Dict[str, List[TrendItem]], weights: Dict[str, float]) -> List[TrendItem]:
+    """
+    Merge the items of several sources into one ranking
+    
+    Items naming the same food (see food_name_key) are merged. A merged
+    item's score is the weighted sum of its per-source scores divided by the
+    total weight of the sources that returned items, so foods found by several
+    sources rank higher. Fields missing in the first source's item (e.g.
+    momentum) are filled in from later ones.
+    
+    Args:
+        results: Source name -> items, in source priority order
+        weights: Source name -> weight
+    
+    Returns:
+        Merged items, highest score first, each with per-source scores in `sources`
+    """
+    total_weight = sum(weights[name] for name, items in results.items() if items) or 1.0
+    merged = {}
+    weighted = {}
+    for name, items in results.items():
+        for item in items:
+            key = food_name_key(item.name)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = TrendItem(**{field: getattr(item, field) for field in TrendItem.__slots__})
+                entry.sources = {}
+                weighted[key] = 0.0
+            else:
+                for field in ('type', 'mentions', 'momentum', 'markets', 'decayed_score'):
+                    if getattr(entry, field) is None:
+                        setattr(entry, field, getattr(item, field))
+            
+            # A source listing a food twice (e.g. top and rising) counts its best score
+            previous = entry.sources.get(name)
+            if previous is None or item.score > previous:
+                weighted[key] += weights[name] * (item.score - (previous or 0))
+                entry.sources[name] = item.score
+    
+    for key, entry in merged.items():
+        entry.score = int(round(weighted[key] / total_weight))
+    return sorted(merged.values(), key=lambda item: item.score, reverse=True)
+
+
+class SourceScheduler:
+    """Runs trend sources concurrently, each within its own timeout"""
+    
+    # Seconds to wait past a source's deadline before giving up on it
+    GRACE_SECONDS = 2.0
+    
+    def __init__(self, sources: List[TrendSource]):
+        """
+        Args:
+            sources: Enabled sources, in priority order
+        """
+        self.sources = list(sources)
+    
+    @staticmethod
+    def _fetch(source: TrendSource, keywords, markets, deadline, checkpoint, run) -> Tuple[List[TrendItem], float]:
+        started = time.perf_counter()
+        items = source.fetch(keywords, markets, deadline, checkpoint, run)
+        return items, time.perf_counter() - started
+    
+    def run(self, keywords: List[str], markets: List[str], deadline: Optional[Deadline] = None,
+            checkpoint=None, run=None) -> Tuple[List[TrendItem], Dict[str, Dict[str, Any]]]:
+        """
+        Run every source and merge their items
+        
+        A source that fails, runs out of time or hits an open circuit is left
+        out of the merge; its status says why.
+        
+        Args:
+            keywords: Normalized keywords (empty for the default queries)
+            markets: Markets of the collection
+            deadline: Deadline of the whole step
+            checkpoint: Optional RunCheckpoint passed to the sources
+            run: Optional RunState passed to the sources
+        
+        Returns:
+            Tuple of (merged items, stats per source with status, items, seconds and weight)
+        """
+        deadline = deadline or Deadline()
+        stats = {
+            source.name: {'status': 'timed_out', 'items': 0, 'seconds': None, 'weight': source.weight}
+            for source in self.sources
+        }
+        results = {}
+        source_results = {}
+        
+        logger.info("📡 Collecting from %d source(s): %s", len(self.sources), ', '.join(s.name for s in self.sources))
+        pool = ThreadPoolExecutor(max_workers=max(1, len(self.sources)))
+        pending = {}  # future -> (source, monotonic time to give up on it)
+        for source in self.sources:
+            source_deadline = deadline.within(source.timeout)
+            give_up_at = None if source_deadline.expires_at is None else source_deadline.expires_at + self.GRACE_SECONDS
+            future = submit_in_context(pool, self._fetch, source, keywords, markets, source_deadline, checkpoint, run)
+            pending[future] = (source, give_up_at)
+        
+        try:
+            while pending:
+                # Abandon sources still running shortly after their own deadline
+                now = time.monotonic()
+                for future, (source, give_up_at) in list(pending.items()):
+                    if give_up_at is not None and now >= give_up_at:
+                        logger.warning("⏱️ Gave up waiting for source %s", source.name)
+                        del pending[future]
+                if not pending:
+                    break
+                
+                give_up_times = [give_up_at for _, give_up_at in pending.values() if give_up_at is not None]
+                timeout = max(0.0, min(give_up_times) - now) if give_up_times else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, _ = pending.pop(future)
+                    entry = stats[source.name]
+                    try:
+                        items, seconds = future.result()
+                    except DeadlineExceeded as e:
+                        logger.warning("⏱️ Source %s ran out of time: %s", source.name, e)
+                    except CircuitOpenError as e:
+                        entry['status'] = 'skipped'
+                        entry['error'] = str(e)
+                        logger.warning("⏭️ Source %s skipped: %s", source.name, e)
+                    except Exception as e:
+                        entry['status'] = 'failed'
+                        entry['error'] = str(e)
+                        logger.warning("✗ Source %s failed: %s", source.name, e)
+                    else:
+                        entry.update(status='ok', items=len(items), seconds=round(seconds, 3))
+                        source_results[source.name] = items
+                        logger.debug("✓ %s: %d items in %.2fs", source.name, len(items), seconds)
+        finally:
+            # Abandoned sources stop at their next deadline check; don't wait for them
+            pool.shutdown(wait=False)
+        
+        # Merge in source priority order, regardless of completion order
+        for source in self.sources:
+            if source.name in source_results:
+                results[source.name] = source_results[source.name]
+        merged = merge_source_items(results, {source.name: source.weight for source in self.sources})
+        logger.info("✅ Merged %d items from %d source(s) into %d foods",
+                    sum(len(items) for items in results.values()), len(results), len(merged))
+        return merged, stats
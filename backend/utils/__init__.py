@@ -1,5 +1,10 @@
 """Utils module"""
 from .error_handlers import handle_errors, register_error_handlers
+from .serialization import dumps_bytes, loads_bytes
+from .keywords import DEFAULT_CACHE_KEY, normalize_keywords, keywords_cache_key
 
-__all__ = ['handle_errors', 'register_error_handlers']
-
+__all__ = [
+    'handle_errors', 'register_error_handlers',
+    'dumps_bytes', 'loads_bytes',
+    'DEFAULT_CACHE_KEY', 'normalize_keywords', 'keywords_cache_key',
+]
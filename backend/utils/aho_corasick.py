@@ -0,0 +1,122 @@
+"""
+Aho-Corasick multi-pattern matcher
+
+Finds every occurrence of a set of phrases in a single linear pass over the
+text, independent of how many phrases are registered.
+"""
+from collections import deque
+from typing import Any, List, Tuple
+
+
+class AhoCorasick:
+    """Case-insensitive phrase matcher with word-boundary checks"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._own_output = [[]]
+        self._output = [[]]
+        self._size = 0
+        self._built = True
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, phrase: str, value: Any = None):
+        """
+        Register a phrase
+
+        Args:
+            phrase: Phrase to match (matched case-insensitively)
+            value: Value returned for matches (defaults to the phrase)
+        """
+        phrase = phrase.lower()
+        if not phrase:
+            return
+
+        state = 0
+        for char in phrase:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own_output.append([])
+                self._output.append([])
+            state = nxt
+
+        self._own_output[state].append((len(phrase), phrase if value is None else value))
+        self._size += 1
+        self._built = False
+
+    def build(self):
+        """Compute failure links (called automatically before matching)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._output[state] = list(self._own_output[state])
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                # Inherit matches ending at the failure state (already complete in BFS order)
+                self._output[nxt] = self._own_output[nxt] + self._output[self._fail[nxt]]
+
+        self._built = True
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Any]]:
+        """
+        Find all whole-word occurrences of registered phrases
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of (start, end, value) tuples, possibly overlapping
+        """
+        if not self._built:
+            self.build()
+
+        lowered = text.lower()
+        matches = []
+        state = 0
+        for i, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for length, value in self._output[state]:
+                start = i - length + 1
+                end = i + 1
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if end < len(lowered) and lowered[end].isalnum():
+                    continue
+                matches.append((start, end, value))
+
+        return matches
+
+    def find_longest(self, text: str) -> List[Tuple[int, int, Any]]:
+        """
+        Find non-overlapping matches, preferring leftmost then longest
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of (start, end, value) tuples in text order
+        """
+        selected = []
+        last_end = 0
+        for start, end, value in sorted(self.find_all(text), key=lambda m: (m[0], -(m[1] - m[0]))):
+            if start >= last_end:
+                selected.append((start, end, value))
+                last_end = end
+        return selected
@@ -0,0 +1,186 @@
+"""
+Sectioned on-disk cache format
+
+Layout (all integers big-endian):
+    magic (4 bytes) | schema version (uint16) | header length (uint32)
+    header (compact JSON)
+    sections (compact JSON documents, back to back)
+
+The header holds the cache metadata (timestamp, counts, version hash) and
+a table of section offsets, so metadata can be read without touching the
+sections and each section can be decoded on its own.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from backend.models import trending_count
+
+from .serialization import dumps_bytes, loads_bytes
+
+MAGIC = b'FTRC'
+# Version 2 stores trending foods as `trending_order` positions in raw_data
+SCHEMA_VERSION = 2
+READABLE_SCHEMAS = (1, 2)
+PREAMBLE = struct.Struct('>4sHI')
+
+# Report keys stored as their own sections; everything else goes to 'meta'
+REPORT_SECTIONS = ('raw_data', 'trending_foods', 'ai_insights')
+
+
+class CacheFormatError(ValueError):
+    """Raised when a cache file is not in the expected format"""
+
+
+def build_header(timestamp: str, report: Dict[str, Any], sections: Dict[str, bytes]) -> Dict[str, Any]:
+    """
+    Build the header document for a report
+    
+    Args:
+        timestamp: ISO timestamp of the cache write
+        report: Report being cached
+        sections: Serialized sections keyed by name
+    
+    Returns:
+        Header dict (without the section table)
+    """
+    digest = hashlib.sha1()
+    for name in sorted(sections):
+        digest.update(name.encode('utf-8'))
+        digest.update(sections[name])
+    
+    return {
+        'schema': SCHEMA_VERSION,
+        'timestamp': timestamp,
+        'report_date': report.get('report_date'),
+        'version': digest.hexdigest()[:16],
+        'counts': {
+            'raw_data': len(report.get('raw_data', [])),
+            'trending_foods': trending_count(report),
+            'product_ideas': len(report.get('ai_insights', {}).get('trends', []))
+        }
+    }
+
+
+def write_cache_file(path: Path, timestamp: str, report: Dict[str, Any],
+                     extra_header: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Write a report to disk in the sectioned format
+    
+    The file is written to a temporary path and moved into place, so
+    readers never observe a partially written cache.
+    
+    Args:
+        path: Destination file
+        timestamp: ISO timestamp of the cache write
+        report: Report to cache
+        extra_header: Additional metadata stored in the header
+    
+    Returns:
+        The header that was written
+    """
+    sections = {name: dumps_bytes(report[name]) for name in REPORT_SECTIONS if name in report}
+    sections['meta'] = dumps_bytes({k: v for k, v in report.items() if k not in REPORT_SECTIONS})
+    
+    header = build_header(timestamp, report, sections)
+    if extra_header:
+        header.update(extra_header)
+    table = {}
+    offset = 0
+    for name, body in sections.items():
+        table[name] = [offset, len(body)]
+        offset += len(body)
+    header['sections'] = table
+    
+    header_bytes = dumps_bytes(header)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, SCHEMA_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for body in sections.values():
+            f.write(body)
+    os.replace(tmp_path, path)
+    
+    return header
+
+
+def _parse_header(buf) -> Dict[str, Any]:
+    """Parse the preamble and header from a buffer"""
+    if len(buf) < PREAMBLE.size:
+        raise CacheFormatError('Cache file is truncated')
+    
+    magic, schema, header_len = PREAMBLE.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise CacheFormatError('Not a trends cache file')
+    if schema not in READABLE_SCHEMAS:
+        raise CacheFormatError(f'Unsupported cache schema version: {schema}')
+    
+    start = PREAMBLE.size
+    header = loads_bytes(bytes(buf[start:start + header_len]))
+    header['_data_offset'] = start + header_len
+    return header
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """
+    Read only the header of a cache file
+    
+    Args:
+        path: Cache file
+    
+    Returns:
+        Header dict
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return _parse_header(buf)
+
+
+def read_sections(path: Path, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Read sections from a cache file
+    
+    Args:
+        path: Cache file
+        names: Section names to decode (all sections if None)
+    
+    Returns:
+        Dict with the header under 'header' and decoded sections by name
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            header = _parse_header(buf)
+            base = header['_data_offset']
+            wanted = header['sections'].keys() if names is None else names
+            
+            result = {'header': header}
+            for name in wanted:
+                if name not in header['sections']:
+                    continue
+                offset, length = header['sections'][name]
+                result[name] = loads_bytes(bytes(buf[base + offset:base + offset + length]))
+            return result
+
+
+def read_cache_file(path: Path) -> Dict[str, Any]:
+    """
+    Read a whole cache file back into the cache document shape
+    
+    Args:
+        path: Cache file
+    
+    Returns:
+        Dict with 'timestamp', 'header' and the full report under 'data'
+    """
+    sections = read_sections(path)
+    header = sections.pop('header')
+    report = sections.pop('meta', {})
+    report.update(sections)
+    return {
+        'timestamp': header['timestamp'],
+        'header': header,
+        'data': report
+    }
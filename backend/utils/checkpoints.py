@@ -0,0 +1,243 @@
+"""
+Checkpoints for resumable collection runs
+
+Every collection run gets a directory under RUNS_DIR named by its run ID:
+
+    run.json                   manifest (status, steps done, query progress)
+    queries/<hash>.json        organic results of one (market, query) search
+    steps/<name>.json          output of a completed step
+
+A retried or restarted run opens the same directory and skips every search
+and step that already has a checkpoint.
+"""
+import hashlib
+import json
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .keywords import keywords_cache_key, normalize_keywords
+
+# Run directories kept on disk (oldest are removed first)
+MAX_RUNS = 50
+
+# Seconds without progress after which a 'running' run counts as abandoned
+STALE_AFTER = 600
+
+# Serializes picking a run to resume and claiming it
+_start_lock = threading.Lock()
+
+_RUN_ID_RE = re.compile(r'^[\w-]+$')
+
+
+def _write_json(path: Path, data: Any):
+    """Write JSON atomically"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    tmp_path.replace(path)
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    """Read JSON, or None if the file is missing or unreadable"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _query_file(market: str, query: str) -> str:
+    return hashlib.sha1(f'{market}\n{query}'.encode('utf-8')).hexdigest()[:20] + '.json'
+
+
+class RunCheckpoint:
+    """On-disk progress of one collection run"""
+    
+    def __init__(self, run_dir: Path, manifest: Dict[str, Any]):
+        self.run_dir = run_dir
+        self.manifest = manifest
+        self._lock = threading.Lock()
+    
+    @property
+    def run_id(self) -> str:
+        return self.manifest['run_id']
+    
+    @property
+    def resumed(self) -> bool:
+        """True if this run was started before"""
+        return self.manifest['attempts'] > 1
+    
+    @classmethod
+    def start(cls, runs_dir: Path, keywords: List[str], markets: List[str],
+              run_id: Optional[str] = None, resume_window: int = 0,
+              stale_after: int = STALE_AFTER) -> 'RunCheckpoint':
+        """
+        Open a run to resume, or create a new one
+        
+        Args:
+            runs_dir: Directory holding all runs
+            keywords: Keyword set of the collection
+            markets: Markets of the collection (used for new runs)
+            run_id: Run to resume explicitly
+            resume_window: Seconds within which an unfinished run for the
+                same keyword set is resumed automatically (0 = never)
+            stale_after: Seconds without progress after which a run still
+                marked 'running' is taken over; until then it belongs to
+                the attempt running it
+        
+        Returns:
+            RunCheckpoint
+        
+        Raises:
+            ValueError: If `run_id` is unknown, belongs to other keywords or
+                is still running
+        """
+        runs_dir = Path(runs_dir)
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        keywords = normalize_keywords(keywords)
+        
+        # Pick and claim the run under the lock, so concurrent attempts never share one
+        with _start_lock:
+            return cls._claim(runs_dir, keywords, markets, run_id, resume_window, stale_after)
+    
+    @classmethod
+    def _claim(cls, runs_dir: Path, keywords: List[str], markets: List[str],
+               run_id: Optional[str], resume_window: int, stale_after: int) -> 'RunCheckpoint':
+        manifest = None
+        if run_id is not None:
+            manifest = load_run(runs_dir, run_id)
+            if manifest is None:
+                raise ValueError(f"Unknown run_id: {run_id}")
+            if manifest['cache_key'] != keywords_cache_key(keywords):
+                raise ValueError(f"Run {run_id} was started for other keywords: {', '.join(manifest['keywords']) or 'default'}")
+            if _is_active(manifest, stale_after):
+                raise ValueError(f"Run {run_id} is still running")
+        elif resume_window > 0:
+            manifest = _find_resumable(runs_dir, keywords_cache_key(keywords), resume_window, stale_after)
+        
+        if manifest is None:
+            now = datetime.now()
+            manifest = {
+                'run_id': f"{now.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}",
+                'cache_key': keywords_cache_key(keywords),
+                'keywords': keywords,
+                'markets': list(markets),
+                'status': 'running',
+                'created_at': now.isoformat(),
+                'attempts': 0,
+                'queries_done': 0,
+                'steps': {},
+                'error': None
+            }
+            _prune(runs_dir, MAX_RUNS - 1)
+        
+        checkpoint = cls(runs_dir / manifest['run_id'], manifest)
+        (checkpoint.run_dir / 'queries').mkdir(parents=True, exist_ok=True)
+        (checkpoint.run_dir / 'steps').mkdir(exist_ok=True)
+        manifest['attempts'] += 1
+        manifest['status'] = 'running'
+        manifest['error'] = None
+        checkpoint._save_manifest()
+        return checkpoint
+    
+    def _save_manifest(self):
+        with self._lock:
+            self.manifest['updated_at'] = datetime.now().isoformat()
+            _write_json(self.run_dir / 'run.json', self.manifest)
+    
+    def load_query(self, market: str, query: str) -> Optional[List[Dict]]:
+        """Get the checkpointed results of a search, or None if it has not run"""
+        return _read_json(self.run_dir / 'queries' / _query_file(market, query))
+    
+    def save_query(self, market: str, query: str, results: List[Dict]):
+        """Checkpoint the results of one search (thread-safe)"""
+        _write_json(self.run_dir / 'queries' / _query_file(market, query), results)
+        with self._lock:
+            self.manifest['queries_done'] += 1
+        self._save_manifest()
+    
+    def load_step(self, name: str) -> Optional[Any]:
+        """Get the output of a completed step, or None"""
+        if name not in self.manifest['steps']:
+            return None
+        return _read_json(self.run_dir / 'steps' / f'{name}.json')
+    
+    def save_step(self, name: str, data: Any):
+        """Checkpoint the output of a step and mark it done"""
+        _write_json(self.run_dir / 'steps' / f'{name}.json', data)
+        with self._lock:
+            self.manifest['steps'][name] = {'completed_at': datetime.now().isoformat()}
+        self._save_manifest()
+    
+    def complete(self, partial: bool = False):
+        """
+        Mark the run as finished
+        
+        Args:
+            partial: The run produced a partial report; it stays resumable
+                so a retry completes it
+        """
+        self.manifest['status'] = 'partial' if partial else 'completed'
+        self._save_manifest()
+    
+    def fail(self, error: Exception):
+        """Mark the run as failed (it can be resumed)"""
+        self.manifest['status'] = 'failed'
+        self.manifest['error'] = str(error)
+        self._save_manifest()
+
+
+def load_run(runs_dir: Path, run_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a run's manifest
+    
+    Returns:
+        Manifest dict, or None for unknown or invalid run IDs
+    """
+    if not _RUN_ID_RE.match(run_id):
+        return None
+    return _read_json(Path(runs_dir) / run_id / 'run.json')
+
+
+def list_runs(runs_dir: Path, limit: int = 20) -> List[Dict[str, Any]]:
+    """List run manifests, newest first"""
+    runs = []
+    for run_dir in sorted(Path(runs_dir).glob('*/'), reverse=True):
+        manifest = _read_json(run_dir / 'run.json')
+        if manifest is not None:
+            runs.append(manifest)
+        if len(runs) >= limit:
+            break
+    return runs
+
+
+def _is_active(manifest: Dict[str, Any], stale_after: int) -> bool:
+    """True if a run is marked 'running' and made progress within `stale_after` seconds"""
+    if manifest['status'] != 'running':
+        return False
+    updated_at = manifest.get('updated_at') or manifest['created_at']
+    return datetime.fromisoformat(updated_at) >= datetime.now() - timedelta(seconds=stale_after)
+
+
+def _find_resumable(runs_dir: Path, cache_key: str, window: int, stale_after: int) -> Optional[Dict[str, Any]]:
+    """Newest unfinished, not active run for a keyword set started within `window` seconds"""
+    cutoff = datetime.now() - timedelta(seconds=window)
+    for manifest in list_runs(runs_dir, MAX_RUNS):
+        if datetime.fromisoformat(manifest['created_at']) < cutoff:
+            break
+        if (manifest['cache_key'] == cache_key and manifest['status'] != 'completed'
+                and not _is_active(manifest, stale_after)):
+            return manifest
+    return None
+
+
+def _prune(runs_dir: Path, keep: int):
+    """Remove the oldest run directories beyond `keep`"""
+    run_dirs = sorted(p for p in Path(runs_dir).iterdir() if p.is_dir())
+    for run_dir in run_dirs[:max(0, len(run_dirs) - keep)]:
+        shutil.rmtree(run_dir, ignore_errors=True)
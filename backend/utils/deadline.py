@@ -0,0 +1,157 @@
+"""
+Deadlines and circuit breakers for outbound API calls
+
+A collection gets one Deadline that is passed down to every SerpAPI and Groq
+call: each call's timeout is capped by the time left, and calls that would
+start after the deadline are skipped. A CircuitBreaker per provider stops
+calling a provider that keeps failing until a cool-down has passed.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work would start after its deadline"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider's circuit breaker is open"""
+
+
+class Deadline:
+    """Point in time by which a piece of work must finish"""
+    
+    def __init__(self, budget: Optional[float] = None):
+        """
+        Args:
+            budget: Seconds from now, or None for no deadline
+        """
+        self.expires_at = None if budget is None else time.monotonic() + budget
+    
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining()!r})"
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None without a deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def check(self, what: str = 'operation'):
+        """
+        Raise if the deadline has passed
+        
+        Raises:
+            DeadlineExceeded: If no time is left to start `what`
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline exceeded before {what}")
+    
+    def timeout(self, cap: float, what: str = 'operation') -> float:
+        """
+        Timeout for one call: the per-call cap, shortened to the time left
+        
+        Raises:
+            DeadlineExceeded: If the deadline has already passed
+        """
+        self.check(what)
+        remaining = self.remaining()
+        return cap if remaining is None else min(cap, remaining)
+    
+    def reserve(self, seconds: float) -> 'Deadline':
+        """
+        Derive a deadline that ends `seconds` earlier
+        
+        Used to keep time for a later step (e.g. the final AI analysis)
+        while an earlier step runs.
+        """
+        child = Deadline()
+        if self.expires_at is not None:
+            child.expires_at = self.expires_at - seconds
+        return child
+    
+    def within(self, seconds: Optional[float]) -> 'Deadline':
+        """
+        Derive a deadline at most `seconds` from now
+        
+        Used to give one piece of work (e.g. a trend source) its own budget
+        inside the collection's deadline. None keeps this deadline.
+        """
+        child = Deadline(seconds)
+        if self.expires_at is not None and (child.expires_at is None or self.expires_at < child.expires_at):
+            child.expires_at = self.expires_at
+        return child
+
+
+class CircuitBreaker:
+    """
+    Fail-fast guard for one provider
+    
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected for `reset_timeout` seconds. Then one trial call is
+    let through: success closes the circuit, failure opens it again.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'"""
+        with self._lock:
+            return self._state()
+    
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+    
+    def before_call(self):
+        """
+        Admit a call or reject it
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or a half-open trial
+                call is already running
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+        raise CircuitOpenError(f"{self.name} circuit is open after repeated failures")
+    
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+    
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold"""
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
@@ -0,0 +1,151 @@
+"""
+Duplicate and near-duplicate detection for search results
+
+Results are collapsed when they share a canonical URL, or when the SimHash
+fingerprints of their title and snippet differ in only a few bits (typical
+of syndicated copies of the same article).
+"""
+import hashlib
+import re
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Query parameters that never change the page content
+TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'spm', 'cmpid'}
+
+# Fingerprints within this Hamming distance are near-duplicates. Titles and
+# snippets are short, so a single edited word moves several bits; unrelated
+# texts differ in ~32 of 64 bits.
+MAX_HAMMING_DISTANCE = 10
+
+SIMHASH_BITS = 64
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different links to one page compare equal
+    
+    Drops the scheme, 'www.'/'m.' host prefixes, fragments, tracking
+    parameters and trailing slashes, and sorts the remaining parameters.
+    
+    Args:
+        url: Result link
+    
+    Returns:
+        Canonical form of the URL ('' for an empty link)
+    """
+    if not url:
+        return ''
+    
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ('www.', 'm.', 'amp.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    
+    path = parts.path.rstrip('/')
+    if path.endswith('/amp'):
+        path = path[:-len('/amp')]
+    
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    query = urlencode(params)
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def simhash(text: str, bits: int = SIMHASH_BITS) -> int:
+    """
+    Compute a SimHash fingerprint over word unigrams and bigrams
+    
+    Args:
+        text: Text to fingerprint
+        bits: Fingerprint size
+    
+    Returns:
+        Fingerprint as an integer
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+    
+    weights = [0] * bits
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for i in range(bits):
+            weights[i] += 1 if h >> i & 1 else -1
+    
+    fingerprint = 0
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count('1')
+
+
+class ResultDeduplicator:
+    """
+    Incrementally collapses duplicate search results
+    
+    Lookups use banded fingerprints (pigeonhole principle: fingerprints
+    within MAX_HAMMING_DISTANCE bits share at least one identical band), so
+    each new result is only compared with a few candidates.
+    """
+    
+    def __init__(self, max_distance: int = MAX_HAMMING_DISTANCE):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = SIMHASH_BITS // self.bands
+        self._urls = set()
+        self._bands: Dict[tuple, List[int]] = {}
+        self.collapsed = 0
+        self.collapsed_by_url = 0
+    
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        return [(i, fingerprint >> (i * self.band_bits) & mask) for i in range(self.bands)]
+    
+    def _find_near_duplicate(self, fingerprint: int) -> Optional[int]:
+        for key in self._band_keys(fingerprint):
+            for candidate in self._bands.get(key, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    return candidate
+        return None
+    
+    def add(self, result: Dict) -> bool:
+        """
+        Register a search result
+        
+        Args:
+            result: Organic result with 'link', 'title' and 'snippet'
+        
+        Returns:
+            True if the result is new, False if it duplicates an earlier one
+        """
+        url = canonical_url(result.get('link', ''))
+        if url and url in self._urls:
+            self.collapsed += 1
+            self.collapsed_by_url += 1
+            return False
+        
+        text = f"{result.get('title', '')} {result.get('snippet', '')}"
+        fingerprint = simhash(text)
+        if _TOKEN_RE.search(text) and self._find_near_duplicate(fingerprint) is not None:
+            self.collapsed += 1
+            if url:
+                self._urls.add(url)
+            return False
+        
+        if url:
+            self._urls.add(url)
+        for key in self._band_keys(fingerprint):
+            self._bands.setdefault(key, []).append(fingerprint)
+        return True
@@ -3,7 +3,10 @@ Error handlers and middleware
 """
 from flask import jsonify
 from functools import wraps
-import traceback
+
+from .log import get_logger
+
+logger = get_logger(__name__)
 
 
 def handle_errors(f):
@@ -19,7 +22,7 @@ def handle_errors(f):
                 'message': str(e)
             }), 400
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("❌ Unhandled error in %s", f.__name__)
             return jsonify({
                 'success': False,
                 'error': 'Internal server error',
@@ -0,0 +1,287 @@
+"""
+Gazetteer of known dish names
+
+Lets the tracker recognize well-known dishes in search snippets locally,
+so only snippets that may mention unknown dishes are sent to the LLM. The
+gazetteer grows from past LLM extraction results and is persisted as JSON.
+"""
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .aho_corasick import AhoCorasick
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Dishes known before any extraction has run
+SEED_DISHES = [
+    'Butter Board',
+    'Dubai Chocolate',
+    'Tanghulu',
+    'Marry Me Chicken',
+    'Birria Tacos',
+    'Dalgona Coffee',
+    'Baked Feta Pasta',
+    'Cottage Cheese Ice Cream',
+    'Pistachio Cream',
+    'Smash Burger',
+    'Cloud Bread',
+    'Ube Latte',
+]
+
+# Words that carry no dish information when left over after matching
+FILLER_WORDS = {
+    'a', 'about', 'all', 'an', 'and', 'are', 'as', 'at', 'be', 'best', 'but', 'by', 'can', 'easy',
+    'every', 'everyone', 'for', 'from', 'get', 'has', 'have', 'here', 'how', 'in', 'into', 'is',
+    'it', 'its', 'just', 'latest', 'make', 'more', 'most', 'new', 'now', 'of', 'on', 'or', 'our',
+    'out', 'popular', 'quick', 'recipe', 'recipes', 'right', 'see', 'should', 'simple', 'so', 'that',
+    'the', 'their', 'these', 'this', 'to', 'top', 'trend', 'trending', 'trends', 'try', 'up', 'viral',
+    'was', 'we', 'what', 'when', 'which', 'who', 'why', 'will', 'with', 'you', 'your', 'food', 'foods',
+    'dish', 'dishes', 'ideas', 'tiktok', 'instagram', 'internet', 'year', 'week', 'today',
+    'also', 'too', 'again', 'everywhere',
+}
+
+# Words left lower-case in Title Case ("How to Make Tanghulu at Home")
+MINOR_WORDS = {
+    'a', 'an', 'and', 'as', 'at', 'but', 'by', 'for', 'from', 'in', 'into', 'nor', 'of', 'on', 'or',
+    'over', 'the', 'to', 'up', 'vs', 'with',
+}
+
+# Words that join a known dish to more of a dish name ("Smash Burger with Kimchi Fries")
+CONNECTOR_WORDS = {'and', 'with', 'or', 'in', 'on', 'over', 'n', '&'}
+
+_WORD_RE = re.compile(r"[^\W\d_][\w'-]*", re.UNICODE)
+_SENTENCE_END_RE = re.compile(r'[.!?:]')
+_CLAUSE_END_RE = re.compile(r'[,;()|]')
+
+# Maximum remembered snippet extractions
+MAX_SNIPPETS = 5000
+
+
+def snippet_key(title: str, snippet: str) -> str:
+    """Stable key for a search result's text"""
+    text = ' '.join(f'{title} {snippet}'.lower().split())
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:20]
+
+
+def _breaks(gap: str) -> List[Tuple[str, Optional[str]]]:
+    """Sentence or clause break found in the text between two words"""
+    if _SENTENCE_END_RE.search(gap):
+        return [('sentence', None)]
+    if _CLAUSE_END_RE.search(gap):
+        return [('clause', None)]
+    return []
+
+
+def _segment(text: str, matches: List[Tuple[int, int, str]]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Split a text into known dishes, the words around them and the breaks between
+    
+    Returns:
+        List of (kind, token) with kind 'dish', 'word', 'sentence' or 'clause'
+    """
+    items = []
+    last = 0
+    for start, end, name in matches + [(len(text), len(text), None)]:
+        chunk = text[last:start]
+        position = 0
+        for word in _WORD_RE.finditer(chunk):
+            items.extend(_breaks(chunk[position:word.start()]))
+            items.append(('word', word.group()))
+            position = word.end()
+        items.extend(_breaks(chunk[position:]))
+        if name is not None:
+            items.append(('dish', name))
+        last = end
+    return items
+
+
+def _title_case_sentences(items: List[Tuple[str, Optional[str]]]) -> List[bool]:
+    """
+    Flag, per item, whether its sentence is written in Title Case
+    
+    A sentence counts as Title Case when at least two of its words (other
+    than known dishes) are capitalized and the only lower-case ones are
+    minor words, as in most search result titles.
+    """
+    flags = []
+    sentence = []
+    for kind, token in items + [('sentence', None)]:
+        if kind != 'sentence':
+            sentence.append(token if kind == 'word' else None)
+            continue
+        words = [word for word in sentence if word is not None and word.lower() not in MINOR_WORDS]
+        title_case = len(words) >= 2 and all(word[0].isupper() for word in words)
+        flags.extend([title_case] * (len(sentence) + 1))
+        sentence = []
+    return flags[:len(items)]
+
+
+def _unknown_neighbour(items: List[Tuple[str, Optional[str]]], index: int, step: int) -> bool:
+    """Check whether the dish at `index` has a non-filler word next to it (skipping connectors)"""
+    j = index + step
+    while 0 <= j < len(items) and items[j][0] == 'word' and items[j][1].lower() in CONNECTOR_WORDS:
+        j += step
+    if 0 <= j < len(items) and items[j][0] == 'word':
+        return items[j][1].lower() not in FILLER_WORDS
+    return False
+
+
+class DishGazetteer:
+    """Known dish names with a multi-pattern matcher over them"""
+    
+    def __init__(self, path: Optional[Path] = None, seed: Iterable[str] = SEED_DISHES):
+        self.path = path
+        self._dishes = {}  # lower-cased name -> {'name': display name, 'count': times seen}
+        self._snippets = {}  # snippet_key -> extracted names
+        self._matcher = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        
+        for name in seed:
+            self._dishes[name.lower()] = {'name': name, 'count': 0}
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._dishes)
+    
+    def _load(self):
+        """Load learned dishes from disk"""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+            self._dishes.update(stored.get('dishes', {}))
+            self._snippets.update(stored.get('snippets', {}))
+        except Exception as e:
+            logger.warning("⚠️ Gazetteer load error: %s", e)
+    
+    def save(self) -> bool:
+        """
+        Persist learned dishes
+        
+        Returns:
+            True if written, False if nothing changed or the write failed
+        """
+        if not self.path or not self._dirty:
+            return False
+        try:
+            with self._lock:
+                stored = {'dishes': dict(self._dishes), 'snippets': dict(self._snippets)}
+                self._dirty = False
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(stored, f)
+            tmp_path.replace(self.path)
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Gazetteer save error: %s", e)
+            return False
+    
+    def _get_matcher(self) -> AhoCorasick:
+        """Get the matcher, rebuilding it after new dishes were learned"""
+        matcher = self._matcher
+        if matcher is None:
+            with self._lock:
+                matcher = AhoCorasick()
+                for key, entry in self._dishes.items():
+                    matcher.add(key, entry['name'])
+                matcher.build()
+                self._matcher = matcher
+        return matcher
+    
+    def match(self, text: str) -> List[str]:
+        """
+        Find known dishes in a text with one linear scan
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Display names of the distinct dishes found, in text order
+        """
+        names = [value for _, _, value in self._get_matcher().find_longest(text)]
+        return list(dict.fromkeys(names))
+    
+    def may_contain_unknown(self, text: str) -> bool:
+        """
+        Check whether a text could mention dishes the gazetteer does not know
+        
+        Known dish names and filler words are removed; the text is treated as
+        a possible unknown dish if it has no known dish at all, if a remaining
+        word is capitalized anywhere but at the start of a sentence, or if a
+        remaining word sits next to a known dish (directly or through a
+        connector like "with"), e.g. "Smash Burger Tacos" or "smash burger
+        with kimchi fries". Capitalization is ignored in Title Case sentences
+        (e.g. "How to Make Tanghulu at Home"), where it says nothing.
+        
+        Args:
+            text: Text to check
+        
+        Returns:
+            True if the text should go to the LLM extractor
+        """
+        matches = self._get_matcher().find_longest(text)
+        if not matches or len(text.lower()) != len(text):
+            # No known dish, or match offsets cannot be mapped back onto the text
+            return True
+        
+        items = _segment(text, matches)
+        title_case = _title_case_sentences(items)
+        sentence_start = True
+        for i, (kind, token) in enumerate(items):
+            if kind == 'sentence':
+                sentence_start = True
+                continue
+            if kind == 'clause':
+                continue
+            if kind == 'word':
+                if (token[0].isupper() and not sentence_start and not title_case[i]
+                        and token.lower() not in FILLER_WORDS):
+                    return True
+            elif _unknown_neighbour(items, i, 1) or _unknown_neighbour(items, i, -1):
+                return True
+            sentence_start = False
+        
+        return False
+    
+    def lookup_snippet(self, title: str, snippet: str) -> Optional[List[str]]:
+        """
+        Get a previous extraction result for the same result text
+        
+        Returns:
+            Extracted names, or None if this text was never extracted
+        """
+        return self._snippets.get(snippet_key(title, snippet))
+    
+    def learn(self, names: Iterable[str], title: Optional[str] = None, snippet: Optional[str] = None):
+        """
+        Add dish names from an extraction result
+        
+        Args:
+            names: Filtered dish names
+            title: Result title the names were extracted from (optional)
+            snippet: Result snippet the names were extracted from (optional)
+        """
+        names = list(names)
+        with self._lock:
+            for name in names:
+                key = name.lower()
+                entry = self._dishes.get(key)
+                if entry is None:
+                    self._dishes[key] = {'name': name, 'count': 1}
+                    self._matcher = None
+                else:
+                    entry['count'] += 1
+            
+            if title is not None or snippet is not None:
+                if len(self._snippets) >= MAX_SNIPPETS:
+                    self._snippets.pop(next(iter(self._snippets)))
+                self._snippets[snippet_key(title or '', snippet or '')] = names
+            
+            self._dirty = True
@@ -0,0 +1,186 @@
+"""
+Query index over the AI insights of one report
+
+Built once per report version (see CacheService), then answers filter,
+sort and group queries over `ai_insights.trends` without scanning the
+report:
+
+- every value of a filter field maps to a bitmask of the trends having it,
+  so filters are a few integer ANDs/ORs
+- each sort order is precomputed as a list of trend positions
+- trends are serialized once; responses join the pre-rendered bytes
+
+A trend's score is the score of the matching food in `trending_foods`
+(the analysis itself has none).
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.models import trending_foods_view
+
+from .keywords import food_name_key
+from .serialization import dumps_bytes
+
+# Fields that can be filtered, sorted and grouped by
+FILTER_FIELDS = ('category', 'innovation_potential', 'target_market')
+SORT_FIELDS = ('score', 'name') + FILTER_FIELDS
+
+# Innovation potential levels, best first (other values sort after them)
+POTENTIAL_ORDER = ('high', 'medium', 'low')
+
+# Query results kept per index
+QUERY_CACHE_SIZE = 128
+
+
+def _normalize(value: Any) -> str:
+    return ' '.join(str(value or '').split()).casefold()
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+class InsightsIndex:
+    """Bitmask indexes and sort orders over one report's trends"""
+    
+    def __init__(self, report: Dict[str, Any]):
+        """
+        Args:
+            report: Report document (with `ai_insights` and its trending foods)
+        """
+        trends = [t for t in (report.get('ai_insights') or {}).get('trends', []) if isinstance(t, dict)]
+        food_scores = {}
+        for food in trending_foods_view(report):
+            food_scores.setdefault(food_name_key(food.get('name', '')), food.get('score', 0))
+        
+        self.report_date = report.get('report_date')
+        self.size = len(trends)
+        self.all = (1 << self.size) - 1
+        self.scores = [food_scores.get(food_name_key(t.get('name', '')), 0) or 0 for t in trends]
+        self.rendered = [dumps_bytes(dict(t, score=score)) for t, score in zip(trends, self.scores)]
+        
+        # field -> normalized value -> bitmask, and the display spelling of each value
+        self.masks: Dict[str, Dict[str, int]] = {field: {} for field in FILTER_FIELDS}
+        self.labels: Dict[str, Dict[str, str]] = {field: {} for field in FILTER_FIELDS}
+        for position, trend in enumerate(trends):
+            for field in FILTER_FIELDS:
+                value = _normalize(trend.get(field))
+                self.masks[field][value] = self.masks[field].get(value, 0) | (1 << position)
+                self.labels[field].setdefault(value, str(trend.get(field) or ''))
+        
+        # Positions by descending score, with the mask of every prefix for min_score
+        self.by_score = sorted(range(self.size), key=lambda i: -self.scores[i])
+        self._score_keys = [-self.scores[i] for i in self.by_score]
+        self._score_prefixes = [0]
+        for position in self.by_score:
+            self._score_prefixes.append(self._score_prefixes[-1] | (1 << position))
+        
+        def rank(field):
+            if field == 'innovation_potential':
+                order = {level: i for i, level in enumerate(POTENTIAL_ORDER)}
+                return lambda i: (order.get(_normalize(trends[i].get(field)), len(order)), -self.scores[i])
+            return lambda i: (_normalize(trends[i].get(field)), -self.scores[i])
+        
+        self.orders = {'score': self.by_score, 'name': sorted(range(self.size), key=rank('name'))}
+        for field in FILTER_FIELDS:
+            self.orders[field] = sorted(range(self.size), key=rank(field))
+        
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _select(self, filters: Dict[str, Iterable[str]], min_score: Optional[float]) -> int:
+        """Bitmask of the trends matching every filter (values of one field are OR-ed)"""
+        selected = self.all
+        for field, values in filters.items():
+            field_masks = self.masks[field]
+            mask = 0
+            for value in values:
+                mask |= field_masks.get(_normalize(value), 0)
+            selected &= mask
+        if min_score is not None:
+            selected &= self._score_prefixes[bisect_right(self._score_keys, -min_score)]
+        return selected
+    
+    def _ordered(self, selected: int, sort: str, descending: bool) -> List[int]:
+        order = self.orders[sort]
+        # Score sorts best first and the other fields ascending; 'descending' flips that
+        if descending != (sort == 'score'):
+            order = order[::-1]
+        return [i for i in order if selected >> i & 1]
+    
+    def _render(self, positions: List[int]) -> bytes:
+        return b'[' + b','.join(self.rendered[i] for i in positions) + b']'
+    
+    def query(self, filters: Optional[Dict[str, Iterable[str]]] = None, min_score: Optional[float] = None,
+              sort: str = 'score', descending: Optional[bool] = None, group_by: Optional[str] = None,
+              limit: Optional[int] = None) -> bytes:
+        """
+        Answer a query as a serialized JSON response body
+        
+        Args:
+            filters: Field -> accepted values (case-insensitive), for FILTER_FIELDS
+            min_score: Minimum score of the matching trending food
+            sort: One of SORT_FIELDS
+            descending: Sort descending (default: best score first, other fields A-Z)
+            group_by: Optional field of FILTER_FIELDS to group the trends by
+            limit: Maximum trends returned (per group when grouping)
+        
+        Returns:
+            JSON body with `total`, `counts` per field, and `trends` or `groups`
+        
+        Raises:
+            ValueError: On unknown fields
+        """
+        filters = {field: tuple(values) for field, values in (filters or {}).items() if values}
+        for field in filters:
+            if field not in FILTER_FIELDS:
+                raise ValueError(f"Cannot filter by '{field}'")
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort}'")
+        if group_by is not None and group_by not in FILTER_FIELDS:
+            raise ValueError(f"Cannot group by '{group_by}'")
+        descending = sort == 'score' if descending is None else descending
+        
+        key = (tuple(sorted(filters.items())), min_score, sort, descending, group_by, limit)
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                return body
+        
+        selected = self._select(filters, min_score)
+        counts = {
+            field: {
+                self.labels[field][value]: _popcount(mask & selected)
+                for value, mask in self.masks[field].items() if mask & selected
+            }
+            for field in FILTER_FIELDS
+        }
+        header = {
+            'success': True,
+            'total': _popcount(selected),
+            'counts': counts,
+            'report_date': self.report_date
+        }
+        
+        positions = self._ordered(selected, sort, descending)
+        if group_by is None:
+            results = self._render(positions[:limit])
+            body = dumps_bytes(header)[:-1] + b',"trends":' + results + b'}'
+        else:
+            groups = []
+            for value, mask in sorted(self.masks[group_by].items(), key=lambda item: -_popcount(item[1] & selected)):
+                members = [i for i in positions if mask >> i & 1]
+                if members:
+                    groups.append(b'{"value":' + dumps_bytes(self.labels[group_by][value]) +
+                                  b',"count":' + str(len(members)).encode() +
+                                  b',"trends":' + self._render(members[:limit]) + b'}')
+            body = dumps_bytes(header)[:-1] + b',"groups":[' + b','.join(groups) + b']}'
+        
+        with self._lock:
+            self._cache[key] = body
+            if len(self._cache) > QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return body
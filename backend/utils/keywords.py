@@ -0,0 +1,48 @@
+"""
+Keyword and food name normalization helpers
+"""
+import hashlib
+import unicodedata
+from typing import Iterable, List, Optional
+
+# Cache key used for collections that run the default search queries
+DEFAULT_CACHE_KEY = 'default'
+
+
+def normalize_keywords(keywords: Optional[Iterable[str]]) -> List[str]:
+    """
+    Normalize a keyword set: trimmed, lower-cased, de-duplicated and sorted
+    
+    Args:
+        keywords: Raw keywords from a request (may be None)
+    
+    Returns:
+        Sorted list of unique normalized keywords
+    """
+    if not keywords:
+        return []
+    normalized = {' '.join(str(k).split()).lower() for k in keywords}
+    normalized.discard('')
+    return sorted(normalized)
+
+
+def keywords_cache_key(keywords: Optional[Iterable[str]]) -> str:
+    """
+    Derive a stable cache key from a keyword set
+    
+    Args:
+        keywords: Raw or normalized keywords
+    
+    Returns:
+        DEFAULT_CACHE_KEY for an empty set, otherwise a short hash
+    """
+    normalized = normalize_keywords(keywords)
+    if not normalized:
+        return DEFAULT_CACHE_KEY
+    return 'kw-' + hashlib.sha1('\n'.join(normalized).encode('utf-8')).hexdigest()[:16]
+
+
+def food_name_key(name: str) -> str:
+    """Key that merges spellings of one food differing only in case, accents or spacing"""
+    decomposed = unicodedata.normalize('NFKD', name.strip().casefold())
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).split())
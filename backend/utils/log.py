@@ -0,0 +1,130 @@
+"""
+Non-blocking structured logging
+
+Loggers only put records on an in-memory queue; a QueueListener thread
+formats them and writes them to stdout, so request threads never block on
+console I/O and concurrent lines never interleave. Every record carries the
+correlation ID of the collection run it belongs to (see run_context), also
+from worker threads started with submit_in_context.
+
+Call configure_logging() once at startup (the API and the CLI do).
+Per-query and per-result lines are logged at DEBUG and use lazy %-style
+arguments, so they cost nothing unless LOG_LEVEL=DEBUG.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Root of all application loggers
+LOGGER_NAME = 'food_trends'
+
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s [%(run_id)s] %(name)s: %(message)s'
+
+# Attributes of every LogRecord, i.e. not passed through `extra`
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'run_id'}
+
+_run_id = contextvars.ContextVar('run_id', default='-')
+_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get an application logger
+    
+    Args:
+        name: Module name (e.g. __name__)
+    
+    Returns:
+        Logger below the 'food_trends' root
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+@contextmanager
+def run_context(run_id: str):
+    """Tag every record logged inside the block (in this context) with `run_id`"""
+    token = _run_id.set(run_id)
+    try:
+        yield
+    finally:
+        _run_id.reset(token)
+
+
+def current_run_id() -> str:
+    """Correlation ID of the current context ('-' outside a run)"""
+    return _run_id.get()
+
+
+def submit_in_context(pool, fn, *args, **kwargs):
+    """
+    Submit `fn` to an executor so it runs with the caller's correlation ID
+    
+    While a profile is active, the call is also profiled on its worker
+    thread (see profiling.call_profiled).
+    """
+    from .profiling import call_profiled  # profiling imports this module
+    return pool.submit(contextvars.copy_context().run, call_profiled, fn, *args, **kwargs)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """Queue handler that captures the correlation ID and leaves formatting to the listener"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs on the calling thread: only capture context, format later
+        record.run_id = _run_id.get()
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with `extra` fields as top-level keys"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'run_id': getattr(record, 'run_id', '-'),
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level: str = 'INFO', fmt: str = 'text'):
+    """
+    Route application logs through a background writer thread
+    
+    Safe to call more than once (later calls only change the level).
+    
+    Args:
+        level: Minimum level name (DEBUG, INFO, WARNING, ...)
+        fmt: 'text' for readable lines or 'json' for one JSON object per line
+    """
+    global _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level.upper())
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_ContextQueueHandler(log_queue))
+    logger.propagate = False
+    
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # Flush queued records on exit
+    atexit.register(_listener.stop)
@@ -0,0 +1,159 @@
+"""
+Latency-aware routing of LLM calls between model tiers
+
+Each task (e.g. 'extraction', 'analysis') has an ordered list of candidate
+models. The router keeps a moving average of latency and error rate per task
+and model (prompt sizes differ a lot between tasks) and orders the candidates
+for every call:
+
+- 'fastest' tasks try the healthy model with the lowest observed latency
+  first (unmeasured models are tried first, so they get measured)
+- 'preferred' tasks keep the configured order (best model first)
+
+In both cases, models that are throttled, erroring or slower than the task's
+latency limit are moved to the end, so callers fall back automatically.
+An erroring or slow model is tried again RECOVERY_SECONDS after its last
+call, so it can recover once the provider does.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Weight of the newest observation in the moving averages
+EWMA_ALPHA = 0.3
+
+# Error rate (moving average) above which a model is considered unhealthy
+MAX_ERROR_RATE = 0.5
+
+# Seconds a model is skipped after a rate-limit response without Retry-After
+THROTTLE_COOLDOWN = 30.0
+
+# Seconds after its last call when an erroring or slow model is tried again
+RECOVERY_SECONDS = 60.0
+
+
+def is_throttled_error(error: Exception) -> bool:
+    """Check whether an API error is a rate-limit (HTTP 429) response"""
+    return getattr(error, 'status_code', None) == 429 or 'RateLimit' in type(error).__name__
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a rate-limit response's Retry-After header, if present"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelStats:
+    """Observed behaviour of one model on one task"""
+    
+    __slots__ = ('calls', 'errors', 'latency', 'error_rate', 'last_call_at')
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = None  # moving average of successful call seconds
+        self.error_rate = 0.0  # moving average of failures (0..1)
+        self.last_call_at = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'latency_seconds': None if self.latency is None else round(self.latency, 3),
+            'error_rate': round(self.error_rate, 3)
+        }
+
+
+class ModelRouter:
+    """Orders candidate models per task from observed latency and errors"""
+    
+    def __init__(self, tiers: Dict[str, List[str]], policies: Optional[Dict[str, str]] = None,
+                 latency_limits: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            tiers: Task name -> candidate models, in preference order
+            policies: Task name -> 'fastest' or 'preferred' (default 'preferred')
+            latency_limits: Task name -> seconds above which a model counts as slow
+        """
+        self.tiers = {task: list(models) for task, models in tiers.items()}
+        self.policies = policies or {}
+        self.latency_limits = latency_limits or {}
+        self._stats: Dict[tuple, ModelStats] = {}
+        self._throttled_until: Dict[str, float] = {}  # rate limits apply to a model across tasks
+        self._lock = threading.Lock()
+    
+    def _get_stats(self, task: str, model: str) -> ModelStats:
+        stats = self._stats.get((task, model))
+        if stats is None:
+            stats = self._stats[(task, model)] = ModelStats()
+        return stats
+    
+    def _healthy(self, task: str, model: str, now: float) -> bool:
+        if self._throttled_until.get(model, 0.0) > now:
+            return False
+        stats = self._get_stats(task, model)
+        if now - stats.last_call_at >= RECOVERY_SECONDS:
+            return True
+        if stats.error_rate > MAX_ERROR_RATE:
+            return False
+        limit = self.latency_limits.get(task)
+        return limit is None or stats.latency is None or stats.latency <= limit
+    
+    def candidates(self, task: str) -> List[str]:
+        """
+        Get the models to try for a task, best first
+        
+        Raises:
+            KeyError: If the task has no configured models
+        """
+        models = self.tiers[task]
+        now = time.monotonic()
+        with self._lock:
+            healthy = [m for m in models if self._healthy(task, m, now)]
+            unhealthy = [m for m in models if m not in healthy]
+            
+            if self.policies.get(task) == 'fastest':
+                def latency_key(model):
+                    latency = self._get_stats(task, model).latency
+                    return -1.0 if latency is None else latency
+                healthy.sort(key=latency_key)
+            
+            # Unhealthy models stay available as a last resort, soonest available first
+            unhealthy.sort(key=lambda m: (self._throttled_until.get(m, 0.0), self._get_stats(task, m).error_rate))
+        return healthy + unhealthy
+    
+    def record_success(self, task: str, model: str, seconds: float):
+        """Record a successful call and its latency"""
+        with self._lock:
+            stats = self._get_stats(task, model)
+            stats.calls += 1
+            stats.last_call_at = time.monotonic()
+            stats.latency = seconds if stats.latency is None else (
+                EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * stats.latency)
+            stats.error_rate *= 1 - EWMA_ALPHA
+    
+    def record_failure(self, task: str, model: str, error: Exception):
+        """Record a failed call, putting the model on cool-down if it was throttled"""
+        with self._lock:
+            stats = self._get_stats(task, model)
+            stats.calls += 1
+            stats.errors += 1
+            stats.last_call_at = time.monotonic()
+            stats.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * stats.error_rate
+            if is_throttled_error(error):
+                self._throttled_until[model] = time.monotonic() + (_retry_after(error) or THROTTLE_COOLDOWN)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get observed stats per task and model"""
+        now = time.monotonic()
+        with self._lock:
+            snapshot = {}
+            for (task, model), stats in self._stats.items():
+                entry = stats.to_dict()
+                entry['throttled'] = self._throttled_until.get(model, 0.0) > now
+                snapshot.setdefault(task, {})[model] = entry
+            return snapshot
@@ -0,0 +1,260 @@
+"""
+Opt-in profiling of collection runs
+
+A ProfileSession runs cProfile on the calling thread and on every worker
+thread started with submit_in_context from it, and times every SerpAPI/Groq
+call, so a run's wall time can be split into network wait and CPU. The
+session is held in a context variable (copied into those workers), so
+concurrent runs that are not profiled add nothing to it. The workers' stats
+are merged into one pstats file, saved with a JSON summary. When no session
+is active, the only cost on the request path is a context variable lookup
+in record_network() and call_profiled().
+
+cProfile allows one active profiler per process, so only one session runs
+at a time; starting a second one raises ProfilerBusyError. On Python 3.12+
+that profiler traces every thread, so the function table can include
+other requests running at the same time; network and CPU times cannot.
+"""
+import contextvars
+import cProfile
+import json
+import pstats
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Number of functions listed in a profile summary
+TOP_FUNCTIONS = 30
+
+_PROFILE_ID_RE = re.compile(r'^[\w-]+$')
+
+# Session of the run being profiled, visible to its own threads only
+_session = contextvars.ContextVar('profile_session', default=None)
+# Session holding the process's profiler, if any
+_active_session = None
+_session_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is started while another one is running"""
+
+
+def record_network(provider: str, started: float):
+    """
+    Record a finished network call in the active profile (no-op when off)
+    
+    Args:
+        provider: Provider name (e.g. 'serpapi', 'groq')
+        started: time.perf_counter() value taken before the call
+    """
+    session = _session.get()
+    if session is not None:
+        session.add_network_call(provider, started, time.perf_counter())
+
+
+def call_profiled(fn, *args, **kwargs):
+    """
+    Run `fn`, profiling it into the active session (plain call when off)
+    
+    Before Python 3.12 cProfile only traces the thread that enabled it, so
+    each call submitted to a worker thread gets its own profiler, merged
+    into the session's trace when the call returns. The call's thread CPU
+    time is added to the session either way.
+    """
+    session = _session.get()
+    if session is None:
+        return fn(*args, **kwargs)
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+: the session's profiler already traces every thread
+        profiler = None
+    cpu_start = time.thread_time()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        session.add_worker_call(profiler, time.thread_time() - cpu_start)
+
+
+def _union_seconds(intervals: List[tuple]) -> float:
+    """Total length covered by possibly overlapping (start, end) intervals"""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class ProfileSession:
+    """
+    Context manager that profiles one run
+    
+    Usage:
+        with ProfileSession('collect', PROFILES_DIR) as session:
+            ...
+        session.summary  # saved summary dict
+    """
+    
+    def __init__(self, name: str, output_dir: Path):
+        self.profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{name}"
+        self.output_dir = Path(output_dir)
+        self.summary = None
+        self._profiler = cProfile.Profile()
+        self._worker_profilers = []
+        self._worker_calls = 0
+        self._worker_cpu = 0.0
+        self._network = []  # (provider, start, end)
+        self._lock = threading.Lock()
+    
+    def add_network_call(self, provider: str, start: float, end: float):
+        """Record one network call's start and end (perf_counter seconds)"""
+        with self._lock:
+            self._network.append((provider, start, end))
+    
+    def add_worker_call(self, profiler: Optional[cProfile.Profile], cpu: float):
+        """Add a call that ran on a worker thread (profiler is None if the session's traced it)"""
+        with self._lock:
+            if profiler is not None:
+                self._worker_profilers.append(profiler)
+            self._worker_calls += 1
+            self._worker_cpu += cpu
+    
+    def __enter__(self) -> 'ProfileSession':
+        global _active_session
+        with _session_lock:
+            if _active_session is not None:
+                raise ProfilerBusyError("Another profile is already running")
+            _active_session = self
+        self._token = _session.set(self)
+        
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._started_at = datetime.now()
+        self._profiler.enable()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        global _active_session
+        self._profiler.disable()
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.thread_time() - self._cpu_start
+        _session.reset(self._token)
+        with _session_lock:
+            _active_session = None
+        # Workers still running (abandoned sources) are left out of the trace
+        with self._lock:
+            worker_profilers, self._worker_profilers = self._worker_profilers, []
+            worker_calls, cpu = self._worker_calls, cpu + self._worker_cpu
+        
+        try:
+            self.summary = self._save(wall, cpu, worker_profilers, worker_calls, failed=exc_type is not None)
+        except Exception as e:
+            logger.warning("⚠️ Profile save error: %s", e)
+        return False
+    
+    def _network_breakdown(self) -> Dict[str, Dict[str, Any]]:
+        providers = {}
+        for provider, start, end in self._network:
+            entry = providers.setdefault(provider, {'calls': 0, 'seconds': 0.0})
+            entry['calls'] += 1
+            entry['seconds'] += end - start
+        for entry in providers.values():
+            entry['seconds'] = round(entry['seconds'], 3)
+        return providers
+    
+    def _top_functions(self, stats: pstats.Stats) -> List[Dict[str, Any]]:
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+        return [
+            {
+                'function': f"{Path(filename).name}:{line}({func})",
+                'calls': calls,
+                'own_seconds': round(own, 4),
+                'cumulative_seconds': round(cumulative, 4)
+            }
+            for (filename, line, func), (_, calls, own, cumulative, _) in rows
+        ]
+    
+    def _save(self, wall: float, cpu: float, worker_profilers: List[cProfile.Profile],
+              worker_calls: int, failed: bool) -> Dict[str, Any]:
+        """Write the merged pstats trace and the JSON summary, returning the summary"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stats_path = self.output_dir / f"{self.profile_id}.prof"
+        stats = pstats.Stats(self._profiler)
+        for profiler in worker_profilers:
+            stats.add(profiler)
+        stats.dump_stats(str(stats_path))
+        
+        network_wait = _union_seconds([(start, end) for _, start, end in self._network])
+        summary = {
+            'profile_id': self.profile_id,
+            'started_at': self._started_at.isoformat(),
+            'failed': failed,
+            'wall_seconds': round(wall, 3),
+            # CPU time of the run's own threads (calling thread and its workers)
+            'cpu_seconds': round(cpu, 3),
+            # Wall time during which at least one network call was in flight
+            'network_wait_seconds': round(network_wait, 3),
+            'network': self._network_breakdown(),
+            'top_functions': self._top_functions(stats),
+            'worker_calls': worker_calls,
+            'trace_file': stats_path.name
+        }
+        
+        with open(self.output_dir / f"{self.profile_id}.json", 'w') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+
+def profile_path(output_dir: Path, profile_id: str, kind: str = 'json') -> Optional[Path]:
+    """
+    Resolve a saved profile file
+    
+    Args:
+        output_dir: Profiles directory
+        profile_id: Profile ID
+        kind: 'json' (summary) or 'prof' (pstats trace)
+    
+    Returns:
+        Path to an existing file, or None for unknown or invalid IDs
+    """
+    if kind not in ('json', 'prof') or not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = Path(output_dir) / f"{profile_id}.{kind}"
+    return path if path.exists() else None
+
+
+def list_profiles(output_dir: Path) -> List[Dict[str, Any]]:
+    """
+    List saved profiles, newest first
+    
+    Returns:
+        Profile summaries without their function tables
+    """
+    profiles = []
+    for path in sorted(Path(output_dir).glob('*.json'), reverse=True):
+        try:
+            with open(path, 'r') as f:
+                summary = json.load(f)
+        except Exception:
+            continue
+        summary.pop('top_functions', None)
+        profiles.append(summary)
+    return profiles
@@ -0,0 +1,194 @@
+"""
+Decayed ranking of foods across collection runs
+
+Each food's score is its mention count with exponential time decay (a
+mention loses half its weight every half-life). Scores use forward decay:
+a mention at time t is stored with weight exp(rate * (t - landmark)), so
+stored weights never need to be decayed, a run only touches the foods it
+mentions, and ordering by stored weight is ordering by decayed score.
+
+State is a JSON snapshot plus an append-only log of runs. Recording a run
+appends one log line; the snapshot is rewritten every COMPACT_EVERY runs.
+"""
+import heapq
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Days after which a mention counts half
+DEFAULT_HALF_LIFE_DAYS = 7.0
+
+# Runs appended to the log before the snapshot is rewritten
+COMPACT_EVERY = 50
+
+# Largest landmark exponent before weights are rebased (exp(600) is far below float max)
+MAX_EXPONENT = 600.0
+
+
+class DecayedRanking:
+    """Persistent per-food decayed mention counts with top-K queries"""
+    
+    def __init__(self, path: Optional[Path] = None, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        self.path = path
+        self.log_path = path.with_name(path.name + '.log') if path else None
+        self.half_life_days = half_life_days
+        self.decay_rate = math.log(2) / (half_life_days * 86400)
+        self.landmark = None
+        self._foods = {}  # key -> [display name, weight, mentions, last seen]
+        self._log_runs = 0
+        self._version = 0
+        self._top_cache = (None, None, [])  # (version, k, result)
+        self._lock = threading.Lock()
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._foods)
+    
+    def _load(self):
+        """Load the snapshot and replay runs logged after it"""
+        if not self.path:
+            return
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    stored = json.load(f)
+                self.landmark = stored.get('landmark')
+                self._foods = stored.get('foods', {})
+            if self.log_path.exists():
+                with open(self.log_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        run = json.loads(line)
+                        self._apply(run['mentions'], run['timestamp'])
+                        self._log_runs += 1
+        except Exception as e:
+            logger.warning("⚠️ Ranking load error: %s", e)
+    
+    def _apply(self, mentions: Dict[str, Tuple[str, int]], timestamp: float) -> bool:
+        """
+        Add one run's mentions to the stored weights
+        
+        Returns:
+            True if the landmark had to be moved first
+        """
+        rebased = False
+        if self.landmark is None:
+            self.landmark = timestamp
+        elif self.decay_rate * (timestamp - self.landmark) > MAX_EXPONENT:
+            self._rebase(timestamp)
+            rebased = True
+        
+        factor = math.exp(self.decay_rate * (timestamp - self.landmark))
+        for key, (name, count) in mentions.items():
+            entry = self._foods.get(key)
+            if entry is None:
+                self._foods[key] = [name, count * factor, count, timestamp]
+            else:
+                entry[1] += count * factor
+                entry[2] += count
+                entry[3] = max(entry[3], timestamp)
+        self._version += 1
+        return rebased
+    
+    def _rebase(self, landmark: float):
+        """Move the landmark forward, rescaling every weight"""
+        factor = math.exp(-self.decay_rate * (landmark - self.landmark))
+        for entry in self._foods.values():
+            entry[1] *= factor
+        self.landmark = landmark
+        self._version += 1
+    
+    def record(self, mentions: Dict[str, Tuple[str, int]], timestamp: Optional[float] = None):
+        """
+        Add the mentions of one collection run
+        
+        Args:
+            mentions: Food key -> (display name, mention count)
+            timestamp: Run time (epoch seconds, defaults to now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if self._apply(mentions, timestamp):
+                # Persist the rebased weights right away
+                self._log_runs = COMPACT_EVERY
+            
+            if not self.path:
+                return
+            try:
+                if self._log_runs >= COMPACT_EVERY:
+                    self._write_snapshot()
+                else:
+                    with open(self.log_path, 'a') as f:
+                        f.write(json.dumps({'timestamp': timestamp, 'mentions': mentions}) + '\n')
+                    self._log_runs += 1
+            except Exception as e:
+                logger.warning("⚠️ Ranking save error: %s", e)
+    
+    def _write_snapshot(self):
+        """Write the full state atomically and truncate the log (lock held)"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'landmark': self.landmark, 'half_life_days': self.half_life_days, 'foods': self._foods}, f)
+        tmp_path.replace(self.path)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        self._log_runs = 0
+    
+    def _decay(self, now: Optional[float]) -> float:
+        """Factor converting stored weights to decayed mention counts at `now`"""
+        now = time.time() if now is None else now
+        return math.exp(-self.decay_rate * (now - self.landmark))
+    
+    def score(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Get a food's decayed mention count
+        
+        Args:
+            key: Food key (see food_name_key)
+            now: Time to decay to (epoch seconds, defaults to now)
+        
+        Returns:
+            Decayed mentions, 0.0 for unknown foods
+        """
+        entry = self._foods.get(key)
+        if entry is None:
+            return 0.0
+        return entry[1] * self._decay(now)
+    
+    def top(self, k: int = 20, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get the k foods with the highest decayed score
+        
+        Args:
+            k: Number of foods
+            now: Time to decay to (epoch seconds, defaults to now)
+        
+        Returns:
+            List of dicts with name, decayed_score, mentions and last_seen
+        """
+        with self._lock:
+            version, cached_k, ranked = self._top_cache
+            if version != self._version or cached_k is None or cached_k < k:
+                # O(n log k); reused until the next run is recorded
+                ranked = heapq.nlargest(k, self._foods.items(), key=lambda item: item[1][1])
+                self._top_cache = (self._version, k, ranked)
+            decay = self._decay(now) if self._foods else 0.0
+        
+        return [
+            {
+                'name': name,
+                'decayed_score': round(weight * decay, 3),
+                'mentions': mentions,
+                'last_seen': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(last_seen))
+            }
+            for _, (name, weight, mentions, last_seen) in ranked[:k]
+        ]
@@ -0,0 +1,268 @@
+"""
+Full-text search over the trends of every saved report
+
+Each AI trend of a saved report is one document: its name, description and
+product ideas are tokenized into an inverted index (term -> postings). The
+index keeps what hits need (report date, trend name, ideas), so searches
+never re-read report files, and a sorted vocabulary answers prefix
+queries ("pista*") with a binary search.
+
+State is a JSON snapshot plus an append-only log of added reports, like
+the decayed ranking: adding a report appends one line. The snapshot is
+rewritten once the log holds as many reports as the snapshot (at least
+COMPACT_EVERY), so saving stays cheap however large the archive grows.
+"""
+import heapq
+import json
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# Minimum reports appended to the log before the snapshot is rewritten
+COMPACT_EVERY = 50
+
+# Weight of a term by the field it appears in, and the field's bit in a posting
+FIELD_WEIGHTS = {'name': 3.0, 'product_ideas': 2.0, 'description': 1.0}
+FIELD_BITS = {'name': 1, 'product_ideas': 2, 'description': 4}
+
+# Words too common to index
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is', 'it', 'its',
+    'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'with'
+}
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased, accent-free terms without stop words"""
+    decomposed = unicodedata.normalize('NFKD', str(text or '').casefold())
+    plain = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return [t for t in _TOKEN_RE.findall(plain) if len(t) > 1 and t not in STOP_WORDS]
+
+
+class ReportSearchIndex:
+    """Inverted index over trend names, descriptions and product ideas of all saved reports"""
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.log_path = path.with_name(path.name + '.log') if path else None
+        self._docs = []  # doc id -> [report id, report date, cache key, name, category, product ideas]
+        self._reports = set()
+        self._postings: Dict[str, Dict[int, list]] = {}  # term -> {doc id: [weight, field bits]}
+        self._vocabulary = []  # sorted terms, for prefix queries
+        self._log_reports = 0
+        self._snapshot_reports = 0
+        self._lock = threading.Lock()
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    @property
+    def report_count(self) -> int:
+        return len(self._reports)
+    
+    def _load(self):
+        """Load the snapshot and replay reports logged after it"""
+        if not self.path:
+            return
+        try:
+            if self.path.exists():
+                with open(self.path, 'r') as f:
+                    stored = json.load(f)
+                self._docs = stored.get('docs', [])
+                self._postings = {
+                    term: {int(doc_id): posting for doc_id, posting in postings.items()}
+                    for term, postings in stored.get('postings', {}).items()
+                }
+                self._vocabulary = sorted(self._postings)
+                self._reports = {doc[0] for doc in self._docs}
+                self._snapshot_reports = len(self._reports)
+            if self.log_path.exists():
+                with open(self.log_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        entry = json.loads(line)
+                        self._apply(entry['report_id'], entry['report_date'], entry['cache_key'], entry['trends'])
+                        self._log_reports += 1
+        except Exception as e:
+            logger.warning("⚠️ Search index load error: %s", e)
+    
+    def _apply(self, report_id: str, report_date: Optional[str], cache_key: str, trends: List[Dict[str, Any]]):
+        """Index the trends of one report"""
+        self._reports.add(report_id)
+        for trend in trends:
+            doc_id = len(self._docs)
+            ideas = [str(idea) for idea in trend.get('product_ideas') or []]
+            self._docs.append([report_id, report_date, cache_key, trend.get('name', ''), trend.get('category'), ideas])
+            
+            fields = {
+                'name': tokenize(trend.get('name', '')),
+                'product_ideas': [t for idea in ideas for t in tokenize(idea)],
+                'description': tokenize(trend.get('description', ''))
+            }
+            for field, terms in fields.items():
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = {}
+                        insort(self._vocabulary, term)
+                    posting = postings.get(doc_id)
+                    if posting is None:
+                        posting = postings[doc_id] = [0.0, 0]
+                    posting[0] += FIELD_WEIGHTS[field]
+                    posting[1] |= FIELD_BITS[field]
+    
+    def add_report(self, report_id: str, report: Dict[str, Any], cache_key: str) -> bool:
+        """
+        Index the AI trends of a saved report
+        
+        Args:
+            report_id: Unique ID of this report version (e.g. cache key and save time)
+            report: Report document
+            cache_key: Cache key of the report's keyword set
+        
+        Returns:
+            True if the report was added, False if it was already indexed
+        """
+        trends = [
+            {field: t.get(field) for field in ('name', 'category', 'description', 'product_ideas')}
+            for t in (report.get('ai_insights') or {}).get('trends', []) if isinstance(t, dict)
+        ]
+        report_date = report.get('report_date')
+        with self._lock:
+            if report_id in self._reports:
+                return False
+            self._apply(report_id, report_date, cache_key, trends)
+            
+            if not self.path:
+                return True
+            try:
+                if self._log_reports + 1 >= max(COMPACT_EVERY, self._snapshot_reports):
+                    self._write_snapshot()
+                else:
+                    with open(self.log_path, 'a') as f:
+                        f.write(json.dumps({
+                            'report_id': report_id, 'report_date': report_date,
+                            'cache_key': cache_key, 'trends': trends
+                        }) + '\n')
+                    self._log_reports += 1
+            except Exception as e:
+                logger.warning("⚠️ Search index save error: %s", e)
+        return True
+    
+    def _write_snapshot(self):
+        """Write the full index atomically and truncate the log (lock held)"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'docs': self._docs, 'postings': self._postings}, f)
+        tmp_path.replace(self.path)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        self._log_reports = 0
+        self._snapshot_reports = len(self._reports)
+    
+    def _expand(self, term: str) -> List[str]:
+        """Terms matching one query term ('pista*' matches every term starting with 'pista')"""
+        if not term.endswith('*'):
+            return [term] if term in self._postings else []
+        prefix = term[:-1]
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + '\uffff')
+        return self._vocabulary[start:end]
+    
+    def search(self, query: str, limit: int = 20) -> Dict[str, Any]:
+        """
+        Find the trends matching every term of a query
+        
+        Terms ending in '*' match as prefixes. Hits are ranked by TF-IDF,
+        with terms in names counting more than in ideas and descriptions,
+        and newer reports first on ties.
+        
+        Args:
+            query: Search text
+            limit: Maximum hits
+        
+        Returns:
+            Dict with `total` matches and `hits` (report, trend and matched ideas)
+        """
+        terms = []
+        for raw in query.split():
+            prefix = raw.endswith('*')
+            for term in tokenize(raw):
+                terms.append(term + '*' if prefix else term)
+        if not terms:
+            return {'total': 0, 'hits': []}
+        
+        with self._lock:
+            total_docs = len(self._docs) or 1
+            # Per query term: doc id -> [score, field bits], merged over prefix expansions
+            matches = []
+            for term in terms:
+                scores = {}
+                for expanded in self._expand(term):
+                    postings = self._postings[expanded]
+                    idf = math.log(1 + total_docs / len(postings))
+                    for doc_id, (weight, bits) in postings.items():
+                        entry = scores.get(doc_id)
+                        if entry is None:
+                            scores[doc_id] = [weight * idf, bits]
+                        else:
+                            entry[0] += weight * idf
+                            entry[1] |= bits
+                if not scores:
+                    return {'total': 0, 'hits': []}
+                matches.append(scores)
+            
+            # Intersect, starting from the rarest term
+            matches.sort(key=len)
+            candidates = matches[0]
+            ranked = {}
+            for doc_id, (score, bits) in candidates.items():
+                for other in matches[1:]:
+                    entry = other.get(doc_id)
+                    if entry is None:
+                        break
+                    score += entry[0]
+                    bits |= entry[1]
+                else:
+                    ranked[doc_id] = (score, bits)
+            
+            best = heapq.nlargest(limit, ranked.items(), key=lambda item: (item[1][0], self._docs[item[0]][1] or ''))
+            docs = [(self._docs[doc_id], score, bits) for doc_id, (score, bits) in best]
+        
+        hits = []
+        for (report_id, report_date, cache_key, name, category, ideas), score, bits in docs:
+            hit = {
+                'report_id': report_id,
+                'report_date': report_date,
+                'cache_key': cache_key,
+                'name': name,
+                'category': category,
+                'score': round(score, 3),
+                'matched_fields': [field for field, bit in FIELD_BITS.items() if bits & bit]
+            }
+            if bits & FIELD_BITS['product_ideas']:
+                hit['product_ideas'] = [idea for idea in ideas if self._matches(idea, terms)]
+            hits.append(hit)
+        return {'total': len(ranked), 'hits': hits}
+    
+    @staticmethod
+    def _matches(text: str, terms: List[str]) -> bool:
+        """Check whether a text contains any query term"""
+        tokens = tokenize(text)
+        return any(
+            any(token.startswith(term[:-1]) for token in tokens) if term.endswith('*') else term in tokens
+            for term in terms
+        )
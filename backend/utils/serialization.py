@@ -0,0 +1,41 @@
+"""
+JSON serialization helpers
+Uses orjson when it is installed and falls back to the standard library
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps_bytes(data: Any) -> bytes:
+    """
+    Serialize data to compact UTF-8 JSON bytes
+
+    Args:
+        data: JSON-serializable object
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads_bytes(raw: bytes) -> Any:
+    """
+    Parse JSON bytes produced by dumps_bytes
+
+    Args:
+        raw: Encoded JSON document
+
+    Returns:
+        Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
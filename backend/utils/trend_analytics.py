@@ -0,0 +1,148 @@
+"""
+Vectorized time-series analytics for Google Trends timelines
+
+A timeline is parsed once into a (keywords x time points) matrix; momentum
+metrics are then computed for all keywords at once with NumPy.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Number of most recent points used for the slope
+RECENT_WINDOW = 8
+
+# Recent mean must exceed the baseline mean by this factor to count as a breakout
+BREAKOUT_RATIO = 1.5
+
+
+def timeline_matrix(timeline: List[Dict[str, Any]], keywords: Sequence[str]) -> np.ndarray:
+    """
+    Parse SerpAPI `timeline_data` into a keywords x time points matrix
+    
+    Args:
+        timeline: Items of `interest_over_time.timeline_data`
+        keywords: Row order of the matrix (matched against each value's 'query')
+    
+    Returns:
+        Float matrix, NaN where a keyword has no value at a time point
+    """
+    rows = {keyword: i for i, keyword in enumerate(keywords)}
+    matrix = np.full((len(keywords), len(timeline)), np.nan)
+    
+    for col, item in enumerate(timeline):
+        for val_obj in item.get('values', []):
+            row = rows.get(val_obj.get('query'))
+            extracted = val_obj.get('extracted_value')
+            if row is not None and extracted is not None:
+                matrix[row, col] = extracted
+    
+    return matrix
+
+
+def _nan_mean(values: np.ndarray) -> np.ndarray:
+    """Mean of each row ignoring NaNs (0 for rows without values)"""
+    n = (~np.isnan(values)).sum(axis=1)
+    total = np.nansum(values, axis=1)
+    return np.divide(total, n, out=np.zeros(values.shape[0]), where=n > 0)
+
+
+def row_mean(matrix: np.ndarray, row: int) -> Optional[float]:
+    """
+    Mean of one row of a timeline matrix
+    
+    Args:
+        matrix: Keywords x time points interest matrix (NaN = missing)
+        row: Keyword row
+    
+    Returns:
+        Mean interest, or None if the row has no values
+    """
+    values = matrix[row]
+    if np.isnan(values).all():
+        return None
+    return float(np.nanmean(values))
+
+
+def _nan_slope(window: np.ndarray) -> np.ndarray:
+    """Least-squares slope of each row, ignoring NaNs"""
+    mask = ~np.isnan(window)
+    x = np.broadcast_to(np.arange(window.shape[1], dtype=float), window.shape)
+    n = mask.sum(axis=1)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(mask, x, 0).sum(axis=1) / n
+        y_mean = np.where(mask, window, 0).sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0)
+        dy = np.where(mask, window - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    
+    return np.where(n >= 2, slope, 0.0)
+
+
+def momentum_metrics(matrix: np.ndarray, window: int = RECENT_WINDOW,
+                     breakout_ratio: float = BREAKOUT_RATIO) -> Dict[str, np.ndarray]:
+    """
+    Compute momentum metrics for every row of a timeline matrix
+    
+    Args:
+        matrix: Keywords x time points interest matrix (NaN = missing)
+        window: Number of most recent points used for slope and breakout
+        breakout_ratio: Recent/baseline mean ratio that flags a breakout
+    
+    Returns:
+        Dict of per-keyword arrays: count, mean, slope, acceleration,
+        peak_ratio and breakout
+    """
+    k, t = matrix.shape
+    if k == 0 or t == 0:
+        empty = np.zeros(k)
+        return {
+            'count': empty.astype(int), 'mean': empty, 'slope': empty,
+            'acceleration': empty, 'peak_ratio': empty, 'breakout': empty.astype(bool)
+        }
+    
+    window = max(2, min(window, t))
+    recent = matrix[:, -window:]
+    previous = matrix[:, -2 * window:-window] if t > window else matrix[:, :0]
+    baseline = matrix[:, :-window] if t > window else matrix
+    
+    count = (~np.isnan(matrix)).sum(axis=1)
+    mean = _nan_mean(matrix)
+    peak = np.where(count > 0, np.where(np.isnan(matrix), -np.inf, matrix).max(axis=1), 0.0)
+    peak_ratio = np.divide(peak, mean, out=np.zeros(k), where=mean > 0)
+    recent_mean = _nan_mean(recent)
+    baseline_mean = _nan_mean(baseline)
+    
+    slope = _nan_slope(recent)
+    previous_slope = _nan_slope(previous) if previous.shape[1] >= 2 else np.zeros(k)
+    acceleration = slope - previous_slope
+    breakout = (slope > 0) & (recent_mean > 0) & (recent_mean >= breakout_ratio * baseline_mean)
+    
+    return {
+        'count': count,
+        'mean': mean,
+        'slope': slope,
+        'acceleration': acceleration,
+        'peak_ratio': peak_ratio,
+        'breakout': breakout
+    }
+
+
+def metrics_for_row(metrics: Dict[str, np.ndarray], row: int) -> Dict[str, Any]:
+    """
+    Convert one keyword's metrics to a JSON-friendly dict
+    
+    Args:
+        metrics: Output of momentum_metrics
+        row: Keyword row
+    
+    Returns:
+        Dict with rounded mean, slope, acceleration, peak_ratio and breakout
+    """
+    return {
+        'mean': round(float(metrics['mean'][row]), 2),
+        'slope': round(float(metrics['slope'][row]), 3),
+        'acceleration': round(float(metrics['acceleration'][row]), 3),
+        'peak_ratio': round(float(metrics['peak_ratio'][row]), 2),
+        'breakout': bool(metrics['breakout'][row])
+    }
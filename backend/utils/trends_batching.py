@@ -0,0 +1,89 @@
+"""
+Batch planning for Google Trends queries
+
+SerpAPI's Google Trends engine compares at most 5 keywords per request, and
+interest values are normalized within each request. To track more keywords,
+every batch shares one anchor keyword; scores from different batches are
+made comparable by rescaling them so the anchor's interest matches across
+batches.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from backend.models import TrendItem
+
+# Keywords per Google Trends request (SerpAPI limit)
+TRENDS_BATCH_SIZE = 5
+
+
+def plan_trend_batches(keywords: Sequence[str], anchor: Optional[str] = None,
+                       batch_size: int = TRENDS_BATCH_SIZE) -> Tuple[str, List[List[str]]]:
+    """
+    Split keywords into requests that each include the anchor keyword
+    
+    Args:
+        keywords: Keywords to track (duplicates are dropped, case-insensitively)
+        anchor: Shared anchor keyword (defaults to the first keyword)
+        batch_size: Maximum keywords per request, anchor included
+    
+    Returns:
+        Tuple of (anchor, list of keyword batches)
+    """
+    unique = []
+    seen = set()
+    for keyword in keywords:
+        key = keyword.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(keyword.strip())
+    
+    if not unique and not anchor:
+        return '', []
+    
+    anchor = anchor.strip() if anchor else unique[0]
+    others = [k for k in unique if k.lower() != anchor.lower()]
+    step = max(1, batch_size - 1)
+    
+    if not others:
+        return anchor, [[anchor]]
+    
+    batches = [[anchor] + others[i:i + step] for i in range(0, len(others), step)]
+    return anchor, batches
+
+
+def anchor_scale_factors(anchor_means: List[Optional[float]]) -> List[Optional[float]]:
+    """
+    Compute per-batch multipliers that align every batch to the first usable one
+    
+    Args:
+        anchor_means: Mean anchor interest in each batch (None if missing)
+    
+    Returns:
+        Multiplier per batch, or None for batches that cannot be rescaled
+    """
+    reference = next((m for m in anchor_means if m), None)
+    if reference is None:
+        return [None if m is None else 1.0 for m in anchor_means]
+    return [reference / m if m else None for m in anchor_means]
+
+
+def merge_related_queries(items: List[TrendItem]) -> List[TrendItem]:
+    """
+    Merge related-query items from several batches
+    
+    Items with the same query text and type are deduplicated
+    case-insensitively, keeping the highest score.
+    
+    Args:
+        items: Related-query trend items
+    
+    Returns:
+        Deduplicated items, highest scores first
+    """
+    merged = {}
+    for item in items:
+        key = (item.name.strip().lower(), item.type)
+        current = merged.get(key)
+        if current is None or item.score > current.score:
+            merged[key] = item
+    
+    return sorted(merged.values(), key=lambda x: x.score, reverse=True)
@@ -4,97 +4,477 @@ Simple and clean implementation using only SERP API and Groq
 """
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import json
 from serpapi import GoogleSearch
 from groq import Groq
 
+from backend.config import (
+    GAZETTEER_FILE, RANKING_FILE, RANKING_HALF_LIFE_DAYS, REQUEST_TIMEOUT, TRENDS_MARKETS,
+    EXTRACTION_MODELS, ANALYSIS_MODELS, EXTRACTION_LATENCY_LIMIT, ANALYSIS_LATENCY_LIMIT
+)
+from backend.models import TrendItem
+from backend.utils.deadline import Deadline, DeadlineExceeded, CircuitBreaker, CircuitOpenError
+from backend.utils.dedup import ResultDeduplicator
+from backend.utils.gazetteer import DishGazetteer, snippet_key
+from backend.utils.keywords import food_name_key
+from backend.utils.log import get_logger, submit_in_context
+from backend.utils.model_router import ModelRouter
+from backend.utils.profiling import record_network
+from backend.utils.ranking import DecayedRanking
+from backend.utils.trend_analytics import timeline_matrix, momentum_metrics, metrics_for_row, row_mean
+from backend.utils.trends_batching import plan_trend_batches, anchor_scale_factors, merge_related_queries
+
+logger = get_logger(__name__)
+
+# LLM responses containing any of these are treated as "no specific foods found"
+INVALID_RESPONSE_TERMS = ['none', 'no foods', 'n/a', 'empty', 'food', 'recipe', 'trending', 'viral', 'popular', 'latest']
+
+# Extracted names containing any of these are too generic to be a dish
+GENERIC_FOOD_TERMS = ['food trend', 'viral food', 'trending', 'recipe collection', 'food ideas']
+
+
+def filter_food_names(names):
+    """Drop empty, too short and generic names (applied to both LLM and gazetteer results)"""
+    specific_foods = []
+    for food in names:
+        food = food.strip()
+        if len(food) <= 2:
+            continue
+        food_lower = food.lower()
+        # Skip if it's too generic
+        if any(generic in food_lower for generic in GENERIC_FOOD_TERMS):
+            continue
+        specific_foods.append(food)
+    return specific_foods
+
+
+def market_params(market):
+    """SerpAPI locale parameters for a 'gl:hl' market code (e.g. 'mx:es')"""
+    gl, _, hl = market.partition(':')
+    params = {"gl": gl}
+    if hl:
+        params["hl"] = hl
+    return params
+
+
+class RunState:
+    """
+    Counters, market rankings and model usage of one collection run
+    
+    The tracker is shared by every request, so per-run results are kept
+    here and passed through its methods. Counters and model usage may be
+    updated from worker threads.
+    """
+    
+    def __init__(self):
+        self.stats = {}
+        self.market_rankings = {}
+        self.mentions = {}  # food key -> (display name, mentions) found by the search
+        self.model_usage = {}
+        self._lock = threading.Lock()
+    
+    def count(self, name, amount=1):
+        """Add to a counter in `stats`"""
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + amount
+    
+    def record_model_call(self, task, model, seconds, failed):
+        """Add one LLM call to the model usage"""
+        with self._lock:
+            usage = self.model_usage.setdefault(task, {}).setdefault(model, {'calls': 0, 'errors': 0, 'seconds': 0.0})
+            usage['calls'] += 1
+            usage['errors'] += int(failed)
+            usage['seconds'] = round(usage['seconds'] + seconds, 3)
+
+
 class FoodTrendsTracker:
-    def __init__(self, require_ai=True):
+    # Queries used when no keywords are given
+    DEFAULT_SEARCH_QUERIES = [
+        "viral food Latest",
+        "trending food recipes Latest",
+        "popular food trends Latest",
+        "viral recipes Latest",
+        "trending desserts Latest",
+        "viral food products Latest",
+        "trending food products Latest"
+    ]
+    
+    # Queries run for each custom keyword (e.g. a cuisine or ingredient)
+    KEYWORD_QUERY_TEMPLATES = [
+        "trending {keyword} food Latest",
+        "viral {keyword} recipes Latest"
+    ]
+    
+    # Concurrent Google Search requests (across all markets)
+    SEARCH_MAX_WORKERS = 8
+    
+    # Concurrent food extractions (across all markets)
+    EXTRACTION_MAX_WORKERS = 8
+    
+    # Concurrent Google Trends requests
+    TRENDS_MAX_WORKERS = 4
+    
+    # Consecutive failures that open a provider's circuit, and its cool-down (seconds)
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_RESET_TIMEOUT = 60
+    
+    def __init__(self, require_ai=True, gazetteer=None, ranking=None):
         # Initialize Groq AI
         groq_api_key = os.getenv('GROQ_API_KEY')
         if not groq_api_key:
             raise ValueError("GROQ_API_KEY is required. Get free key at: https://console.groq.com")
         
-        self.ai_client = Groq(api_key=groq_api_key)
-        self.ai_model = 'llama-3.1-8b-instant'
-        print("🚀 Groq AI initialized")
+        # No SDK retries: the deadline, model fallback and circuit breaker handle every retry
+        self.ai_client = Groq(api_key=groq_api_key, max_retries=0)
+        # Small fast models for per-snippet extraction, the strongest healthy model for analysis
+        self.model_router = ModelRouter(
+            tiers={'extraction': EXTRACTION_MODELS, 'analysis': ANALYSIS_MODELS},
+            policies={'extraction': 'fastest', 'analysis': 'preferred'},
+            latency_limits={'extraction': EXTRACTION_LATENCY_LIMIT, 'analysis': ANALYSIS_LATENCY_LIMIT}
+        )
+        logger.info("🚀 Groq AI initialized")
         
         # Initialize SERP API
         self.serpapi_key = os.getenv('SERPAPI_KEY')
         if not self.serpapi_key:
             raise ValueError("SERPAPI_KEY is required. Get free key at: https://serpapi.com/users/sign_up")
         
-        print("🔍 SERP API initialized")
+        logger.info("🔍 SERP API initialized")
+        
+        # Known dishes, matched locally before falling back to the LLM
+        self.gazetteer = gazetteer if gazetteer is not None else DishGazetteer(GAZETTEER_FILE)
+        # Decayed mention counts across runs
+        self.ranking = ranking if ranking is not None else DecayedRanking(RANKING_FILE, RANKING_HALF_LIFE_DAYS)
+        
+        # Fail fast on a provider that keeps erroring
+        self.serp_breaker = CircuitBreaker('SerpAPI', self.CIRCUIT_FAILURE_THRESHOLD, self.CIRCUIT_RESET_TIMEOUT)
+        self.ai_breaker = CircuitBreaker('Groq', self.CIRCUIT_FAILURE_THRESHOLD, self.CIRCUIT_RESET_TIMEOUT)
     
-    def get_trending_foods_from_search(self):
-        """Get actual trending foods from Google Search results"""
-        print("🔍 Searching Google for trending foods...")
-        
-        search_queries = [
-            "viral food Latest",
-            "trending food recipes Latest",
-            "popular food trends Latest",
-            "viral recipes Latest",
-            "trending desserts Latest",
-            "viral food products Latest",
-            "trending food products Latest"
-        ]
+    def _serp_search(self, params, deadline):
+        """Run one SerpAPI request within the deadline, guarded by the SerpAPI circuit breaker"""
+        timeout = deadline.timeout(REQUEST_TIMEOUT, 'SerpAPI request')
+        self.serp_breaker.before_call()
         
-        trending_foods = []
+        search = GoogleSearch(params)
+        search.timeout = timeout
+        started = time.perf_counter()
+        try:
+            results = search.get_dict()
+        except Exception:
+            self.serp_breaker.record_failure()
+            raise
+        finally:
+            record_network('serpapi', started)
         
-        for query in search_queries:
-            try:
-                print(f"   → Searching: {query}")
-                params = {
-                    "engine": "google",
-                    "q": query,
-                    "api_key": self.serpapi_key,
-                    "num": 20  # Get more results
-                }
+        self.serp_breaker.record_success()
+        return results
+    
+    def _ai_complete(self, deadline, task, run=None, **kwargs):
+        """
+        Run one Groq chat completion for a task ('extraction' or 'analysis')
+        
+        Models are tried in the router's order for the task, falling back to
+        the next one when a call fails. Every attempt runs within the
+        deadline and is added to the run's model usage; the Groq circuit
+        breaker counts a failure only when all models failed.
+        """
+        timeout = deadline.timeout(REQUEST_TIMEOUT, 'Groq request')
+        self.ai_breaker.before_call()
+        
+        last_error = None
+        try:
+            for model in self.model_router.candidates(task):
+                if last_error is not None:
+                    timeout = deadline.timeout(REQUEST_TIMEOUT, 'Groq fallback request')
+                    logger.warning("↪️ Falling back to %s for %s", model, task)
                 
-                search = GoogleSearch(params)
-                results = search.get_dict()
+                started = time.perf_counter()
+                try:
+                    response = self.ai_client.chat.completions.create(model=model, timeout=timeout, **kwargs)
+                except Exception as e:
+                    seconds = time.perf_counter() - started
+                    self.model_router.record_failure(task, model, e)
+                    if run is not None:
+                        run.record_model_call(task, model, seconds, failed=True)
+                    last_error = e
+                    continue
+                finally:
+                    record_network('groq', started)
                 
-                # Extract food names from organic results
-                if "organic_results" in results:
-                    for result in results["organic_results"][:10]:
-                        title = result.get("title", "")
-                        snippet = result.get("snippet", "")
-                        
-                        # Use AI to extract food names from title and snippet
-                        food_items = self._extract_food_names_with_ai(title, snippet)
-                        trending_foods.extend(food_items)
-                        
-                print(f"   ✓ Found results for: {query}")
-                        
-            except Exception as e:
-                print(f"   ✗ Error searching '{query}': {str(e)}")
-        
-        # Remove duplicates and count mentions
-        food_counts = {}
-        for food in trending_foods:
-            food_lower = food.lower()
-            food_counts[food_lower] = food_counts.get(food_lower, 0) + 1
-        
-        # Create scored list (mentions = popularity score)
+                seconds = time.perf_counter() - started
+                self.model_router.record_success(task, model, seconds)
+                if run is not None:
+                    run.record_model_call(task, model, seconds, failed=False)
+                self.ai_breaker.record_success()
+                return response
+        
+        except DeadlineExceeded:
+            # Out of time while falling back: the attempts so far failed
+            self.ai_breaker.record_failure()
+            raise
+        
+        self.ai_breaker.record_failure()
+        raise last_error or RuntimeError(f"No models configured for {task}")
+    
+    def build_search_queries(self, keywords=None):
+        """Build the search queries for a keyword set (default queries if empty)"""
+        if not keywords:
+            return list(self.DEFAULT_SEARCH_QUERIES)
+        
+        return [
+            template.format(keyword=keyword)
+            for keyword in keywords
+            for template in self.KEYWORD_QUERY_TEMPLATES
+        ]
+    
+    def _search_query(self, query, market, deadline, checkpoint=None):
+        """Run one Google search in a market and return its top organic results"""
+        params = {
+            "engine": "google",
+            "q": query,
+            "api_key": self.serpapi_key,
+            "num": 20  # Get more results
+        }
+        params.update(market_params(market))
+        
+        results = self._serp_search(params, deadline)
+        organic_results = results.get("organic_results", [])[:10]
+        if checkpoint is not None:
+            checkpoint.save_query(market, query, organic_results)
+        return organic_results
+    
+    @staticmethod
+    def _rank_mentions(food_counts, display_names, limit=20):
+        """Build a scored ranking from {name key: (mentions, markets)} counts"""
         scored_foods = []
-        for food, count in food_counts.items():
-            scored_foods.append({
-                'keyword': food.title(),
-                'interest_score': count * 10,  # Scale mentions to score
-                'source': 'google_search',
-                'mentions': count
-            })
+        for key, (count, markets) in food_counts.items():
+            scored_foods.append(TrendItem(
+                name=display_names[key],
+                score=count * 10,  # Scale mentions to score
+                source='google_search',
+                mentions=count,
+                markets=markets
+            ))
         
         # Sort by score
-        scored_foods.sort(key=lambda x: x['interest_score'], reverse=True)
+        scored_foods.sort(key=lambda x: x.score, reverse=True)
+        return scored_foods[:limit]
+    
+    def get_trending_foods_from_search(self, keywords=None, deadline=None, markets=None, checkpoint=None, run=None):
+        """
+        Get actual trending foods from Google Search results
+        
+        The queries run in every market (SerpAPI 'gl:hl' locale) at once,
+        through a pool of SEARCH_MAX_WORKERS, and the food extractions of
+        all markets through a pool of EXTRACTION_MAX_WORKERS. Foods are
+        ranked per market (kept in the run's market_rankings) and merged into
+        the returned global ranking, with names deduplicated across markets.
+        
+        With a deadline, queries that would start after it are skipped and
+        remaining AI extractions fall back to known dishes; the skipped work
+        is counted in the run's stats.
+        
+        With a checkpoint (RunCheckpoint), every finished search and each
+        market's complete extraction are saved, and ones saved by an earlier
+        attempt of the run are reused instead of repeated.
+        
+        The run's mentions are left in `run.mentions` for
+        apply_decayed_ranking, which the caller invokes once per run.
+        
+        Args:
+            run: RunState collecting this run's stats, market rankings,
+                mentions and model usage (a new one if omitted)
+        """
+        logger.info("🔍 Searching Google for trending foods...")
+        
+        deadline = deadline or Deadline()
+        run = run if run is not None else RunState()
+        markets = list(markets or TRENDS_MARKETS)
+        search_queries = self.build_search_queries(keywords)
+        for name in ('llm_extractions', 'local_extractions', 'remembered_extractions', 'skipped_searches',
+                     'skipped_extractions', 'resumed_searches', 'resumed_extractions'):
+            run.stats.setdefault(name, 0)
+        run.stats['markets'] = len(markets)
+        
+        # Reuse searches checkpointed by an earlier attempt of this run
+        tasks = [(market, query) for market in markets for query in search_queries]
+        task_results = [[] for _ in tasks]
+        pending = []
+        for i, (market, query) in enumerate(tasks):
+            saved = checkpoint.load_query(market, query) if checkpoint is not None else None
+            if saved is None:
+                pending.append(i)
+            else:
+                task_results[i] = saved
+                run.count('resumed_searches')
+        
+        # Run every market's remaining queries concurrently, keeping results in query order
+        with ThreadPoolExecutor(max_workers=max(1, min(self.SEARCH_MAX_WORKERS, len(pending) or 1))) as pool:
+            futures = {
+                submit_in_context(pool, self._search_query, tasks[i][1], tasks[i][0], deadline, checkpoint): i
+                for i in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                market, query = tasks[i]
+                try:
+                    task_results[i] = future.result()
+                    logger.debug("✓ Found results for: %s [%s]", query, market)
+                except (DeadlineExceeded, CircuitOpenError):
+                    run.count('skipped_searches')
+                except Exception as e:
+                    logger.warning("✗ Error searching '%s' [%s]: %s", query, market, e)
+        
+        if run.stats['skipped_searches']:
+            logger.warning("⏱️ Skipped %d searches (deadline passed or SerpAPI circuit open)", run.stats['skipped_searches'])
+        
+        # Collapse duplicate and syndicated results per market so they are extracted and counted once
+        market_counts = {}
+        market_results = {}
+        display_names = {}
+        search_results = 0
+        duplicates_collapsed = 0
+        for market in markets:
+            organic_results = [
+                result
+                for (task_market, _), results in zip(tasks, task_results) if task_market == market
+                for result in results
+            ]
+            deduplicator = ResultDeduplicator()
+            unique_results = [result for result in organic_results if deduplicator.add(result)]
+            search_results += len(organic_results)
+            duplicates_collapsed += deduplicator.collapsed
+            
+            saved = checkpoint.load_step(self._extract_step(market)) if checkpoint is not None else None
+            if saved is not None:
+                run.count('resumed_extractions')
+                for key, name in saved['names'].items():
+                    display_names.setdefault(key, name)
+                market_counts[market] = saved['counts']
+            else:
+                market_results[market] = unique_results
+        
+        # Extract food names of every market concurrently (locally when possible, otherwise
+        # with AI); a text found in several markets is extracted once
+        extractions = {}
+        with ThreadPoolExecutor(max_workers=self.EXTRACTION_MAX_WORKERS) as pool:
+            for results in market_results.values():
+                for result in results:
+                    title, snippet = result.get("title", ""), result.get("snippet", "")
+                    key = snippet_key(title, snippet)
+                    if key not in extractions:
+                        extractions[key] = submit_in_context(pool, self._extract_food_names, title, snippet, deadline, run)
+            extractions = {key: future.result() for key, future in extractions.items()}
+        
+        # Count mentions per market
+        extracted = set()
+        for market, results in market_results.items():
+            counts = {}
+            market_skipped = False
+            for result in results:
+                key = snippet_key(result.get("title", ""), result.get("snippet", ""))
+                food_items, method = extractions[key]
+                # Repeats of a text extracted for another market count as remembered
+                run.count(f'{"remembered" if key in extracted else method}_extractions')
+                extracted.add(key)
+                market_skipped = market_skipped or method == 'skipped'
+                for food in food_items:
+                    name_key = food_name_key(food)
+                    display_names.setdefault(name_key, food.title())
+                    counts[name_key] = counts.get(name_key, 0) + 1
+            market_counts[market] = counts
+            
+            # Checkpoint only complete extractions, so a resumed run retries skipped ones
+            if checkpoint is not None and not market_skipped and not run.stats['skipped_searches']:
+                checkpoint.save_step(self._extract_step(market), {'counts': counts, 'names': {key: display_names[key] for key in counts}})
+        
+        run.stats['search_results'] = search_results
+        run.stats['duplicates_collapsed'] = duplicates_collapsed
+        logger.info("🧹 Collapsed %d duplicate results (%d unique of %d)", duplicates_collapsed, search_results - duplicates_collapsed, search_results)
+        
+        # Rank per market (in market order), then merge mentions of the same food across markets
+        market_counts = {market: market_counts[market] for market in markets}
+        run.market_rankings = {
+            market: self._rank_mentions({key: (count, [market]) for key, count in counts.items()}, display_names)
+            for market, counts in market_counts.items()
+        }
+        global_counts = {}
+        for market, counts in market_counts.items():
+            for key, count in counts.items():
+                total, food_markets = global_counts.get(key, (0, []))
+                global_counts[key] = (total + count, food_markets + [market])
+        scored_foods = self._rank_mentions(global_counts, display_names)
+        run.mentions = {key: (display_names[key], count) for key, (count, _) in global_counts.items()}
+        
+        self.gazetteer.save()
+        stats = run.stats
+        logger.info("🧠 Extraction: %d local, %d remembered, %d via AI, %d skipped", stats['local_extractions'],
+                    stats['remembered_extractions'], stats['llm_extractions'], stats['skipped_extractions'])
+        logger.info("✅ Found %d unique trending foods from search results in %d market(s)", len(global_counts), len(markets))
+        return scored_foods  # Top 20
+    
+    def apply_decayed_ranking(self, foods, mentions=None):
+        """
+        Fold a run's mentions into the decayed ranking and set each food's decayed_score
+        
+        Args:
+            foods: TrendItems to score
+            mentions: Food key -> (display name, mentions) of the run, or
+                None when the run was already recorded
+        """
+        if mentions:
+            # Touches only the foods mentioned now
+            self.ranking.record(mentions)
+        for food in foods:
+            food.decayed_score = round(self.ranking.score(food_name_key(food.name)), 3)
+    
+    @staticmethod
+    def _extract_step(market):
+        """Checkpoint step holding a market's extracted mentions"""
+        return f"extract-{market.replace(':', '_')}"
+    
+    def _extract_food_names(self, title, snippet, deadline=None, run=None):
+        """
+        Extract food names from a search result
+        
+        Uses a remembered result for the same text, or the gazetteer when the
+        text only mentions known dishes; everything else goes to the LLM,
+        whose results grow the gazetteer. When the deadline has passed or
+        Groq's circuit is open, only known dishes are returned.
+        
+        Returns:
+            Tuple of (food names, method: 'remembered', 'local', 'llm' or 'skipped')
+        """
+        remembered = self.gazetteer.lookup_snippet(title, snippet)
+        if remembered is not None:
+            return filter_food_names(remembered), 'remembered'
+        
+        text = f"{title}. {snippet}"
+        if not self.gazetteer.may_contain_unknown(text):
+            return filter_food_names(self.gazetteer.match(text)), 'local'
+        
+        try:
+            foods = self._extract_food_names_with_ai(title, snippet, deadline or Deadline(), run)
+        except (DeadlineExceeded, CircuitOpenError):
+            return filter_food_names(self.gazetteer.match(text)), 'skipped'
+        
+        if foods is None:
+            return [], 'llm'
         
-        print(f"✅ Found {len(scored_foods)} unique trending foods from search results")
-        return scored_foods[:20]  # Return top 20
+        self.gazetteer.learn(foods, title, snippet)
+        return foods, 'llm'
     
-    def _extract_food_names_with_ai(self, title, snippet):
-        """Extract food names from search result using AI"""
+    def _extract_food_names_with_ai(self, title, snippet, deadline, run=None):
+        """
+        Extract food names from search result using AI (None if the call failed)
+        
+        Raises:
+            DeadlineExceeded, CircuitOpenError: If the call was not attempted
+        """
         try:
             prompt = f"""Extract ONLY specific, named food dishes or recipes from this text.
 
@@ -111,8 +491,10 @@ Text: {title}. {snippet}
 Return format: comma-separated list of specific food names ONLY, or EMPTY if none found.
 Example: butter board, Dubai chocolate, tanghulu, marry me chicken"""
 
-            response = self.ai_client.chat.completions.create(
-                model=self.ai_model,
+            response = self._ai_complete(
+                deadline,
+                'extraction',
+                run,
                 messages=[
                     {'role': 'system', 'content': 'You extract SPECIFIC food dish names from text. You return ONLY actual named dishes, NEVER generic terms or categories. Return comma-separated names or EMPTY.'},
                     {'role': 'user', 'content': prompt}
@@ -124,31 +506,87 @@ Example: butter board, Dubai chocolate, tanghulu, marry me chicken"""
             result = response.choices[0].message.content.strip()
             
             # Filter out generic/invalid responses
-            invalid_terms = ['none', 'no foods', 'n/a', 'empty', 'food', 'recipe', 'trending', 'viral', 'popular', 'latest']
             result_lower = result.lower()
             
-            if not result or any(term in result_lower for term in invalid_terms):
+            if not result or any(term in result_lower for term in INVALID_RESPONSE_TERMS):
                 return []
             
-            # Split by comma and clean
-            foods = [f.strip() for f in result.split(',') if f.strip() and len(f.strip()) > 2]
-            
-            # Filter out generic terms
-            specific_foods = []
-            for food in foods:
-                food_lower = food.lower()
-                # Skip if it's too generic
-                if any(generic in food_lower for generic in ['food trend', 'viral food', 'trending', 'recipe collection', 'food ideas']):
-                    continue
-                specific_foods.append(food)
-            
-            return specific_foods
-            
+            # Split by comma, clean and filter out generic terms
+            return filter_food_names(result.split(','))
+        
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
+        
         except Exception as e:
-            return []
+            return None
+    
+    def _fetch_trends_batch(self, batch, deadline):
+        """Run one Google Trends request for up to 5 keywords"""
+        query = ','.join(batch)
+        logger.debug("→ Querying: %s", query)
+        
+        params = {
+            "engine": "google_trends",
+            "q": query,
+            "data_type": "TIMESERIES",
+            "api_key": self.serpapi_key
+        }
+        
+        return self._serp_search(params, deadline)
+    
+    def _parse_trends_timeline(self, results, keywords):
+        """Parse a Google Trends response into a keywords x time points matrix (None if missing)"""
+        if "interest_over_time" not in results or "timeline_data" not in results["interest_over_time"]:
+            logger.warning("✗ Missing 'interest_over_time' or 'timeline_data' in response")
+            return None
+        
+        timeline = results["interest_over_time"]["timeline_data"]
+        if not timeline:
+            logger.warning("✗ Timeline is empty or invalid")
+            return None
+        
+        logger.debug("→ Timeline data points: %d", len(timeline))
+        return timeline_matrix(timeline, keywords)
+    
+    def _parse_related_queries(self, results):
+        """Extract related queries (actual trending foods) from a Google Trends response"""
+        related_foods = []
+        
+        if "related_queries" not in results:
+            return related_foods
+        
+        related_queries = results["related_queries"]
+        
+        # Process both "top" and "rising" related queries
+        for query_type in ["top", "rising"]:
+            if query_type in related_queries:
+                queries_list = related_queries[query_type]
+                logger.debug("→ Found %d %s related queries", len(queries_list), query_type)
+                
+                for query_item in queries_list[:10]:  # Limit to top 10 per type
+                    query_text = query_item.get("query", "")
+                    extracted_value = query_item.get("extracted_value", 0)
+                    
+                    if query_text and extracted_value > 0:
+                        related_foods.append(TrendItem(
+                            name=query_text,
+                            score=extracted_value,
+                            source=f'serpapi_related_{query_type}',
+                            type=query_type
+                        ))
+        
+        return related_foods
     
-    def get_google_trends(self, keywords=None):
-        """Get Google Trends data via SERP API - searching for general food trends"""
+    def get_google_trends(self, keywords=None, anchor=None, deadline=None):
+        """
+        Get Google Trends data via SERP API - searching for general food trends
+        
+        Keyword lists longer than the 5-term SerpAPI limit are split into
+        batches sharing an anchor keyword. Batches run concurrently and their
+        scores are rescaled against the anchor so they stay comparable.
+        Batches still queued when the deadline passes are skipped.
+        """
+        deadline = deadline or Deadline()
         if keywords is None:
             # General food trend queries for discovering emerging trends
             keywords = [
@@ -160,111 +598,87 @@ Example: butter board, Dubai chocolate, tanghulu, marry me chicken"""
                 'Viral Recipes',
             ]
         
-        print(f"🔍 Fetching Google Trends for {len(keywords)} food trends...")
-        trends_data = []
-        related_foods = []
+        anchor, batches = plan_trend_batches(keywords, anchor)
+        logger.info("🔍 Fetching Google Trends for %d food trends in %d batch(es), anchor '%s'...", len(keywords), len(batches), anchor)
         
-        try:
-            # Combine all keywords into comma-separated query (SERP API accepts up to 5 queries)
-            query = ','.join(keywords[:5])  # Limit to 5 as per SERP API docs
-            print(f"   → Querying: {query}")
-            
-            params = {
-                "engine": "google_trends",
-                "q": query,
-                "data_type": "TIMESERIES",
-                "api_key": self.serpapi_key
+        # Run all batches concurrently, keeping results in batch order
+        batch_results = [None] * len(batches)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.TRENDS_MAX_WORKERS, len(batches)))) as pool:
+            futures = {
+                submit_in_context(pool, self._fetch_trends_batch, batch, deadline): i
+                for i, batch in enumerate(batches)
             }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    batch_results[i] = future.result()
+                except (DeadlineExceeded, CircuitOpenError) as e:
+                    logger.warning("⏱️ Skipped %s: %s", ', '.join(batches[i]), e)
+                except Exception as e:
+                    logger.warning("✗ Error querying %s: %s", ', '.join(batches[i]), e)
+        
+        # Parse each batch and align its scale on the anchor keyword (row 0 of every batch)
+        batch_matrices = []
+        related_foods = []
+        for batch, results in zip(batches, batch_results):
+            if results is None:
+                batch_matrices.append(None)
+                continue
+            batch_matrices.append(self._parse_trends_timeline(results, batch))
+            related_foods.extend(self._parse_related_queries(results))
+        
+        anchor_means = [row_mean(matrix, 0) if matrix is not None else None for matrix in batch_matrices]
+        factors = anchor_scale_factors(anchor_means)
+        
+        trends_data = []
+        seen = set()
+        for batch, matrix, factor in zip(batches, batch_matrices, factors):
+            if matrix is None:
+                continue
+            if factor is None:
+                logger.warning("✗ Skipping batch without anchor data: %s", ', '.join(batch))
+                continue
             
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            print(f"   → Full API Response Keys: {results.keys()}")
-            
-            if "interest_over_time" in results and "timeline_data" in results["interest_over_time"]:
-                timeline = results["interest_over_time"]["timeline_data"]
-                print(f"   → Timeline data points: {len(timeline)}")
-                
-                if timeline and len(timeline) > 0:
-                    # Check structure of first timeline item
-                    first_item = timeline[0]
-                    print(f"   → First item keys: {first_item.keys()}")
-                    print(f"   → Number of values in first item: {len(first_item.get('values', []))}")
-                    
-                    # Process each query's results - match by query name
-                    for keyword in keywords[:5]:
-                        try:
-                            # Extract values for this specific keyword by matching query field
-                            values = []
-                            for item in timeline:
-                                item_values = item.get("values", [])
-                                # Find the value object that matches this keyword
-                                for val_obj in item_values:
-                                    if val_obj.get("query") == keyword:
-                                        extracted = val_obj.get("extracted_value")
-                                        if extracted is not None:
-                                            values.append(extracted)
-                                        break
-                            
-                            if values:
-                                avg_interest = sum(values) / len(values)
-                                trends_data.append({
-                                    'keyword': keyword,
-                                    'interest_score': int(avg_interest),
-                                    'source': 'serpapi'
-                                })
-                                print(f"   ✓ {keyword}: Score {int(avg_interest)} (from {len(values)} data points)")
-                            else:
-                                print(f"   ✗ {keyword}: No valid data points")
-                        except Exception as e:
-                            print(f"   ✗ {keyword}: Parse error - {str(e)}")
-                else:
-                    print(f"   ✗ Timeline is empty or invalid")
-            else:
-                print(f"   ✗ Missing 'interest_over_time' or 'timeline_data' in response")
-            
-            # Extract related queries (actual trending foods)
-            if "related_queries" in results:
-                related_queries = results["related_queries"]
-                print(f"   → Found related_queries section")
-                
-                # Process both "top" and "rising" related queries
-                for query_type in ["top", "rising"]:
-                    if query_type in related_queries:
-                        queries_list = related_queries[query_type]
-                        print(f"   → Found {len(queries_list)} {query_type} related queries")
-                        
-                        for query_item in queries_list[:10]:  # Limit to top 10 per type
-                            query_text = query_item.get("query", "")
-                            extracted_value = query_item.get("extracted_value", 0)
-                            
-                            if query_text and extracted_value > 0:
-                                related_foods.append({
-                                    'keyword': query_text,
-                                    'interest_score': extracted_value,
-                                    'source': f'serpapi_related_{query_type}',
-                                    'type': query_type
-                                })
-                                print(f"   ✓ Found {query_type} food: {query_text} (Score: {extracted_value})")
+            metrics = momentum_metrics(matrix * factor)
+            for row, keyword in enumerate(batch):
+                if keyword in seen:
+                    continue
+                if metrics['count'][row] == 0:
+                    logger.debug("✗ %s: No valid data points", keyword)
+                    continue
+                seen.add(keyword)
+                momentum = metrics_for_row(metrics, row)
+                trends_data.append(TrendItem(
+                    name=keyword,
+                    score=int(momentum['mean']),
+                    source='serpapi',
+                    momentum=momentum
+                ))
+                logger.debug("✓ %s: Score %d (from %d data points)", keyword, momentum['mean'], metrics['count'][row])
         
-        except Exception as e:
-            print(f"   ✗ Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        related_foods = merge_related_queries(related_foods)
         
         # Combine base trends with related foods
         all_trends = trends_data + related_foods
-        print(f"✅ Collected {len(trends_data)} base trends + {len(related_foods)} related foods = {len(all_trends)} total")
+        logger.info("✅ Collected %d base trends + %d related foods = %d total", len(trends_data), len(related_foods), len(all_trends))
         return all_trends
     
     
-    def analyze_with_ai(self, google_data, trending_foods=None):
-        """Analyze trends with Groq AI - Generate innovative food product ideas"""
-        print("🤖 Analyzing trends with Groq AI to generate product ideas...")
+    def analyze_with_ai(self, google_data, trending_foods=None, deadline=None, run=None):
+        """
+        Analyze trends with Groq AI - Generate innovative food product ideas
+        
+        If the call cannot be made (deadline passed or Groq's circuit open),
+        the returned analysis has no trends and is marked 'skipped'.
+        """
+        logger.info("🤖 Analyzing trends with Groq AI to generate product ideas...")
+        
+        google_data = [TrendItem.coerce(item) for item in google_data]
+        trending_foods = [TrendItem.coerce(food) for food in trending_foods or []]
         
         # Create a readable summary of the trends
         trend_summary = "\n".join([
-            f"- {item['keyword']}: Interest Score {item['interest_score']}/100"
+            f"- {item.name}: Interest Score {item.score}/100"
             for item in google_data
         ])
         
@@ -272,7 +686,7 @@ Example: butter board, Dubai chocolate, tanghulu, marry me chicken"""
         trending_foods_summary = ""
         if trending_foods and len(trending_foods) > 0:
             trending_foods_summary = "\n\nTRENDING FOODS FROM SEARCH:\n" + "\n".join([
-                f"🔥 {food['name']}: Score {food['score']}/100"
+                f"🔥 {food.name}: Score {food.score}/100"
                 for food in trending_foods
             ])
         
@@ -356,8 +770,10 @@ Return empty trends array if no specific food names with score > 20 exist.
                 }
             ]
             
-            response = self.ai_client.chat.completions.create(
-                model=self.ai_model,
+            response = self._ai_complete(
+                deadline or Deadline(),
+                'analysis',
+                run,
                 messages=messages,
                 temperature=0.7,  # Higher temperature for creative product ideas, but strict prompt keeps it grounded
                 max_tokens=3000,
@@ -366,11 +782,20 @@ Return empty trends array if no specific food names with score > 20 exist.
             
             analysis = json.loads(response.choices[0].message.content.strip())
             analysis['report_date'] = datetime.now().strftime('%Y-%m-%d')
-            print(f"✅ Found {len(analysis.get('trends', []))} trends")
+            logger.info("✅ Found %d trends", len(analysis.get('trends', [])))
             return analysis
+        
+        except (DeadlineExceeded, CircuitOpenError) as e:
+            logger.warning("⏱️ AI analysis skipped: %s", e)
+            return {
+                'error': str(e),
+                'skipped': True,
+                'report_date': datetime.now().strftime('%Y-%m-%d'),
+                'trends': []
+            }
             
         except Exception as e:
-            print(f"❌ AI analysis error: {e}")
+            logger.error("❌ AI analysis error: %s", e)
             return {
                 'error': str(e),
                 'report_date': datetime.now().strftime('%Y-%m-%d'),
@@ -381,11 +806,14 @@ Return empty trends array if no specific food names with score > 20 exist.
         """Searches Google for trending foods and analyzes with AI"""
         print("🍔 Food Trends Tracker\n")
         
+        run = RunState()
+        
         # Get actual trending foods from Google Search
-        trending_foods = self.get_trending_foods_from_search()
+        trending_foods = self.get_trending_foods_from_search(run=run)
+        self.apply_decayed_ranking(trending_foods, run.mentions)
         
         # Analyze with AI - only using Google Search results
-        analysis = self.analyze_with_ai(trending_foods, trending_foods)
+        analysis = self.analyze_with_ai(trending_foods, trending_foods, run=run)
         
         output_file = f"trends_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         with open(output_file, 'w') as f:
@@ -396,7 +824,7 @@ Return empty trends array if no specific food names with score > 20 exist.
         
         print("🔥 Top Trending Foods:")
         for i, food in enumerate(trending_foods[:10], 1):
-            print(f"{i}. {food['keyword']} - Score: {food['interest_score']}")
+            print(f"{i}. {food.name} - Score: {food.score}")
         
         print("\n💡 Product Innovation Ideas:")
         for i, trend in enumerate(analysis.get('trends', [])[:5], 1):
@@ -406,11 +834,38 @@ Return empty trends array if no specific food names with score > 20 exist.
 
 
 if __name__ == '__main__':
+    import argparse
+    
     # Load environment variables
     from dotenv import load_dotenv
     load_dotenv()
     
-    # Run tracker
-    tracker = FoodTrendsTracker()
-    results = tracker.run()
+    parser = argparse.ArgumentParser(description='Food Trends Tracker')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the run and save the trace under cache/profiles')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Log every query and result (LOG_LEVEL=DEBUG)')
+    args = parser.parse_args()
+    
+    from backend.config import LOG_LEVEL, LOG_FORMAT
+    from backend.utils.log import configure_logging
+    configure_logging('DEBUG' if args.verbose else LOG_LEVEL, LOG_FORMAT)
+    
+    if args.profile:
+        from backend.config import PROFILES_DIR
+        from backend.utils.profiling import ProfileSession
+        
+        with ProfileSession('cli', PROFILES_DIR) as session:
+            tracker = FoodTrendsTracker()
+            results = tracker.run()
+        
+        if session.summary:
+            summary = session.summary
+            print(f"\n⏱️ Profile {summary['profile_id']}: {summary['wall_seconds']}s wall, "
+                  f"{summary['cpu_seconds']}s CPU, {summary['network_wait_seconds']}s network wait")
+            print(f"   Trace: {PROFILES_DIR / summary['trace_file']}")
+    else:
+        # Run tracker
+        tracker = FoodTrendsTracker()
+        results = tracker.run()
 
@@ -0,0 +1,132 @@
+"""
+Tests for the sectioned cache file format and the legacy cache migration
+"""
+import json
+
+import pytest
+
+from backend.services.cache_service import CacheService
+from backend.utils.cache_format import (
+    MAGIC, PREAMBLE, SCHEMA_VERSION, CacheFormatError,
+    read_cache_file, read_header, read_sections, write_cache_file
+)
+from backend.utils.serialization import dumps_bytes
+
+TIMESTAMP = '2026-10-19T08:00:00'
+
+
+@pytest.fixture
+def report():
+    return {
+        'raw_data': [
+            {'keyword': 'Dubai Chocolate', 'interest_score': 30, 'source': 'Google Search', 'mentions': 3, 'type': 'related'},
+            {'keyword': 'food trends', 'interest_score': 10, 'source': 'Google Search'},
+        ],
+        'trending_order': [0, 1],
+        'ai_insights': {'summary': 'Sweet', 'trends': [{'name': 'Dubai Chocolate', 'product_ideas': ['Bar']}]},
+        'keywords': [],
+        'report_date': '2026-10-19 08:00:00'
+    }
+
+
+def _write_v1(path, report):
+    """Write a file the way schema 1 did: trending_foods stored as its own section"""
+    sections = {name: dumps_bytes(report[name]) for name in ('raw_data', 'trending_foods', 'ai_insights')}
+    sections['meta'] = dumps_bytes({k: v for k, v in report.items() if k not in sections})
+    table, offset = {}, 0
+    for name, body in sections.items():
+        table[name] = [offset, len(body)]
+        offset += len(body)
+    header = dumps_bytes({
+        'schema': 1,
+        'timestamp': TIMESTAMP,
+        'report_date': report['report_date'],
+        'counts': {'raw_data': len(report['raw_data']), 'trending_foods': len(report['trending_foods']), 'product_ideas': 0},
+        'sections': table
+    })
+    with open(path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, 1, len(header)) + header + b''.join(sections.values()))
+
+
+def test_write_and_read_round_trip(tmp_path, report):
+    path = tmp_path / 'trends.ftc'
+    written = write_cache_file(path, TIMESTAMP, report, {'cache_key': 'default'})
+
+    cache = read_cache_file(path)
+    assert cache['timestamp'] == TIMESTAMP
+    assert cache['data'] == report
+    assert cache['header']['version'] == written['version']
+    assert cache['header']['cache_key'] == 'default'
+    assert not path.with_name(path.name + '.tmp').exists()
+
+
+def test_header_is_read_without_sections(tmp_path, report):
+    path = tmp_path / 'trends.ftc'
+    write_cache_file(path, TIMESTAMP, report)
+
+    header = read_header(path)
+    assert header['schema'] == SCHEMA_VERSION
+    assert header['counts'] == {'raw_data': 2, 'trending_foods': 2, 'product_ideas': 1}
+    assert set(header['sections']) == {'raw_data', 'ai_insights', 'meta'}
+
+
+def test_single_section_is_decoded_alone(tmp_path, report):
+    path = tmp_path / 'trends.ftc'
+    write_cache_file(path, TIMESTAMP, report)
+
+    sections = read_sections(path, ['ai_insights', 'missing'])
+    assert sections['ai_insights'] == report['ai_insights']
+    assert set(sections) == {'header', 'ai_insights'}
+
+
+def test_version_changes_with_content(tmp_path, report):
+    first = write_cache_file(tmp_path / 'a.ftc', TIMESTAMP, report)
+    report['ai_insights']['summary'] = 'Savory'
+    second = write_cache_file(tmp_path / 'b.ftc', TIMESTAMP, report)
+    assert first['version'] != second['version']
+
+
+def test_schema_1_files_stay_readable(tmp_path, report):
+    report = dict(report, trending_foods=[{'name': 'Dubai Chocolate', 'score': 30, 'source': 'Google Search', 'type': 'related'}])
+    del report['trending_order']
+    path = tmp_path / 'trends.ftc'
+    _write_v1(path, report)
+
+    cache = read_cache_file(path)
+    assert cache['header']['schema'] == 1
+    assert cache['data']['trending_foods'] == report['trending_foods']
+
+
+@pytest.mark.parametrize('content, message', [
+    (b'FT', 'truncated'),
+    (PREAMBLE.pack(b'JSON', SCHEMA_VERSION, 0), 'Not a trends cache file'),
+    (PREAMBLE.pack(MAGIC, 99, 0), 'Unsupported cache schema version'),
+])
+def test_invalid_files_are_rejected(tmp_path, content, message):
+    path = tmp_path / 'trends.ftc'
+    path.write_bytes(content)
+    with pytest.raises(CacheFormatError, match=message):
+        read_header(path)
+
+
+def test_legacy_json_cache_is_migrated(tmp_path, report):
+    legacy_file = tmp_path / 'trends_cache.json'
+    with open(legacy_file, 'w') as f:
+        json.dump({'timestamp': TIMESTAMP, 'data': report}, f, indent=2)
+    service = CacheService(tmp_path / 'trends.ftc', legacy_file, tmp_path / 'reports', search_index_file=None)
+
+    header = service.get_header()
+    assert header['timestamp'] == TIMESTAMP
+    assert not legacy_file.exists()
+    assert read_cache_file(tmp_path / 'trends.ftc')['data'] == report
+
+
+def test_existing_cache_is_not_overwritten_by_legacy_file(tmp_path, report):
+    cache_file = tmp_path / 'trends.ftc'
+    write_cache_file(cache_file, TIMESTAMP, report)
+    legacy_file = tmp_path / 'trends_cache.json'
+    legacy_file.write_text(json.dumps({'timestamp': '2020-01-01T00:00:00', 'data': {}}))
+    service = CacheService(cache_file, legacy_file, tmp_path / 'reports', search_index_file=None)
+
+    assert service.get_header()['timestamp'] == TIMESTAMP
+    assert legacy_file.exists()
@@ -0,0 +1,106 @@
+"""
+Tests for per-keyword report caching: LRU eviction and TTL expiry
+"""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.services.cache_service import CacheService, expiry_for, is_fresh
+from backend.utils.cache_format import write_cache_file
+from backend.utils.keywords import keywords_cache_key
+
+
+def _report(name):
+    return {
+        'raw_data': [{'keyword': name, 'interest_score': 10, 'source': 'Google Search'}],
+        'trending_order': [0],
+        'ai_insights': {'summary': name, 'trends': []},
+        'report_date': '2026-10-19 08:00:00'
+    }
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    def make(**kwargs):
+        reports_dir = tmp_path / 'reports'
+        reports_dir.mkdir(exist_ok=True)
+        return CacheService(tmp_path / 'trends.ftc', tmp_path / 'trends_cache.json', reports_dir,
+                            search_index_file=None, **kwargs)
+    return make
+
+
+def test_reports_are_cached_per_keyword_set(make_service):
+    service = make_service()
+    service.save(_report('default'))
+    service.save(_report('matcha'), ['Matcha', 'ube'])
+
+    assert service.load()['data']['ai_insights']['summary'] == 'default'
+    assert service.load(['UBE', ' matcha '])['data']['ai_insights']['summary'] == 'matcha'
+    assert service.load(['matcha']) is None
+    assert service.count_entries() == 2
+
+
+def test_least_recently_used_report_is_evicted(make_service):
+    service = make_service(max_entries=3)
+    service.save(_report('default'))
+    service.save(_report('a'), ['a'])
+    service.save(_report('b'), ['b'])
+    service.load(['a'])
+    service.save(_report('c'), ['c'])
+
+    assert service.load(['b']) is None
+    assert not (service.reports_dir / f"{keywords_cache_key(['b'])}.ftc").exists()
+    assert service.load(['a']) is not None
+    assert service.load(['c']) is not None
+    assert service.load() is not None
+
+
+def test_default_report_is_never_evicted(make_service):
+    service = make_service(max_entries=2)
+    service.save(_report('default'))
+    for keyword in ('a', 'b', 'c'):
+        service.save(_report(keyword), [keyword])
+
+    assert service.load() is not None
+    assert service.count_entries() == 2
+
+
+def test_files_beyond_the_limit_are_pruned_across_restarts(make_service):
+    first = make_service(max_entries=2)
+    first.save(_report('a'), ['a'])
+    old = datetime.now().timestamp() - 60
+    os.utime(first.reports_dir / f"{keywords_cache_key(['a'])}.ftc", (old, old))
+    second = make_service(max_entries=2)
+    second.save(_report('b'), ['b'])
+
+    assert sorted(p.stem for p in second.reports_dir.glob('*.ftc')) == [keywords_cache_key(['b'])]
+
+
+def test_expired_report_is_not_loaded(make_service):
+    service = make_service()
+    expired = (datetime.now() - timedelta(seconds=1)).isoformat()
+    write_cache_file(service.cache_file, datetime.now().isoformat(), _report('old'), {'expires_at': expired})
+
+    assert service.load() is None
+    assert service.get_status()['cached'] is False
+
+
+def test_saved_report_expires_after_ttl(make_service):
+    service = make_service(ttl=60)
+    service.save(_report('default'))
+
+    expires_at = datetime.fromisoformat(service.get_header()['expires_at'])
+    assert timedelta(seconds=59) < expires_at - datetime.now() <= timedelta(seconds=60)
+    assert service.load() is not None
+
+
+def test_zero_ttl_expires_at_midnight():
+    written = datetime(2026, 10, 19, 15, 30)
+    assert expiry_for(written, ttl=0) == datetime(2026, 10, 20)
+    assert expiry_for(written, ttl=300) == datetime(2026, 10, 19, 15, 35)
+
+
+def test_headers_without_expiry_are_fresh_for_their_day():
+    assert is_fresh({'timestamp': datetime.now().isoformat()})
+    assert not is_fresh({'timestamp': (datetime.now() - timedelta(days=1)).isoformat()})
@@ -0,0 +1,156 @@
+"""
+Tests for resumable collection runs
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import backend.services.trends_service as trends_service
+from backend.models import TrendItem
+from backend.utils import checkpoints
+from backend.utils.checkpoints import RunCheckpoint, list_runs, load_run
+from backend.utils.model_router import ModelRouter
+from backend.utils.ranking import DecayedRanking
+from food_trends_demo import FoodTrendsTracker
+
+WINDOW = 21600
+
+
+def test_new_run_is_created(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path, ['Matcha'], ['us:en'])
+
+    manifest = load_run(tmp_path, checkpoint.run_id)
+    assert manifest['status'] == 'running'
+    assert manifest['keywords'] == ['matcha']
+    assert manifest['attempts'] == 1
+    assert not checkpoint.resumed
+
+
+def test_resumed_run_reuses_searches_and_steps(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'])
+    checkpoint.save_query('us:en', 'matcha trends', [{'title': 'Matcha'}])
+    checkpoint.save_step('search', {'raw_data': []})
+    checkpoint.fail(RuntimeError('worker recycled'))
+
+    resumed = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'], run_id=checkpoint.run_id)
+    assert resumed.resumed
+    assert resumed.manifest['error'] is None
+    assert resumed.manifest['queries_done'] == 1
+    assert resumed.load_query('us:en', 'matcha trends') == [{'title': 'Matcha'}]
+    assert resumed.load_query('gb:en', 'matcha trends') is None
+    assert resumed.load_step('search') == {'raw_data': []}
+    assert resumed.load_step('analysis') is None
+
+
+@pytest.mark.parametrize('status, resumed', [
+    ('failed', True),
+    ('partial', True),
+    ('completed', False),
+])
+def test_unfinished_runs_are_resumed_automatically(tmp_path, status, resumed):
+    checkpoint = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'])
+    if status == 'failed':
+        checkpoint.fail(RuntimeError('timeout'))
+    else:
+        checkpoint.complete(partial=status == 'partial')
+
+    retry = RunCheckpoint.start(tmp_path, ['MATCHA'], ['us:en'], resume_window=WINDOW)
+    assert (retry.run_id == checkpoint.run_id) is resumed
+
+
+def test_runs_are_not_resumed_across_keyword_sets(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'])
+    checkpoint.fail(RuntimeError('timeout'))
+
+    assert RunCheckpoint.start(tmp_path, ['ube'], ['us:en'], resume_window=WINDOW).run_id != checkpoint.run_id
+    with pytest.raises(ValueError, match='other keywords'):
+        RunCheckpoint.start(tmp_path, ['ube'], ['us:en'], run_id=checkpoint.run_id)
+
+
+@pytest.mark.parametrize('run_id', ['20260101-000000-deadbeef', '../etc'])
+def test_unknown_run_id_is_rejected(tmp_path, run_id):
+    with pytest.raises(ValueError, match='Unknown run_id'):
+        RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'], run_id=run_id)
+
+
+def test_running_run_is_not_shared(tmp_path):
+    running = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'])
+
+    concurrent = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'], resume_window=WINDOW)
+    assert concurrent.run_id != running.run_id
+    assert concurrent.manifest['attempts'] == 1
+    with pytest.raises(ValueError, match='still running'):
+        RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'], run_id=running.run_id)
+
+
+def test_stale_running_run_is_taken_over(tmp_path):
+    running = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'])
+    manifest_path = running.run_dir / 'run.json'
+    manifest = json.loads(manifest_path.read_text())
+    manifest['updated_at'] = (datetime.now() - timedelta(seconds=300)).isoformat()
+    manifest_path.write_text(json.dumps(manifest))
+
+    retry = RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'], resume_window=WINDOW, stale_after=120)
+    assert retry.run_id == running.run_id
+    assert retry.manifest['attempts'] == 2
+
+
+def test_oldest_runs_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, 'MAX_RUNS', 3)
+    for i in range(5):
+        (tmp_path / f'20260101-00000{i}-run').mkdir()
+    RunCheckpoint.start(tmp_path, ['matcha'], ['us:en'])
+
+    assert len(list(tmp_path.iterdir())) == 3
+    assert not (tmp_path / '20260101-000000-run').exists()
+    assert len(list_runs(tmp_path)) == 1
+
+
+class _Scheduler:
+    """Scheduler stand-in returning one scripted search result per attempt"""
+
+    def __init__(self, attempts):
+        self.attempts = list(attempts)
+
+    def run(self, keywords, markets, deadline, checkpoint, run):
+        mentions, skipped = self.attempts.pop(0)
+        run.mentions = mentions
+        run.stats['skipped_searches'] = skipped
+        items = [TrendItem(name=name, score=count * 10, source='Google Search', type='related', mentions=count)
+                 for name, count in mentions.values()]
+        return items, {'google_search': {'status': 'ok'}}
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(trends_service, 'RUNS_DIR', tmp_path / 'runs')
+    tracker = FoodTrendsTracker.__new__(FoodTrendsTracker)
+    tracker.ranking = DecayedRanking(None)
+    tracker.model_router = ModelRouter({'analysis': ['model']})
+    monkeypatch.setattr(tracker, 'analyze_with_ai', lambda *args: {'summary': 's', 'trends': []})
+    service = trends_service.TrendsService()
+    service.tracker = tracker
+    service.ranking = tracker.ranking
+    return service
+
+
+def test_mentions_are_recorded_once_the_search_is_complete(service):
+    service.scheduler = _Scheduler([
+        ({'tanghulu': ('Tanghulu', 1)}, 1),
+        ({'tanghulu': ('Tanghulu', 2), 'ube latte': ('Ube Latte', 1)}, 0),
+    ])
+
+    partial = service.collect_trends(['desserts'])
+    assert partial['partial']
+    assert service.ranking.top() == []
+
+    report = service.collect_trends(['desserts'])
+    assert report['run_id'] == partial['run_id']
+    assert not report['partial']
+    assert {food['name']: food['mentions'] for food in service.ranking.top()} == {'Tanghulu': 2, 'Ube Latte': 1}
+
+    # Resuming the completed run reuses its search and records nothing again
+    service.collect_trends(['desserts'], report['run_id'])
+    assert {food['name']: food['mentions'] for food in service.ranking.top()} == {'Tanghulu': 2, 'Ube Latte': 1}
+    assert service.scheduler.attempts == []
@@ -0,0 +1,56 @@
+"""
+Regression tests for local dish recognition
+"""
+import pytest
+
+from backend.utils.gazetteer import DishGazetteer
+
+
+@pytest.fixture
+def gazetteer():
+    return DishGazetteer(None)
+
+
+@pytest.mark.parametrize('text', [
+    'Smash Burger Tacos take over TikTok',
+    'Why Dubai Chocolate Strawberries are everywhere',
+    'Try this smash burger with kimchi fries',
+    'Dubai Chocolate. Kunafa Bars are new',
+])
+def test_new_dish_next_to_known_one_goes_to_llm(gazetteer, text):
+    assert gazetteer.may_contain_unknown(text)
+
+
+@pytest.mark.parametrize('text', [
+    'Dubai Chocolate is everywhere. Tanghulu too.',
+    'Dubai Chocolate and Tanghulu are popular',
+    'Butter Board recipes: easy ideas',
+    'Birria Tacos, Ube Latte and more',
+])
+def test_only_known_dishes_are_matched_locally(gazetteer, text):
+    assert not gazetteer.may_contain_unknown(text)
+
+
+def test_text_without_known_dish_goes_to_llm(gazetteer):
+    assert gazetteer.may_contain_unknown('Everyone loves Kunafa Bars')
+
+
+# Search results as the tracker checks them: "<title>. <snippet>"
+@pytest.mark.parametrize('title, snippet', [
+    ('Dubai Chocolate Is Taking Over the Internet', 'Here is why everyone wants to try Dubai Chocolate.'),
+    ('How to Make Tanghulu at Home', 'Tanghulu is a candied fruit snack you can make with three ingredients.'),
+    ('Butter Board Ideas You Need to Try', 'A butter board is the easiest party appetizer.'),
+    ('Marry Me Chicken Recipe - Easy Weeknight Dinner', 'Marry me chicken is ready in 30 minutes.'),
+])
+def test_title_case_results_with_known_dishes_are_matched_locally(gazetteer, title, snippet):
+    assert not gazetteer.may_contain_unknown(f'{title}. {snippet}')
+
+
+@pytest.mark.parametrize('title, snippet', [
+    ('Kunafa Bars Are the New Dubai Chocolate', 'Bakeries are selling out of Kunafa Bars this month.'),
+    ('The Best Smash Burger Tacos in Town', 'Smash burger tacos combine two favourites.'),
+    ('Swicy Wings Are Everywhere This Summer', 'Try these sweet and spicy wings.'),
+    ('Viral Cloud Bread Recipe', 'Bakers now top it with Ube Latte Foam and sprinkles.'),
+])
+def test_results_with_new_dishes_go_to_llm(gazetteer, title, snippet):
+    assert gazetteer.may_contain_unknown(f'{title}. {snippet}')
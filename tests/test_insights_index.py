@@ -0,0 +1,115 @@
+"""
+Tests for filter, sort and group queries over a report's AI insights
+"""
+import json
+
+import pytest
+
+from backend.utils.insights_index import InsightsIndex
+
+
+@pytest.fixture
+def index():
+    trends = [
+        ('Dubai Chocolate', 'Dessert', 'High', 'Gen Z'),
+        ('Tanghulu', 'Snack', 'Medium', 'Gen Z'),
+        ('Ube Latte', 'Beverage', 'High', 'Millennials'),
+        ('Birria Tacos', 'Main', 'Low', 'Millennials'),
+        ('Cloud Bread', 'Snack', 'High', 'Gen Z'),
+    ]
+    scores = {'Dubai Chocolate': 90, 'Tanghulu': 40, 'Ube Latte': 70, 'Birria Tacos': 40, 'Cloud Bread': 10}
+    report = {
+        'raw_data': [{'keyword': name, 'interest_score': score, 'source': 'Google Search', 'type': 'related'}
+                     for name, score in scores.items()],
+        'trending_order': list(range(len(scores))),
+        'ai_insights': {'trends': [
+            {'name': name, 'category': category, 'innovation_potential': potential, 'target_market': market}
+            for name, category, potential, market in trends
+        ]},
+        'report_date': '2026-10-19 08:00:00'
+    }
+    return InsightsIndex(report)
+
+
+def _query(index, **query):
+    return json.loads(index.query(**query))
+
+
+def _names(body):
+    return [trend['name'] for trend in body['trends']]
+
+
+def test_trends_are_sorted_by_score_of_their_food(index):
+    body = _query(index)
+    assert body['total'] == 5
+    assert _names(body) == ['Dubai Chocolate', 'Ube Latte', 'Tanghulu', 'Birria Tacos', 'Cloud Bread']
+    assert body['trends'][0]['score'] == 90
+
+
+@pytest.mark.parametrize('min_score, expected', [
+    (None, 5),
+    (40, 4),
+    (41, 2),
+    (90, 1),
+    (91, 0),
+    (0, 5),
+])
+def test_min_score_includes_ties(index, min_score, expected):
+    assert _query(index, min_score=min_score)['total'] == expected
+
+
+def test_filters_or_values_of_a_field_and_and_fields(index):
+    body = _query(index, filters={'category': ['snack', 'DESSERT'], 'target_market': ['gen z']}, min_score=20)
+    assert _names(body) == ['Dubai Chocolate', 'Tanghulu']
+    assert body['counts']['category'] == {'Dessert': 1, 'Snack': 1}
+
+
+def test_unknown_filter_value_matches_nothing(index):
+    body = _query(index, filters={'category': ['Soup']})
+    assert body['total'] == 0
+    assert body['trends'] == []
+
+
+def test_innovation_potential_sorts_by_level(index):
+    body = _query(index, sort='innovation_potential')
+    assert [t['innovation_potential'] for t in body['trends']] == ['High', 'High', 'High', 'Medium', 'Low']
+    assert _names(body)[:3] == ['Dubai Chocolate', 'Ube Latte', 'Cloud Bread']
+
+
+@pytest.mark.parametrize('descending, expected', [
+    (None, ['Birria Tacos', 'Cloud Bread', 'Dubai Chocolate', 'Tanghulu', 'Ube Latte']),
+    (True, ['Ube Latte', 'Tanghulu', 'Dubai Chocolate', 'Cloud Bread', 'Birria Tacos']),
+])
+def test_name_sort_direction(index, descending, expected):
+    assert _names(_query(index, sort='name', descending=descending)) == expected
+
+
+def test_groups_are_largest_first_with_limit_per_group(index):
+    body = _query(index, group_by='target_market', limit=2)
+    assert [(g['value'], g['count']) for g in body['groups']] == [('Gen Z', 3), ('Millennials', 2)]
+    assert [t['name'] for t in body['groups'][0]['trends']] == ['Dubai Chocolate', 'Tanghulu']
+
+
+def test_groups_follow_the_filters(index):
+    body = _query(index, group_by='category', min_score=40)
+    assert {g['value']: g['count'] for g in body['groups']} == {'Dessert': 1, 'Beverage': 1, 'Snack': 1, 'Main': 1}
+
+
+def test_repeated_query_is_served_from_cache(index):
+    assert index.query(min_score=40) is index.query(min_score=40)
+
+
+@pytest.mark.parametrize('query, message', [
+    ({'filters': {'name': ['Tanghulu']}}, 'filter'),
+    ({'sort': 'price'}, 'sort'),
+    ({'group_by': 'name'}, 'group'),
+])
+def test_unknown_fields_are_rejected(index, query, message):
+    with pytest.raises(ValueError, match=message):
+        index.query(**query)
+
+
+def test_report_without_insights():
+    body = json.loads(InsightsIndex({}).query(group_by='category'))
+    assert body['total'] == 0
+    assert body['groups'] == []
@@ -0,0 +1,94 @@
+"""
+Tests for the decayed food ranking and its snapshot + log persistence
+"""
+import pytest
+
+from backend.utils import ranking as ranking_module
+from backend.utils.ranking import DecayedRanking
+
+DAY = 86400
+T0 = 1_760_000_000.0
+
+
+def test_mention_counts_half_after_one_half_life():
+    ranking = DecayedRanking(None, half_life_days=7)
+    ranking.record({'ube latte': ('Ube Latte', 4)}, T0)
+
+    assert ranking.score('ube latte', T0) == pytest.approx(4)
+    assert ranking.score('ube latte', T0 + 7 * DAY) == pytest.approx(2)
+    assert ranking.score('unknown', T0) == 0.0
+
+
+def test_recent_mentions_outrank_older_ones():
+    ranking = DecayedRanking(None, half_life_days=1)
+    ranking.record({'tanghulu': ('Tanghulu', 3)}, T0)
+    ranking.record({'ube latte': ('Ube Latte', 2)}, T0 + 2 * DAY)
+
+    top = ranking.top(2, now=T0 + 2 * DAY)
+    assert [food['name'] for food in top] == ['Ube Latte', 'Tanghulu']
+    assert top[1]['decayed_score'] == pytest.approx(0.75)
+    assert top[1]['mentions'] == 3
+
+
+def test_top_is_refreshed_after_a_new_run():
+    ranking = DecayedRanking(None)
+    ranking.record({'tanghulu': ('Tanghulu', 1)}, T0)
+    assert [food['name'] for food in ranking.top(1, now=T0)] == ['Tanghulu']
+
+    ranking.record({'ube latte': ('Ube Latte', 5)}, T0)
+    assert [food['name'] for food in ranking.top(1, now=T0)] == ['Ube Latte']
+
+
+def test_runs_are_replayed_from_the_log(tmp_path):
+    path = tmp_path / 'ranking.json'
+    ranking = DecayedRanking(path)
+    ranking.record({'tanghulu': ('Tanghulu', 3)}, T0)
+    ranking.record({'tanghulu': ('Tanghulu', 1), 'ube latte': ('Ube Latte', 2)}, T0 + DAY)
+
+    assert not path.exists()
+    assert len(ranking.log_path.read_text().splitlines()) == 2
+
+    reloaded = DecayedRanking(path)
+    assert reloaded.top(5, now=T0 + DAY) == ranking.top(5, now=T0 + DAY)
+
+
+def test_log_is_compacted_into_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(ranking_module, 'COMPACT_EVERY', 2)
+    path = tmp_path / 'ranking.json'
+    ranking = DecayedRanking(path)
+    for day in range(3):
+        ranking.record({'tanghulu': ('Tanghulu', 1)}, T0 + day * DAY)
+    assert path.exists()
+    assert not ranking.log_path.exists()
+
+    ranking.record({'tanghulu': ('Tanghulu', 1)}, T0 + 3 * DAY)
+    assert len(ranking.log_path.read_text().splitlines()) == 1
+
+    reloaded = DecayedRanking(path)
+    assert reloaded.score('tanghulu', T0 + 3 * DAY) == pytest.approx(ranking.score('tanghulu', T0 + 3 * DAY))
+    assert reloaded.top(1)[0]['mentions'] == 4
+
+
+def test_weights_are_rebased_for_distant_runs(tmp_path):
+    path = tmp_path / 'ranking.json'
+    ranking = DecayedRanking(path, half_life_days=1)
+    ranking.record({'tanghulu': ('Tanghulu', 1)}, T0)
+    later = T0 + 1000 * DAY
+    ranking.record({'ube latte': ('Ube Latte', 1)}, later)
+
+    assert ranking.landmark == later
+    assert ranking.score('ube latte', later) == pytest.approx(1)
+    # The rebased weights are persisted right away
+    assert path.exists()
+    assert DecayedRanking(path, half_life_days=1).score('ube latte', later) == pytest.approx(1)
+
+
+def test_unreadable_log_keeps_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(ranking_module, 'COMPACT_EVERY', 1)
+    path = tmp_path / 'ranking.json'
+    ranking = DecayedRanking(path)
+    ranking.record({'tanghulu': ('Tanghulu', 1)}, T0)
+    ranking.record({'ube latte': ('Ube Latte', 1)}, T0)
+    ranking.log_path.write_text('not json\n')
+
+    assert DecayedRanking(path).score('ube latte', T0) == pytest.approx(1)
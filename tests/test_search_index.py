@@ -0,0 +1,132 @@
+"""
+Tests for full-text search over saved reports and its snapshot + log persistence
+"""
+import json
+
+import pytest
+
+from backend.services.cache_service import CacheService
+from backend.utils import search_index as search_index_module
+from backend.utils.cache_format import write_cache_file
+from backend.utils.search_index import ReportSearchIndex, tokenize
+
+
+def _report(date, *trends):
+    return {
+        'ai_insights': {'trends': [
+            {'name': name, 'category': category, 'description': description, 'product_ideas': ideas}
+            for name, category, description, ideas in trends
+        ]},
+        'report_date': date
+    }
+
+
+PISTACHIO = ('Dubai Chocolate', 'Dessert', 'Pistachio and kunafa filled bars', ['Pistachio spread', 'Chocolate cups'])
+TANGHULU = ('Tanghulu', 'Snack', 'Candied fruit skewers', ['Frozen tanghulu kit'])
+PASTA = ('Pistachio Pasta', 'Main', 'Creamy pesto', ['Jarred pistachio pesto'])
+
+
+@pytest.fixture
+def index():
+    index = ReportSearchIndex(None)
+    index.add_report('default@1', _report('2026-10-01', PISTACHIO, TANGHULU), 'default')
+    index.add_report('kw-1@2', _report('2026-10-18', PASTA), 'kw-1')
+    return index
+
+
+def test_tokenize_drops_accents_case_and_stop_words():
+    assert tokenize('The Crème Brûlée of 2026!') == ['creme', 'brulee', '2026']
+
+
+def test_every_term_must_match(index):
+    result = index.search('pistachio bars')
+    assert result['total'] == 1
+    assert result['hits'][0]['name'] == 'Dubai Chocolate'
+
+
+def test_name_matches_rank_above_idea_matches(index):
+    hits = index.search('pistachio')['hits']
+    assert [hit['name'] for hit in hits] == ['Pistachio Pasta', 'Dubai Chocolate']
+    assert hits[0]['matched_fields'] == ['name', 'product_ideas']
+    assert hits[1]['product_ideas'] == ['Pistachio spread']
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('pista*', {'Pistachio Pasta', 'Dubai Chocolate'}),
+    ('tang*', {'Tanghulu'}),
+    ('choc* pist*', {'Dubai Chocolate'}),
+    ('pistachios', set()),
+    ('zz*', set()),
+])
+def test_prefix_queries(index, query, expected):
+    assert {hit['name'] for hit in index.search(query)['hits']} == expected
+
+
+def test_stop_word_query_matches_nothing(index):
+    assert index.search('the and') == {'total': 0, 'hits': []}
+
+
+def test_limit_keeps_total(index):
+    result = index.search('pista*', limit=1)
+    assert result['total'] == 2
+    assert len(result['hits']) == 1
+
+
+def test_report_is_indexed_once(index):
+    assert not index.add_report('default@1', _report('2026-10-01', PISTACHIO), 'default')
+    assert index.report_count == 2
+    assert len(index) == 3
+
+
+def test_reports_are_replayed_from_the_log(tmp_path):
+    path = tmp_path / 'search_index.json'
+    index = ReportSearchIndex(path)
+    index.add_report('default@1', _report('2026-10-01', PISTACHIO, TANGHULU), 'default')
+    index.add_report('kw-1@2', _report('2026-10-18', PASTA), 'kw-1')
+
+    assert not path.exists()
+    assert len(index.log_path.read_text().splitlines()) == 2
+
+    reloaded = ReportSearchIndex(path)
+    assert reloaded.report_count == 2
+    assert reloaded.search('pista*') == index.search('pista*')
+
+
+def test_log_is_compacted_into_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index_module, 'COMPACT_EVERY', 2)
+    path = tmp_path / 'search_index.json'
+    index = ReportSearchIndex(path)
+    index.add_report('a@1', _report('2026-10-01', PISTACHIO), 'a')
+    index.add_report('b@1', _report('2026-10-02', TANGHULU), 'b')
+
+    assert path.exists()
+    assert not index.log_path.exists()
+
+    index.add_report('c@1', _report('2026-10-03', PASTA), 'c')
+    assert len(index.log_path.read_text().splitlines()) == 1
+
+    reloaded = ReportSearchIndex(path)
+    assert reloaded.report_count == 3
+    assert {hit['report_id'] for hit in reloaded.search('pista*')['hits']} == {'a@1', 'c@1'}
+    assert not reloaded.add_report('b@1', _report('2026-10-02', TANGHULU), 'b')
+
+
+def test_cached_reports_are_backfilled_once(tmp_path):
+    reports_dir = tmp_path / 'reports'
+    reports_dir.mkdir()
+    legacy_file = tmp_path / 'trends_cache.json'
+    legacy_file.write_text(json.dumps({'timestamp': '2026-10-01T08:00:00', 'data': _report('2026-10-01', TANGHULU)}))
+    write_cache_file(reports_dir / 'kw-1.ftc', '2026-10-18T08:00:00', _report('2026-10-18', PASTA), {'cache_key': 'kw-1'})
+
+    def search(query):
+        service = CacheService(tmp_path / 'trends.ftc', legacy_file, reports_dir,
+                               search_index_file=tmp_path / 'search_index.json')
+        return service.search_reports(query)
+
+    result = search('tanghulu')
+    assert result['indexed_reports'] == 2
+    assert result['hits'][0]['report_id'] == 'default@2026-10-01T08:00:00'
+    # A restarted service finds both reports in the index and adds neither again
+    result = search('pasta')
+    assert result['indexed_reports'] == 2
+    assert result['hits'][0]['report_id'] == 'kw-1@2026-10-18T08:00:00'
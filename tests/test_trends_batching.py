@@ -0,0 +1,89 @@
+"""
+Tests for Google Trends batching and anchor rescaling
+"""
+import pytest
+
+from backend.models import TrendItem
+from backend.utils.trends_batching import anchor_scale_factors, merge_related_queries, plan_trend_batches
+from food_trends_demo import FoodTrendsTracker
+
+
+def test_batches_share_the_anchor():
+    anchor, batches = plan_trend_batches(['Tanghulu', 'ube', 'Birria', 'matcha', 'kimchi', 'feta', 'UBE'])
+
+    assert anchor == 'Tanghulu'
+    assert batches == [['Tanghulu', 'ube', 'Birria', 'matcha', 'kimchi'], ['Tanghulu', 'feta']]
+    assert all(len(batch) <= 5 for batch in batches)
+
+
+def test_explicit_anchor_is_not_repeated():
+    anchor, batches = plan_trend_batches(['ube', 'matcha'], anchor=' Matcha ')
+    assert anchor == 'Matcha'
+    assert batches == [['Matcha', 'ube']]
+
+
+@pytest.mark.parametrize('keywords, anchor, expected', [
+    ([], None, ('', [])),
+    (['ube'], None, ('ube', [['ube']])),
+    ([], 'ube', ('ube', [['ube']])),
+])
+def test_small_keyword_sets(keywords, anchor, expected):
+    assert plan_trend_batches(keywords, anchor) == expected
+
+
+def test_scale_factors_align_batches_to_the_first_usable_one():
+    assert anchor_scale_factors([None, 50.0, 100.0, 0.0]) == [None, 1.0, 0.5, None]
+
+
+def test_scale_factors_without_anchor_data():
+    assert anchor_scale_factors([None, 0.0]) == [None, 1.0]
+
+
+def test_related_queries_are_merged_by_name_and_type():
+    items = [
+        TrendItem(name='Ube Latte', score=40, source='serpapi_related_top', type='top'),
+        TrendItem(name='ube latte', score=70, source='serpapi_related_top', type='top'),
+        TrendItem(name='Ube Latte', score=90, source='serpapi_related_rising', type='rising'),
+    ]
+    merged = merge_related_queries(items)
+    assert [(item.name, item.score, item.type) for item in merged] == [
+        ('Ube Latte', 90, 'rising'), ('ube latte', 70, 'top')
+    ]
+
+
+def _timeline(values):
+    """SerpAPI timeline_data with one point per value set ({keyword: interest})"""
+    return {'interest_over_time': {'timeline_data': [
+        {'values': [{'query': keyword, 'extracted_value': value} for keyword, value in point.items()]}
+        for point in values
+    ]}}
+
+
+def test_scores_from_later_batches_are_rescaled_on_the_anchor(monkeypatch):
+    responses = {
+        'Tanghulu,ube,birria,matcha,kimchi': _timeline([
+            {'Tanghulu': 50, 'ube': 20, 'birria': 30, 'matcha': 40, 'kimchi': 10}
+        ] * 3),
+        # Normalized on its own, the anchor peaks at 100 in this batch
+        'Tanghulu,feta': _timeline([{'Tanghulu': 100, 'feta': 80}] * 3),
+    }
+    tracker = FoodTrendsTracker.__new__(FoodTrendsTracker)
+    monkeypatch.setattr(tracker, '_fetch_trends_batch', lambda batch, deadline: responses[','.join(batch)])
+
+    trends = tracker.get_google_trends(['Tanghulu', 'ube', 'birria', 'matcha', 'kimchi', 'feta'])
+
+    scores = {item.name: item.score for item in trends}
+    assert scores == {'Tanghulu': 50, 'ube': 20, 'birria': 30, 'matcha': 40, 'kimchi': 10, 'feta': 40}
+
+
+def test_batch_without_anchor_data_is_skipped(monkeypatch):
+    responses = {
+        'Tanghulu,ube,birria,matcha,kimchi': _timeline([{'Tanghulu': 50, 'ube': 20}] * 2),
+        'Tanghulu,feta': _timeline([{'feta': 80}] * 2),
+    }
+    tracker = FoodTrendsTracker.__new__(FoodTrendsTracker)
+    monkeypatch.setattr(tracker, '_fetch_trends_batch', lambda batch, deadline: responses[','.join(batch)])
+
+    trends = tracker.get_google_trends(['Tanghulu', 'ube', 'birria', 'matcha', 'kimchi', 'feta'])
+
+    assert {item.name for item in trends} == {'Tanghulu', 'ube'}